@@ -2,19 +2,26 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import click
 from dotenv import load_dotenv
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 from .api.errors import register_error_handlers
 from .config import get_config
-from .extensions import cors, db, jwt, ma
+from .extensions import cors, db, instrumentation, jwt, ma, metrics, rate_limiter, response_cache
+from .utils.db import configure_sqlite
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-def create_app(config_name: str | None = None) -> Flask:
-    """Application factory for the Garissa Event Planner backend."""
+def create_app(config_name: str | None = None, config_overrides: dict | None = None) -> Flask:
+    """Application factory for the Garissa Event Planner backend.
+
+    ``config_overrides`` is applied on top of the selected config class, which lets
+    scripts such as the benchmarks point the app at their own database.
+    """
     app = Flask(
         __name__,
         instance_relative_config=True,
@@ -24,9 +31,18 @@ def create_app(config_name: str | None = None) -> Flask:
 
     config_class = get_config(config_name)
     app.config.from_object(config_class)
+    if config_overrides:
+        app.config.update(config_overrides)
 
     Path(app.instance_path).mkdir(parents=True, exist_ok=True)
 
+    if app.config.get("PROXY_FIX_X_FOR") or app.config.get("PROXY_FIX_X_PROTO"):
+        app.wsgi_app = ProxyFix(
+            app.wsgi_app,
+            x_for=app.config.get("PROXY_FIX_X_FOR", 0),
+            x_proto=app.config.get("PROXY_FIX_X_PROTO", 0),
+        )
+
     _register_extensions(app)
     _register_blueprints(app)
     _register_cli(app)
@@ -53,6 +69,9 @@ def _register_extensions(app: Flask) -> None:
         automatic_options=True,
     )
     db.init_app(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_sqlite(engine, app.config.get("SQLITE_PRAGMAS", {}))
     # Import models so SQLAlchemy is aware of them before creating tables.
     from . import models  # noqa: F401
 
@@ -60,8 +79,17 @@ def _register_extensions(app: Flask) -> None:
 
     # Ensure services are imported so they can register hooks if needed.
     from . import services  # noqa: F401
+    from .services.identity_service import forget_current_user
+    from .services.outbox_service import outbox_worker
 
     jwt.init_app(app)
+    # ``g`` outlives the request when an app context was already pushed (CLI, tests).
+    app.teardown_request(forget_current_user)
+    response_cache.init_app(app)
+    instrumentation.init_app(app)
+    metrics.init_app(app)
+    rate_limiter.init_app(app)
+    outbox_worker.init_app(app)
 
 
 def _register_blueprints(app: Flask) -> None:
@@ -85,6 +113,158 @@ def _register_cli(app: Flask) -> None:
             db.drop_all()
             print("Database tables dropped.")
 
+    @app.cli.command("reconcile-seats")
+    @click.option("--dry-run", is_flag=True, help="Report drift without fixing it.")
+    def reconcile_seats(dry_run: bool) -> None:  # pragma: no cover - CLI helper
+        """Recompute reserved seat counters from bookings and report drift."""
+        from app.services.booking_service import reconcile_reserved_seats
+
+        with app.app_context():
+            drift = reconcile_reserved_seats(apply=not dry_run)
+            for item in drift:
+                print(
+                    f"Event {item.event_id}: recorded {item.recorded}, actual {item.actual} "
+                    f"(drift {item.recorded - item.actual:+d})",
+                )
+            action = "Found" if dry_run else "Fixed"
+            print(f"{action} {len(drift)} event(s) with seat counter drift.")
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search() -> None:  # pragma: no cover - CLI helper
+        """Create the event full-text index if missing and repopulate it."""
+        from app.services.search_service import rebuild_search_index
+
+        with app.app_context():
+            indexed = rebuild_search_index()
+            print(f"Search index rebuilt for {indexed} event(s).")
+
+    @app.cli.command("export-attendees")
+    @click.argument("event_id", type=int)
+    @click.option("--format", "export_format", type=click.Choice(["csv", "ndjson"]), default="csv")
+    @click.option("--output", type=click.File("w"), default="-", help="File path (default stdout).")
+    def export_attendees(event_id: int, export_format: str, output) -> None:  # pragma: no cover
+        """Stream an event's attendee list as CSV or NDJSON."""
+        from app.services.export_service import render_attendees
+
+        with app.app_context():
+            for chunk in render_attendees(event_id, export_format):
+                output.write(chunk)
+
+    @app.cli.command("seed")
+    @click.option("--events", type=int, default=10_000, show_default=True)
+    @click.option("--bookings", type=int, help="Defaults to the number of events.")
+    @click.option("--users", type=int, help="Defaults to one per ten events.")
+    @click.option("--universities", type=int, help="Defaults to one per thousand events.")
+    @click.option("--seed", "seed_value", type=int, default=42, show_default=True)
+    @click.option("--batch-size", type=int, default=5000, show_default=True)
+    @click.option("--password", default="Password123!", help="Password for every account.")
+    def seed(
+        events: int,
+        bookings: int | None,
+        users: int | None,
+        universities: int | None,
+        seed_value: int,
+        batch_size: int,
+        password: str,
+    ) -> None:  # pragma: no cover - CLI helper
+        """Bulk-insert synthetic users, universities, events and bookings."""
+        from app.services.seed_service import seed as seed_database
+
+        with app.app_context():
+            db.create_all()
+            result = seed_database(
+                events=events,
+                bookings=bookings,
+                users=users,
+                universities=universities,
+                seed_value=seed_value,
+                batch_size=batch_size,
+                password=password,
+            )
+            print(
+                f"Seeded {len(result.user_ids)} users, "
+                f"{len(result.university_user_ids)} universities, "
+                f"{len(result.event_ids)} events and {result.bookings} bookings "
+                f"in {result.elapsed_seconds}s. Admin account id: {result.admin_id}.",
+            )
+
+    @app.cli.command("rollup")
+    @click.option("--full", is_flag=True, help="Rebuild every day instead of only changed ones.")
+    def rollup(full: bool) -> None:  # pragma: no cover - CLI helper
+        """Refresh the daily metric rollups behind the admin time series."""
+        from app.services.rollup_service import run_rollups
+
+        with app.app_context():
+            written = run_rollups(full=full)
+            for metric, rows in written.items():
+                print(f"{metric}: {rows} daily row(s) written")
+
+    @app.cli.command("send-emails")
+    @click.option("--once", is_flag=True, help="Deliver one batch of due messages and exit.")
+    def send_emails(once: bool) -> None:  # pragma: no cover - CLI helper
+        """Deliver queued email from the outbox."""
+        from app.services.outbox_service import OutboxWorker, SMTPTransport, deliver_pending
+
+        if not once:
+            OutboxWorker().run(app)
+            return
+        transport = SMTPTransport(app.config)
+        try:
+            with app.app_context():
+                report = deliver_pending(transport)
+        finally:
+            transport.close()
+        print(f"Sent {report.sent}, retrying {report.retried}, failed {report.failed}.")
+
+    @app.cli.command("purge-otps")
+    @click.option("--batch-size", default=1000, show_default=True, help="Rows per transaction.")
+    def purge_otps(batch_size: int) -> None:  # pragma: no cover - CLI helper
+        """Delete used and expired verification codes from otp_codes."""
+        from app.services.otp_service import purge_otp_codes
+
+        with app.app_context():
+            print(f"Purged {purge_otp_codes(batch_size)} OTP code(s).")
+
+    @app.cli.command("purge-emails")
+    @click.option("--batch-size", default=1000, show_default=True, help="Rows per transaction.")
+    def purge_emails(batch_size: int) -> None:  # pragma: no cover - CLI helper
+        """Delete sent and failed messages older than EMAIL_OUTBOX_RETENTION_DAYS."""
+        from app.services.outbox_service import purge_outbox
+
+        with app.app_context():
+            print(f"Purged {purge_outbox(batch_size=batch_size)} outbox message(s).")
+
+    @app.cli.command("purge-sessions")
+    def purge_sessions() -> None:  # pragma: no cover - CLI helper
+        """Delete expired and revoked refresh sessions."""
+        from app.services.token_service import purge_refresh_sessions
+
+        with app.app_context():
+            print(f"Purged {purge_refresh_sessions()} refresh session(s).")
+
+    @app.cli.command("index-advisor")
+    @click.option("--verbose", is_flag=True, help="Print the SQL and full plan for every query.")
+    def index_advisor(verbose: bool) -> None:  # pragma: no cover - CLI helper
+        """EXPLAIN each endpoint query shape and flag full table scans."""
+        from app.services.index_advisor import explain_queries
+
+        with app.app_context():
+            plans = explain_queries()
+            for plan in plans:
+                print(f"[{'ok' if plan.ok else 'WARN'}] {plan.name}")
+                for warning in plan.warnings:
+                    print(f"    {warning}")
+                if plan.note:
+                    print(f"    note: {plan.note}")
+                if verbose:
+                    print(f"    sql: {' '.join(plan.sql.split())}")
+                    for line in plan.plan:
+                        print(f"    plan: {line}")
+            flagged = [plan for plan in plans if not plan.ok]
+            print(f"{len(plans)} queries checked, {len(flagged)} flagged.")
+            if flagged:
+                raise SystemExit(1)
+
     @app.cli.command("create-admin")
     def create_admin() -> None:  # pragma: no cover - CLI helper
         """Create initial admin user from environment variables."""
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify
+import hmac
 
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from ..utils.metrics import render_metrics
 from .admin import admin_bp
 from .auth import auth_bp
 from .bookings import bookings_bp
@@ -18,3 +21,19 @@ api_bp.register_blueprint(admin_bp, url_prefix="/admin")
 def health_check():
     """Basic health check endpoint for uptime monitoring."""
     return jsonify(status="ok", service="Garissa Event Planner API"), 200
+
+
+@api_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus metrics for scraping."""
+    if not current_app.config.get("METRICS_ENABLED", True):
+        return jsonify({"message": "Metrics are disabled."}), 404
+    token = current_app.config.get("METRICS_AUTH_TOKEN")
+    if token and not hmac.compare_digest(
+        request.headers.get("Authorization", ""),
+        f"Bearer {token}",
+    ):
+        return jsonify({"message": "Invalid metrics token."}), 401
+
+    body, content_type = render_metrics()
+    return Response(body, content_type=content_type)
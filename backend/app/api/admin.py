@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from datetime import date, timedelta
+
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt, jwt_required
-from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
-from ..extensions import db
-from ..models import Booking, BookingStatus, Event, EventStatus, Role, UniversityProfile, User
+from ..extensions import db, response_cache
+from ..models import Event, EventStatus, Role, UniversityProfile, User
 from ..schemas import (
     EventSchema,
     EventStatusSchema,
@@ -15,12 +17,14 @@ from ..schemas import (
     UserSchema,
     UserWriteSchema,
 )
+from ..services.booking_service import release_user_bookings
+from ..services.identity_service import invalidate_user
+from ..services.rollup_service import GRANULARITIES, METRICS, last_rollup_at, timeseries
+from ..services.stats_service import get_admin_stats
+from ..services.token_service import revoke_user_sessions
 from ..utils.security import hash_password
-from ..utils.pagination import (
-    build_paginated_response,
-    paginate_query,
-    resolve_pagination_params,
-)
+from ..utils.pagination import paginate_request
+from ..utils.replica import read_replica
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -44,6 +48,7 @@ def _require_admin() -> None:
 
 @admin_bp.get("/users")
 @jwt_required()
+@read_replica
 def list_users():
     try:
         _require_admin()
@@ -58,10 +63,13 @@ def list_users():
         except ValueError:
             return jsonify({"message": "Invalid role filter."}), 400
 
-    query = query.order_by(User.created_at.desc())
-    page, page_size = resolve_pagination_params()
-    users, total = paginate_query(query, page, page_size)
-    payload = build_paginated_response(user_schema.dump(users), total, page, page_size)
+    payload = paginate_request(
+        query,
+        user_schema.dump,
+        order_column=User.created_at,
+        id_column=User.id,
+        descending=True,
+    )
     return jsonify(payload), 200
 
 
@@ -77,12 +85,14 @@ def update_user_status(user_id: int):
     action = request.args.get("action", "ban")
     if action == "ban":
         user.is_active = False
+        revoke_user_sessions(user.id)
     elif action == "unban":
         user.is_active = True
     else:
         return jsonify({"message": "Invalid action. Use 'ban' or 'unban'."}), 400
 
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify(user_detail_schema.dump(user)), 200
 
 
@@ -107,23 +117,31 @@ def delete_user(user_id: int):
     if current_user_id and int(current_user_id) == user.id:
         return jsonify({"message": "Cannot delete your own account."}), 400
     
+    release_user_bookings(user.id)
+    revoke_user_sessions(user.id)
     db.session.delete(user)
     db.session.commit()
+    invalidate_user(user_id)
+    response_cache.invalidate("events")
     return jsonify({"message": "User deleted successfully."}), 200
 
 
 @admin_bp.get("/universities")
 @jwt_required()
+@read_replica
 def list_universities():
     try:
         _require_admin()
     except PermissionError:
         return jsonify({"message": "Administrator access required."}), 403
 
-    query = UniversityProfile.query.order_by(UniversityProfile.created_at.desc())
-    page, page_size = resolve_pagination_params()
-    universities, total = paginate_query(query, page, page_size)
-    payload = build_paginated_response(university_schema.dump(universities), total, page, page_size)
+    payload = paginate_request(
+        UniversityProfile.query.options(selectinload(UniversityProfile.user)),
+        university_schema.dump,
+        order_column=UniversityProfile.created_at,
+        id_column=UniversityProfile.id,
+        descending=True,
+    )
     return jsonify(payload), 200
 
 
@@ -218,12 +236,16 @@ def delete_university(university_id: int):
     if user:
         db.session.delete(user)
     db.session.commit()
+    if user:
+        invalidate_user(user.id)
+    response_cache.invalidate("events")
     
     return jsonify({"message": "University account deleted successfully."}), 200
 
 
 @admin_bp.get("/events")
 @jwt_required()
+@read_replica
 def list_events():
     try:
         _require_admin()
@@ -231,17 +253,20 @@ def list_events():
         return jsonify({"message": "Administrator access required."}), 403
 
     status = request.args.get("status")
-    query = Event.query
+    query = Event.query.options(selectinload(Event.organizer), selectinload(Event.university))
     if status:
         try:
             query = query.filter(Event.status == EventStatus(status))
         except ValueError:
             return jsonify({"message": "Invalid status filter."}), 400
 
-    query = query.order_by(Event.created_at.desc())
-    page, page_size = resolve_pagination_params()
-    events, total = paginate_query(query, page, page_size)
-    payload = build_paginated_response(event_list_schema.dump(events), total, page, page_size)
+    payload = paginate_request(
+        query,
+        event_list_schema.dump,
+        order_column=Event.created_at,
+        id_column=Event.id,
+        descending=True,
+    )
     return jsonify(payload), 200
 
 
@@ -259,6 +284,7 @@ def admin_update_event_status(event_id: int):
     event = Event.query.get_or_404(event_id)
     event.status = data["status"]
     db.session.commit()
+    response_cache.invalidate("events")
     return jsonify(event_detail_schema.dump(event)), 200
 
 
@@ -273,44 +299,69 @@ def admin_delete_event(event_id: int):
     event = Event.query.get_or_404(event_id)
     db.session.delete(event)
     db.session.commit()
+    response_cache.invalidate("events")
     return jsonify({"message": "Event deleted."}), 200
 
 
 @admin_bp.get("/stats")
 @jwt_required()
+@read_replica
 def admin_stats():
     try:
         _require_admin()
     except PermissionError:
         return jsonify({"message": "Administrator access required."}), 403
 
-    total_users = db.session.query(func.count(User.id)).scalar() or 0
-    total_universities = db.session.query(func.count(UniversityProfile.id)).scalar() or 0
-    total_events = db.session.query(func.count(Event.id)).scalar() or 0
-    published_events = (
-        db.session.query(func.count(Event.id))
-        .filter(Event.status == EventStatus.PUBLISHED)
-        .scalar()
-        or 0
-    )
-    total_bookings = db.session.query(func.count(Booking.id)).scalar() or 0
-    approved_bookings = (
-        db.session.query(func.count(Booking.id))
-        .filter(Booking.status == BookingStatus.APPROVED)
-        .scalar()
-        or 0
-    )
+    return jsonify(get_admin_stats()), 200
 
-    return (
-        jsonify(
-            {
-                "users": total_users,
-                "universities": total_universities,
-                "events": total_events,
-                "publishedEvents": published_events,
-                "bookings": total_bookings,
-                "approvedBookings": approved_bookings,
-            },
-        ),
-        200,
-    )
+
+TIMESERIES_DEFAULT_DAYS = 30
+TIMESERIES_MAX_DAYS = 3 * 366
+
+
+@admin_bp.get("/stats/timeseries")
+@jwt_required()
+@read_replica
+def admin_stats_timeseries():
+    try:
+        _require_admin()
+    except PermissionError:
+        return jsonify({"message": "Administrator access required."}), 403
+
+    metric = request.args.get("metric", "bookings")
+    if metric not in METRICS:
+        return jsonify({"message": f"metric must be one of: {', '.join(METRICS)}."}), 400
+    granularity = request.args.get("granularity", "day")
+    if granularity not in GRANULARITIES:
+        return jsonify({"message": f"granularity must be one of: {', '.join(GRANULARITIES)}."}), 400
+
+    try:
+        end = date.fromisoformat(request.args["end"]) if "end" in request.args else date.today()
+        start = (
+            date.fromisoformat(request.args["start"])
+            if "start" in request.args
+            else end - timedelta(days=TIMESERIES_DEFAULT_DAYS - 1)
+        )
+    except ValueError:
+        return jsonify({"message": "start and end must be ISO dates (YYYY-MM-DD)."}), 400
+    if start > end:
+        return jsonify({"message": "start must not be after end."}), 400
+    if (end - start).days >= TIMESERIES_MAX_DAYS:
+        return jsonify({"message": f"Range is limited to {TIMESERIES_MAX_DAYS} days."}), 400
+
+    university_id = request.args.get("university_id", type=int)
+    if university_id is not None and metric == "users":
+        return jsonify({"message": "The users metric cannot be filtered by university."}), 400
+
+    watermark = last_rollup_at()
+    return jsonify(
+        {
+            "metric": metric,
+            "granularity": granularity,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "universityId": university_id,
+            "points": timeseries(metric, granularity, start, end, university_id),
+            "lastRollupAt": watermark.isoformat() if watermark else None,
+        },
+    ), 200
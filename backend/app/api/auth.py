@@ -4,14 +4,12 @@ from dataclasses import dataclass
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import (
-    create_access_token,
     get_jwt,
-    get_jwt_identity,
     jwt_required,
 )
 from marshmallow import Schema, ValidationError, fields, validate
 
-from ..extensions import db
+from ..extensions import db, rate_limiter
 from ..models import Role, User
 from ..schemas import (
     OTPVerifySchema,
@@ -20,9 +18,11 @@ from ..schemas import (
     UserUpdateSchema,
     UserWriteSchema,
 )
+from ..services.identity_service import get_current_user, invalidate_user
 from ..services.otp_service import OTPService
+from ..services.token_service import SESSION_CLAIM, revoke_session, rotate_session, start_session
 from ..utils.email import EmailService
-from ..utils.security import hash_password, verify_password
+from ..utils.security import hash_password, verify_and_update_password
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -42,14 +42,15 @@ class OTPResendSchema(Schema):
 
 @dataclass
 class AuthResponse:
-    access_token: str
+    tokens: dict[str, str]
     user: dict
 
     def to_dict(self) -> dict:
-        return {"accessToken": self.access_token, "user": self.user}
+        return {**self.tokens, "user": self.user}
 
 
 @auth_bp.post("/register")
+@rate_limiter.limit("register", "ip", "email")
 def register_user():
     try:
         payload = request.get_json() or {}
@@ -83,6 +84,7 @@ def register_user():
             if data.get("password"):
                 user.password_hash = hash_password(data["password"])
             db.session.commit()
+            invalidate_user(user.id)
 
         otp = OTPService.generate(email=user.email, purpose="registration")
         EmailService.send_otp(user.email, otp.code)
@@ -110,6 +112,7 @@ def register_user():
 
 
 @auth_bp.post("/verify")
+@rate_limiter.limit("verify", "ip", "email")
 def verify_otp():
     payload = request.get_json() or {}
     data = OTPVerifySchema().load(payload)
@@ -129,17 +132,14 @@ def verify_otp():
 
     user.is_active = True
     db.session.commit()
+    invalidate_user(user.id)
 
-    access_token = create_access_token(
-        identity=str(user.id),
-        additional_claims={"role": user.role.value},
-    )
-
-    response = AuthResponse(access_token=access_token, user=user_detail_schema.dump(user))
+    response = AuthResponse(tokens=start_session(user), user=user_detail_schema.dump(user))
     return jsonify(response.to_dict()), 200
 
 
 @auth_bp.post("/resend-otp")
+@rate_limiter.limit("resend_otp", "ip", "email")
 def resend_otp():
     payload = request.get_json() or {}
     data = OTPResendSchema().load(payload)
@@ -156,48 +156,72 @@ def resend_otp():
 
 
 @auth_bp.post("/login")
+@rate_limiter.limit("login", "ip", "email")
 def login():
     payload = request.get_json() or {}
     data = LoginSchema().load(payload)
     normalized_email = data["email"].lower()
 
     user = User.query.filter_by(email=normalized_email).first()
-    if not user or not verify_password(data["password"], user.password_hash):
+    if not user:
+        return jsonify({"message": "Invalid email or password."}), 401
+    verified, new_hash = verify_and_update_password(data["password"], user.password_hash)
+    if not verified:
         return jsonify({"message": "Invalid email or password."}), 401
+    if new_hash:
+        user.password_hash = new_hash
+        db.session.commit()
+        invalidate_user(user.id)
 
     if not user.is_active:
         return jsonify({"message": "Account not verified. Please verify your email."}), 403
 
-    access_token = create_access_token(
-        identity=str(user.id),
-        additional_claims={"role": user.role.value},
-    )
-    response = AuthResponse(access_token=access_token, user=user_schema.dump(user))
+    response = AuthResponse(tokens=start_session(user), user=user_schema.dump(user))
+    return jsonify(response.to_dict()), 200
+
+
+@auth_bp.post("/refresh")
+@jwt_required(refresh=True)
+def refresh():
+    rotated = rotate_session(get_jwt())
+    if rotated is None:
+        return jsonify({"message": "Session expired. Please log in again."}), 401
+
+    user, tokens = rotated
+    response = AuthResponse(tokens=tokens, user=user_schema.dump(user))
     return jsonify(response.to_dict()), 200
 
 
+@auth_bp.post("/logout")
+@jwt_required(refresh=True)
+def logout():
+    session_id = get_jwt().get(SESSION_CLAIM)
+    if session_id is not None:
+        revoke_session(session_id)
+    return jsonify({"message": "Logged out."}), 200
+
+
 @auth_bp.get("/profile")
 @jwt_required()
 def profile():
-    identity = get_jwt_identity()
-    user = User.query.get_or_404(int(identity))
+    user = get_current_user()
     return jsonify(user_detail_schema.dump(user)), 200
 
 
 @auth_bp.patch("/profile")
 @jwt_required()
 def update_profile():
-    identity = get_jwt_identity()
     payload = request.get_json() or {}
     data = UserUpdateSchema().load(payload)
 
-    user = User.query.get_or_404(int(identity))
+    user = get_current_user()
     if "name" in data:
         user.name = data["name"]
     if "phone" in data:
         user.phone = data["phone"]
 
     db.session.commit()
+    invalidate_user(user.id)
     return jsonify(user_detail_schema.dump(user)), 200
 
 
@@ -216,26 +240,13 @@ def get_dev_otp(email: str):
     if not current_app.config.get("DEBUG", False):
         return jsonify({"message": "This endpoint is only available in development mode."}), 403
     
-    normalized_email = email.lower()
-    from ..models import OTPCode
-    from datetime import datetime
-    
-    otp = (
-        OTPCode.query.filter_by(email=normalized_email, is_used=False)
-        .order_by(OTPCode.created_at.desc())
-        .first()
-    )
-    
+    otp = OTPService.peek(email.lower(), request.args.get("purpose"))
     if not otp:
         return jsonify({"message": "No active OTP found for this email."}), 404
-    
-    if otp.expires_at < datetime.utcnow():
-        return jsonify({"message": "OTP has expired."}), 400
-    
+
     return jsonify({
         "email": otp.email,
         "code": otp.code,
         "purpose": otp.purpose,
         "expires_at": otp.expires_at.isoformat(),
-        "created_at": otp.created_at.isoformat(),
     }), 200
@@ -1,32 +1,43 @@
 from __future__ import annotations
 
-from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy import desc
-
-from ..extensions import db
-from ..models import Booking, BookingStatus, Event, Role, User
-from ..schemas import BookingSchema, BookingStatusSchema, BookingWriteSchema
-from ..services.booking_service import seats_available
-from ..utils.pagination import (
-    build_paginated_response,
-    paginate_query,
-    resolve_pagination_params,
+from collections import Counter, defaultdict
+
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy.orm import selectinload
+
+from ..extensions import db, response_cache
+from ..models import Booking, BookingStatus, Event, Role
+from ..schemas import (
+    BookingBulkStatusSchema,
+    BookingSchema,
+    BookingStatusSchema,
+    BookingWriteSchema,
 )
+from ..services.booking_service import (
+    organizer_bookings_filter,
+    organizer_status_counts_statement,
+    seats_available,
+    set_booking_status,
+    set_event_booking_statuses,
+)
+from ..services.export_service import EXPORT_FORMATS, render_attendees
+from ..services.identity_service import get_current_user
+from ..utils.pagination import paginate_request
+from ..utils.replica import read_replica
 
 bookings_bp = Blueprint("bookings", __name__)
 
 booking_schema = BookingSchema()
 bookings_schema = BookingSchema(many=True)
 booking_status_schema = BookingStatusSchema()
+booking_bulk_status_schema = BookingBulkStatusSchema()
 booking_write_schema = BookingWriteSchema()
 
 
-def _current_user() -> User:
-    identity = get_jwt_identity()
-    if identity is None:
-        raise PermissionError("Authentication required.")
-    return User.query.get_or_404(int(identity))
+def _with_related(query):
+    """Batch-load the user and event each serialized booking renders."""
+    return query.options(selectinload(Booking.user), selectinload(Booking.event))
 
 
 def _require_role(roles: list[Role]) -> None:
@@ -38,16 +49,16 @@ def _require_role(roles: list[Role]) -> None:
 
 @bookings_bp.get("/me")
 @jwt_required()
+@read_replica
 def my_bookings():
-    user = _current_user()
-    query = Booking.query.filter(Booking.user_id == user.id).order_by(desc(Booking.created_at))
-    page, page_size = resolve_pagination_params()
-    bookings, total = paginate_query(query, page, page_size)
-    payload = build_paginated_response(
-        bookings_schema.dump(bookings),
-        total,
-        page,
-        page_size,
+    user = get_current_user()
+    query = _with_related(Booking.query.filter(Booking.user_id == user.id))
+    payload = paginate_request(
+        query,
+        bookings_schema.dump,
+        order_column=Booking.created_at,
+        id_column=Booking.id,
+        descending=True,
     )
     return jsonify(payload), 200
 
@@ -55,7 +66,7 @@ def my_bookings():
 @bookings_bp.get("/event/<int:event_id>")
 @jwt_required()
 def event_bookings(event_id: int):
-    user = _current_user()
+    user = get_current_user()
     event = Event.query.get_or_404(event_id)
 
     if user.role == Role.UNIVERSITY and event.organizer_id != user.id:
@@ -66,18 +77,104 @@ def event_bookings(event_id: int):
             403,
         )
 
-    query = Booking.query.filter(Booking.event_id == event.id).order_by(desc(Booking.created_at))
-    page, page_size = resolve_pagination_params()
-    bookings, total = paginate_query(query, page, page_size)
-    payload = build_paginated_response(
-        bookings_schema.dump(bookings),
-        total,
-        page,
-        page_size,
+    query = _with_related(Booking.query.filter(Booking.event_id == event.id))
+    payload = paginate_request(
+        query,
+        bookings_schema.dump,
+        order_column=Booking.created_at,
+        id_column=Booking.id,
+        descending=True,
     )
     return jsonify(payload), 200
 
 
+@bookings_bp.get("/event/<int:event_id>/export")
+@jwt_required()
+def export_event_bookings(event_id: int):
+    """Stream every booking of an event with attendee details as CSV or NDJSON."""
+    user = get_current_user()
+    event = Event.query.get_or_404(event_id)
+
+    if user.role == Role.UNIVERSITY and event.organizer_id != user.id:
+        return jsonify({"message": "You are not authorized to view bookings for this event."}), 403
+    if user.role not in (Role.UNIVERSITY, Role.ADMIN):
+        return (
+            jsonify({"message": "Only university or admin accounts may view event bookings."}),
+            403,
+        )
+
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": "Invalid format. Use 'csv' or 'ndjson'."}), 400
+
+    statuses = None
+    if request.args.get("status"):
+        try:
+            statuses = [BookingStatus(value) for value in request.args["status"].split(",")]
+        except ValueError:
+            return jsonify({"message": "Invalid status filter."}), 400
+
+    filename = f"event-{event.id}-attendees.{export_format}"
+    return Response(
+        stream_with_context(render_attendees(event.id, export_format, statuses=statuses)),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@bookings_bp.get("/organizer")
+@jwt_required()
+def organizer_bookings():
+    """Bookings across every event the caller organizes, plus per-event status counts.
+
+    Replaces one ``/event/<id>`` request per event on the university dashboard.
+    ``status`` defaults to ``pending``; pass ``status=all`` to disable the filter.
+    Admins may pass ``organizer_id`` to look at another organizer.
+    """
+    user = get_current_user()
+    if user.role not in (Role.UNIVERSITY, Role.ADMIN):
+        return (
+            jsonify({"message": "Only university or admin accounts may view event bookings."}),
+            403,
+        )
+
+    organizer_id = user.id
+    if user.role == Role.ADMIN and request.args.get("organizer_id"):
+        try:
+            organizer_id = int(request.args["organizer_id"])
+        except ValueError:
+            return jsonify({"message": "Invalid organizer_id."}), 400
+
+    status_filter = request.args.get("status", BookingStatus.PENDING.value)
+    statuses = None
+    if status_filter != "all":
+        try:
+            statuses = [BookingStatus(value) for value in status_filter.split(",")]
+        except ValueError:
+            return jsonify({"message": "Invalid status filter."}), 400
+
+    query = Booking.query.filter(organizer_bookings_filter(organizer_id, statuses))
+    payload = paginate_request(
+        _with_related(query),
+        bookings_schema.dump,
+        order_column=Booking.created_at,
+        id_column=Booking.id,
+        descending=True,
+    )
+
+    counts: dict[str, dict[str, int]] = {}
+    grouped = db.session.execute(organizer_status_counts_statement(organizer_id))
+    for event_id, status, count in grouped:
+        event_counts = counts.setdefault(
+            str(event_id),
+            {booking_status.value: 0 for booking_status in BookingStatus},
+        )
+        event_counts[status.value] = count
+    payload["counts"] = counts
+
+    return jsonify(payload), 200
+
+
 @bookings_bp.put("/<int:booking_id>")
 @jwt_required()
 def update_booking_status(booking_id: int):
@@ -86,7 +183,7 @@ def update_booking_status(booking_id: int):
 
     booking = Booking.query.get_or_404(booking_id)
     event = booking.event
-    user = _current_user()
+    user = get_current_user()
 
     if user.role == Role.UNIVERSITY and event.organizer_id != user.id:
         return jsonify({"message": "You are not authorized to manage this booking."}), 403
@@ -98,17 +195,92 @@ def update_booking_status(booking_id: int):
         if booking.seats > available:
             return jsonify({"message": "Not enough seats available to approve this booking."}), 400
 
-    booking.status = data["status"]
-    db.session.commit()
+    if not set_booking_status(booking.id, data["status"]):
+        return jsonify({"message": "Not enough seats available to approve this booking."}), 400
+    response_cache.invalidate("events")
 
     return jsonify(booking_schema.dump(booking)), 200
 
 
+@bookings_bp.put("/bulk")
+@jwt_required()
+def bulk_update_booking_status():
+    """Approve/reject many bookings in one transaction with one capacity check per event.
+
+    Items are grouped by event; if an event's batch would exceed its capacity, every
+    item for that event fails and the rest of the batch still applies.
+    """
+    payload = request.get_json() or {}
+    data = booking_bulk_status_schema.load(payload)
+
+    user = get_current_user()
+    if user.role not in (Role.UNIVERSITY, Role.ADMIN):
+        return jsonify({"message": "Only university or admin accounts may manage bookings."}), 403
+
+    requested = {item["id"]: item["status"] for item in data["items"]}
+    if len(requested) < len(data["items"]):
+        duplicates = sorted(
+            booking_id
+            for booking_id, count in Counter(item["id"] for item in data["items"]).items()
+            if count > 1
+        )
+        return jsonify(
+            {"message": "Each booking may appear only once.", "duplicateIds": duplicates},
+        ), 400
+    bookings = {
+        booking.id: booking
+        for booking in Booking.query.options(selectinload(Booking.event))
+        .filter(Booking.id.in_(requested))
+        .all()
+    }
+
+    results: dict[int, dict] = {}
+    changes_by_event: dict[int, dict[int, BookingStatus]] = defaultdict(dict)
+    for booking_id, status in requested.items():
+        booking = bookings.get(booking_id)
+        if booking is None:
+            results[booking_id] = {
+                "id": booking_id,
+                "success": False,
+                "message": "Booking not found.",
+            }
+        elif user.role == Role.UNIVERSITY and booking.event.organizer_id != user.id:
+            results[booking_id] = {
+                "id": booking_id,
+                "success": False,
+                "message": "You are not authorized to manage this booking.",
+            }
+        else:
+            changes_by_event[booking.event_id][booking.id] = status
+
+    rejected = set_event_booking_statuses(changes_by_event) if changes_by_event else set()
+    for event_id, changes in changes_by_event.items():
+        for booking_id, status in changes.items():
+            if event_id in rejected:
+                results[booking_id] = {
+                    "id": booking_id,
+                    "success": False,
+                    "message": "Not enough seats available for this event's batch.",
+                }
+            else:
+                results[booking_id] = {"id": booking_id, "success": True, "status": status.value}
+
+    if changes_by_event:
+        response_cache.invalidate("events")
+
+    ordered = [results[booking_id] for booking_id in requested]
+    updated = sum(1 for result in ordered if result["success"])
+    return (
+        jsonify({"results": ordered, "updated": updated, "failed": len(ordered) - updated}),
+        200,
+    )
+
+
 @bookings_bp.delete("/<int:booking_id>")
 @jwt_required()
 def cancel_booking(booking_id: int):
     booking = Booking.query.get_or_404(booking_id)
-    user = _current_user()
+    user = get_current_user()
     claims = get_jwt()
     role_value = claims.get("role")
     role = Role(role_value) if role_value else None
@@ -120,7 +292,7 @@ def cancel_booking(booking_id: int):
     if not (is_owner or is_admin or is_university_owner):
         return jsonify({"message": "You are not authorized to cancel this booking."}), 403
 
-    booking.status = BookingStatus.CANCELLED
-    db.session.commit()
+    set_booking_status(booking.id, BookingStatus.CANCELLED)
+    response_cache.invalidate("events")
 
     return jsonify({"message": "Booking cancelled."}), 200
@@ -35,7 +35,13 @@ def register_error_handlers(app):
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(err: HTTPException):
-        return jsonify({"message": err.description}), err.code
+        response = jsonify({"message": err.description})
+        response.status_code = err.code
+        # Keep headers such as Retry-After or Allow; the body is always JSON.
+        for name, value in err.get_headers():
+            if name.lower() != "content-type":
+                response.headers[name] = value
+        return response
 
     @app.errorhandler(Exception)
     def handle_generic_exception(err: Exception):
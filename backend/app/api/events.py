@@ -3,11 +3,11 @@ from __future__ import annotations
 from datetime import date
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy import asc, desc
+from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy.orm import selectinload
 
-from ..extensions import db
-from ..models import Booking, BookingStatus, Event, EventStatus, Role, User
+from ..extensions import db, rate_limiter, response_cache
+from ..models import Event, EventStatus, Role
 from ..schemas import (
     BookingSchema,
     BookingWriteSchema,
@@ -15,12 +15,17 @@ from ..schemas import (
     EventStatusSchema,
     EventWriteSchema,
 )
-from ..services.booking_service import seats_available
+from ..services.booking_service import active_booking_statement, book_seats, seats_available
+from ..services.identity_service import get_current_user
+from ..services.search_service import search_events
 from ..utils.pagination import (
     build_paginated_response,
     paginate_query,
+    paginate_request,
     resolve_pagination_params,
+    use_cursor_pagination,
 )
+from ..utils.replica import read_replica
 
 events_bp = Blueprint("events", __name__)
 
@@ -32,13 +37,6 @@ booking_schema = BookingSchema()
 booking_write_schema = BookingWriteSchema()
 
 
-def _current_user() -> User:
-    identity = get_jwt_identity()
-    if identity is None:
-        raise PermissionError("Authentication required.")
-    return User.query.get_or_404(int(identity))
-
-
 def _require_role(roles: list[Role]) -> None:
     claims = get_jwt()
     role_value = claims.get("role")
@@ -48,8 +46,10 @@ def _require_role(roles: list[Role]) -> None:
 
 @events_bp.get("/")
 @jwt_required(optional=True)
+@response_cache.cached("events")
+@read_replica
 def list_events():
-    query = Event.query
+    query = Event.query.options(selectinload(Event.organizer), selectinload(Event.university))
 
     status = request.args.get("status")
     if status:
@@ -73,6 +73,16 @@ def list_events():
     if end_date:
         query = query.filter(Event.date <= date.fromisoformat(end_date))
 
+    search = request.args.get("q", "").strip()
+    if search:
+        # Search results are relevance-ranked, so only page/page_size pagination applies.
+        if use_cursor_pagination():
+            return jsonify({"message": "Cursor pagination is not supported with q."}), 400
+        page, page_size = resolve_pagination_params()
+        events, total = paginate_query(search_events(query, search), page, page_size)
+        payload = build_paginated_response(events_schema.dump(events), total, page, page_size)
+        return jsonify(payload), 200
+
     order_by = request.args.get("order_by", "date")
     direction = request.args.get("direction", "asc")
 
@@ -83,25 +93,20 @@ def list_events():
     else:
         order_column = Event.date
 
-    if direction == "desc":
-        query = query.order_by(desc(order_column))
-    else:
-        query = query.order_by(asc(order_column))
-
-    page, page_size = resolve_pagination_params()
-    events, total = paginate_query(query, page, page_size)
-
-    payload = build_paginated_response(
-        events_schema.dump(events),
-        total,
-        page,
-        page_size,
+    payload = paginate_request(
+        query,
+        events_schema.dump,
+        order_column=order_column,
+        id_column=Event.id,
+        descending=direction == "desc",
     )
     return jsonify(payload), 200
 
 
 @events_bp.get("/<int:event_id>")
 @jwt_required(optional=True)
+@response_cache.cached("events")
+@read_replica
 def get_event(event_id: int):
     event = Event.query.get_or_404(event_id)
     return jsonify(event_schema.dump(event)), 200
@@ -118,7 +123,7 @@ def create_event():
     payload = request.get_json() or {}
     data = event_write_schema.load(payload)
 
-    user = _current_user()
+    user = get_current_user()
 
     event = Event(
         title=data["title"],
@@ -135,6 +140,7 @@ def create_event():
     )
     db.session.add(event)
     db.session.commit()
+    response_cache.invalidate("events")
 
     return jsonify(event_schema.dump(event)), 201
 
@@ -146,7 +152,7 @@ def update_event(event_id: int):
     data = event_write_schema.load(payload, partial=True)
 
     event = Event.query.get_or_404(event_id)
-    current_user = _current_user()
+    current_user = get_current_user()
 
     if current_user.role not in (Role.ADMIN, Role.UNIVERSITY):
         return jsonify({"message": "You are not allowed to update events."}), 403
@@ -158,6 +164,7 @@ def update_event(event_id: int):
         setattr(event, key, value)
 
     db.session.commit()
+    response_cache.invalidate("events")
     return jsonify(event_schema.dump(event)), 200
 
 
@@ -168,7 +175,7 @@ def update_event_status(event_id: int):
     data = event_status_schema.load(payload)
 
     event = Event.query.get_or_404(event_id)
-    current_user = _current_user()
+    current_user = get_current_user()
 
     if current_user.role not in (Role.ADMIN, Role.UNIVERSITY):
         return jsonify({"message": "You are not allowed to update event status."}), 403
@@ -178,6 +185,7 @@ def update_event_status(event_id: int):
 
     event.status = data["status"]
     db.session.commit()
+    response_cache.invalidate("events")
     return jsonify(event_schema.dump(event)), 200
 
 
@@ -185,7 +193,7 @@ def update_event_status(event_id: int):
 @jwt_required()
 def delete_event(event_id: int):
     event = Event.query.get_or_404(event_id)
-    current_user = _current_user()
+    current_user = get_current_user()
 
     if current_user.role not in (Role.ADMIN, Role.UNIVERSITY):
         return jsonify({"message": "You are not allowed to delete events."}), 403
@@ -195,11 +203,13 @@ def delete_event(event_id: int):
 
     db.session.delete(event)
     db.session.commit()
+    response_cache.invalidate("events")
     return jsonify({"message": "Event deleted."}), 200
 
 
 @events_bp.post("/<int:event_id>/book")
 @jwt_required()
+@rate_limiter.limit("book", "ip", "user")
 def book_event(event_id: int):
     try:
         _require_role([Role.USER])
@@ -214,32 +224,18 @@ def book_event(event_id: int):
     if event.status != EventStatus.PUBLISHED:
         return jsonify({"message": "This event is not open for booking."}), 400
 
-    user = _current_user()
+    user = get_current_user()
 
-    existing_booking = (
-        Booking.query.filter(
-            Booking.event_id == event.id,
-            Booking.user_id == user.id,
-            Booking.status.in_([BookingStatus.PENDING, BookingStatus.APPROVED]),
-        )
-        .order_by(Booking.created_at.desc())
-        .first()
-    )
-    if existing_booking:
+    if db.session.scalar(active_booking_statement(event.id, user.id)) is not None:
         return jsonify({"message": "You already have an active booking for this event."}), 409
 
     available = seats_available(event)
     if data["seats"] > available:
         return jsonify({"message": "Not enough seats available."}), 400
 
-    booking = Booking(
-        event_id=event.id,
-        user_id=user.id,
-        seats=data["seats"],
-        status=BookingStatus.PENDING,
-        notes=data.get("notes"),
-    )
-    db.session.add(booking)
-    db.session.commit()
+    booking = book_seats(event.id, user.id, data["seats"], notes=data.get("notes"))
+    if booking is None:
+        return jsonify({"message": "Not enough seats available."}), 400
+    response_cache.invalidate("events")
 
     return jsonify(booking_schema.dump(booking)), 201
@@ -4,24 +4,187 @@ import os
 from datetime import timedelta
 
 
+def _engine_options() -> dict:
+    """Pool settings from DB_POOL_* variables; unset ones keep SQLAlchemy's defaults.
+
+    Sizes and timeouts only apply to pooled databases such as PostgreSQL.
+    """
+    options = {"pool_pre_ping": os.environ.get("DB_POOL_PRE_PING", "false").lower() == "true"}
+    for option, variable, cast in (
+        ("pool_size", "DB_POOL_SIZE", int),
+        ("max_overflow", "DB_MAX_OVERFLOW", int),
+        ("pool_timeout", "DB_POOL_TIMEOUT", float),
+        ("pool_recycle", "DB_POOL_RECYCLE", int),
+    ):
+        if os.environ.get(variable):
+            options[option] = cast(os.environ[variable])
+    return options
+
+
 class BaseConfig:
     SECRET_KEY = os.environ.get("SECRET_KEY", "change-me")
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL", "sqlite:///event_planner.db")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options()
+    # Optional read replica. Views marked @read_replica send their SELECTs to it until
+    # the request writes anything; all other traffic stays on the primary. A response
+    # read from the replica is never put in the response or admin stats cache: right
+    # after a write the replica may still hold the old rows, and caching them under the
+    # new generation would serve them for the whole TTL. So with a replica those
+    # views are answered by the replica on every request instead of from the cache.
+    SQLALCHEMY_BINDS = (
+        {"replica": os.environ["DATABASE_REPLICA_URL"]}
+        if os.environ.get("DATABASE_REPLICA_URL")
+        else {}
+    )
+    # Run on every new SQLite connection (other databases ignore them). WAL lets reads
+    # proceed while a write is in progress, and busy_timeout makes a writer wait for the
+    # lock instead of failing with "database is locked" straight away.
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "foreign_keys": "ON",
+        "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "cache_size": -int(os.environ.get("SQLITE_CACHE_SIZE_KB", 20000)),
+        "mmap_size": int(os.environ.get("SQLITE_MMAP_SIZE_BYTES", 256 * 1024 * 1024)),
+        "temp_store": "MEMORY",
+    }
+    # Write transactions that hit a lock are retried this many times with backoff.
+    DB_LOCK_RETRY_ATTEMPTS = int(os.environ.get("DB_LOCK_RETRY_ATTEMPTS", 5))
+    DB_LOCK_RETRY_BASE_DELAY = float(os.environ.get("DB_LOCK_RETRY_BASE_DELAY", 0.02))
+
+    # Password hashing: scheme is pbkdf2_sha256, bcrypt or argon2 (needs argon2-cffi);
+    # rounds is the scheme's cost (iterations, log2 rounds or time cost). Hashes with
+    # another scheme or a lower cost are upgraded on the next successful login.
+    PASSWORD_HASH_SCHEME = os.environ.get("PASSWORD_HASH_SCHEME", "pbkdf2_sha256")
+    PASSWORD_HASH_ROUNDS = int(os.environ.get("PASSWORD_HASH_ROUNDS", 0)) or None
+    # Hashing runs in this many worker processes (0 hashes inline). At most
+    # PASSWORD_HASH_MAX_PENDING jobs are outstanding; others wait up to the timeout,
+    # then get a 503.
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 16))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get("PASSWORD_HASH_QUEUE_TIMEOUT", 2))
 
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY", "change-me-too")
     JWT_TOKEN_LOCATION = ["headers"]
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
+    # In-process cache for public event reads; writes invalidate it, the TTL bounds
+    # staleness between worker processes.
+    RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+    RESPONSE_CACHE_TTL_SECONDS = float(os.environ.get("RESPONSE_CACHE_TTL_SECONDS", 30))
+
+    # Cross-request cache of user records behind get_current_user(). Account changes
+    # invalidate it locally; other processes see them within the TTL. So a ban or a
+    # demotion made through one worker can take up to IDENTITY_CACHE_TTL_SECONDS to
+    # apply in the others. A token whose role claim differs from the cached copy
+    # always reloads the user. Lower the TTL, or disable the cache, for a tighter bound.
+    IDENTITY_CACHE_ENABLED = os.environ.get("IDENTITY_CACHE_ENABLED", "true").lower() == "true"
+    IDENTITY_CACHE_MAX_ENTRIES = int(os.environ.get("IDENTITY_CACHE_MAX_ENTRIES", 4096))
+    IDENTITY_CACHE_TTL_SECONDS = float(os.environ.get("IDENTITY_CACHE_TTL_SECONDS", 30))
+
+    ADMIN_STATS_CACHE_TTL_SECONDS = float(os.environ.get("ADMIN_STATS_CACHE_TTL_SECONDS", 15))
+
+    # Per-request query count and timings, reported as a Server-Timing header and a
+    # log line. Endpoints issuing more statements than their budget log a warning.
+    REQUEST_INSTRUMENTATION_ENABLED = (
+        os.environ.get("REQUEST_INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    )
+    SERVER_TIMING_ENABLED = os.environ.get("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 200))
+    QUERY_BUDGET_DEFAULT = int(os.environ.get("QUERY_BUDGET_DEFAULT", 15))
+    QUERY_BUDGETS = {
+        "api.events.list_events": 4,
+        "api.events.get_event": 3,
+        "api.bookings.my_bookings": 6,
+        "api.bookings.event_bookings": 6,
+        "api.bookings.organizer_bookings": 6,
+        "api.admin.list_users": 3,
+        "api.admin.admin_stats": 1,
+        "api.admin.admin_stats_timeseries": 2,
+    }
+
+    # Prometheus metrics at /api/metrics. Set PROMETHEUS_MULTIPROC_DIR (before start-up)
+    # to aggregate across worker processes; a token, when set, must be sent as a bearer.
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_AUTH_TOKEN = os.environ.get("METRICS_AUTH_TOKEN")
+
+    # Production server (gunicorn -c gunicorn.conf.py wsgi:app). The app is imported
+    # once in the master and SERVER_WORKERS processes are forked from it, each running
+    # SERVER_THREADS request threads. A worker is replaced after SERVER_MAX_REQUESTS
+    # requests (plus up to SERVER_MAX_REQUESTS_JITTER, so they do not all restart at
+    # once) to bound memory growth; 0 disables recycling. On SIGHUP (reload) or SIGTERM
+    # (shutdown) workers finish in-flight requests for up to SERVER_GRACEFUL_TIMEOUT
+    # seconds. A request running longer than SERVER_TIMEOUT gets its worker killed.
+    SERVER_BIND = os.environ.get("SERVER_BIND", "0.0.0.0:5000")
+    # Defaults to 2 x CPUs + 1, at most 8.
+    SERVER_WORKERS = int(os.environ.get("SERVER_WORKERS", 0)) or min(
+        2 * (os.cpu_count() or 1) + 1,
+        8,
+    )
+    SERVER_THREADS = int(os.environ.get("SERVER_THREADS", 4))
+    SERVER_MAX_REQUESTS = int(os.environ.get("SERVER_MAX_REQUESTS", 5000))
+    SERVER_MAX_REQUESTS_JITTER = int(os.environ.get("SERVER_MAX_REQUESTS_JITTER", 500))
+    SERVER_TIMEOUT = int(os.environ.get("SERVER_TIMEOUT", 60))
+    SERVER_GRACEFUL_TIMEOUT = int(os.environ.get("SERVER_GRACEFUL_TIMEOUT", 30))
+    SERVER_KEEPALIVE = int(os.environ.get("SERVER_KEEPALIVE", 5))
+    # Number of reverse proxies in front of the app that append to X-Forwarded-For
+    # (and X-Forwarded-Proto). Client IPs, used for rate limiting, are read from those
+    # headers only when this is set; keep it 0 when clients connect directly, since
+    # they could otherwise forge the headers.
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", 0))
+    PROXY_FIX_X_PROTO = int(os.environ.get("PROXY_FIX_X_PROTO", 0))
+
     CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "http://localhost:5173,http://localhost:5174,http://localhost:3000")
     PROPAGATE_EXCEPTIONS = True
 
+    # Token buckets per rule: {key: (capacity, seconds to refill completely)}, keyed by
+    # client IP, the email in the request body or the signed-in user. Buckets live in
+    # each process unless RATE_LIMIT_BACKEND is "redis" (shared; needs REDIS_URL).
+    RATE_LIMITING_ENABLED = os.environ.get("RATE_LIMITING_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_BACKEND = os.environ.get("RATE_LIMIT_BACKEND", "memory").lower()
+    RATE_LIMIT_MAX_BUCKETS = int(os.environ.get("RATE_LIMIT_MAX_BUCKETS", 100_000))
+    RATE_LIMITS = {
+        "login": {"ip": (30, 60), "email": (10, 300)},
+        "register": {"ip": (10, 600), "email": (3, 600)},
+        "verify": {"ip": (30, 600), "email": (10, 600)},
+        "resend_otp": {"ip": (10, 600), "email": (3, 600)},
+        "book": {"ip": (60, 60), "user": (20, 60)},
+    }
+
+    # Where OTP codes live: "database" (durable), "memory" (single process only) or
+    # "redis" (shared between workers; needs the redis package and REDIS_URL).
+    OTP_BACKEND = os.environ.get("OTP_BACKEND", "database").lower()
+    OTP_MEMORY_MAX_ENTRIES = int(os.environ.get("OTP_MEMORY_MAX_ENTRIES", 10000))
+    REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
     # Email Configuration
     MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
     MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     MAIL_SERVER = os.environ.get("MAIL_SERVER", "smtp.gmail.com")
     MAIL_PORT = int(os.environ.get("MAIL_PORT", 587))
+    MAIL_USE_TLS = os.environ.get("MAIL_USE_TLS", "true").lower() == "true"
+    MAIL_DEFAULT_SENDER = os.environ.get("MAIL_DEFAULT_SENDER")
+    MAIL_TIMEOUT = float(os.environ.get("MAIL_TIMEOUT", 10))
+    MAIL_CONNECTION_IDLE_SECONDS = float(os.environ.get("MAIL_CONNECTION_IDLE_SECONDS", 60))
+
+    # Outbound mail is queued in the email_outbox table. Each process starts a sender
+    # thread with its first request (gunicorn workers as soon as they are forked);
+    # disable it to run `flask send-emails` as a separate worker instead.
+    EMAIL_OUTBOX_WORKER_ENABLED = (
+        os.environ.get("EMAIL_OUTBOX_WORKER_ENABLED", "true").lower() == "true"
+    )
+    EMAIL_OUTBOX_POLL_SECONDS = float(os.environ.get("EMAIL_OUTBOX_POLL_SECONDS", 5))
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("EMAIL_OUTBOX_BATCH_SIZE", 50))
+    EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 6))
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS = int(os.environ.get("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30))
+    EMAIL_OUTBOX_RETRY_MAX_SECONDS = int(os.environ.get("EMAIL_OUTBOX_RETRY_MAX_SECONDS", 3600))
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.environ.get("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+    # Sent and failed messages (bodies include verification codes) are deleted by
+    # `flask purge-emails` once they are older than this.
+    EMAIL_OUTBOX_RETENTION_DAYS = float(os.environ.get("EMAIL_OUTBOX_RETENTION_DAYS", 7))
 
 
 class DevelopmentConfig(BaseConfig):
@@ -31,9 +194,15 @@ class DevelopmentConfig(BaseConfig):
 class TestingConfig(BaseConfig):
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_BINDS = {}
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=5)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(minutes=10)
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASH_ROUNDS = 1000
+    PASSWORD_HASH_WORKERS = 0
+    EMAIL_OUTBOX_WORKER_ENABLED = False
+    RATE_LIMITING_ENABLED = False
 
 
 class ProductionConfig(BaseConfig):
@@ -5,7 +5,17 @@ from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
 from flask_sqlalchemy import SQLAlchemy
 
+from .utils.cache import ResponseCache
+from .utils.instrumentation import RequestInstrumentation
+from .utils.metrics import MetricsExporter
+from .utils.rate_limit import RateLimiter
+from .utils.replica import RoutingSession
+
 cors = CORS()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 ma = Marshmallow()
 jwt = JWTManager()
+response_cache = ResponseCache()
+instrumentation = RequestInstrumentation()
+metrics = MetricsExporter()
+rate_limiter = RateLimiter()
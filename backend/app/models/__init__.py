@@ -4,6 +4,9 @@ from .base import BaseModel, TimestampMixin
 from .booking import Booking, BookingStatus
 from .event import Event, EventStatus
 from .otp import OTPCode
+from .outbox import OutboundEmail, OutboundEmailStatus
+from .rollup import DailyMetric, RollupWatermark
+from .session import RefreshSession
 from .university import UniversityProfile
 from .user import Role, User
 
@@ -18,4 +21,9 @@ __all__ = [
     "Booking",
     "BookingStatus",
     "OTPCode",
+    "OutboundEmail",
+    "OutboundEmailStatus",
+    "DailyMetric",
+    "RollupWatermark",
+    "RefreshSession",
 ]
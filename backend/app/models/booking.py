@@ -4,7 +4,7 @@ from enum import Enum
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Enum as SqlEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import BaseModel, TimestampMixin
@@ -23,16 +23,27 @@ class BookingStatus(str, Enum):
 
 class Booking(TimestampMixin, BaseModel):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Seat totals per event and status; includes seats so SUM() is index-only.
+        Index("ix_bookings_event_status", "event_id", "status", "seats"),
+        # Duplicate active booking check in book_event.
+        Index("ix_bookings_event_user_status", "event_id", "user_id", "status"),
+        # event_bookings and my_bookings, newest first.
+        Index("ix_bookings_event_created_at", "event_id", "created_at", "id"),
+        Index("ix_bookings_user_created_at", "user_id", "created_at", "id"),
+        # Incremental rollups: rows created or changed since the watermark, and the
+        # created_at range of the days being recomputed.
+        Index("ix_bookings_created_at", "created_at"),
+        Index("ix_bookings_updated_at", "updated_at"),
+    )
 
     event_id: Mapped[int] = mapped_column(
         ForeignKey("events.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     seats: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
     status: Mapped[BookingStatus] = mapped_column(
@@ -5,7 +5,7 @@ from decimal import Decimal
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric, String, Text, Time
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String, Text, Time
 from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -25,6 +25,18 @@ class EventStatus(str, Enum):
 
 class Event(TimestampMixin, BaseModel):
     __tablename__ = "events"
+    __table_args__ = (
+        # list_events: status filter with date ordering (the public listing).
+        Index("ix_events_status_date", "status", "date", "id"),
+        # list_events: organizer/university dashboards ordered by date.
+        Index("ix_events_organizer_date", "organizer_id", "date", "id"),
+        Index("ix_events_university_date", "university_id", "date", "id"),
+        # Unfiltered listings ordered by date or creation time.
+        Index("ix_events_date", "date", "id"),
+        Index("ix_events_created_at", "created_at", "id"),
+        # Incremental rollups: rows changed since the watermark.
+        Index("ix_events_updated_at", "updated_at"),
+    )
 
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
@@ -32,6 +44,13 @@ class Event(TimestampMixin, BaseModel):
     date: Mapped[date] = mapped_column(Date, nullable=False)
     time: Mapped[time] = mapped_column(Time, nullable=False)
     capacity: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Seats held by pending and approved bookings, maintained by the booking service.
+    reserved_seats: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
     price: Mapped[Decimal] = mapped_column(Numeric(10, 2), default=Decimal("0.00"), nullable=False)
     image_url: Mapped[str | None] = mapped_column(String(500))
     status: Mapped[EventStatus] = mapped_column(
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy import Boolean, DateTime, Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import BaseModel, TimestampMixin
@@ -10,8 +10,12 @@ from .base import BaseModel, TimestampMixin
 
 class OTPCode(TimestampMixin, BaseModel):
     __tablename__ = "otp_codes"
+    __table_args__ = (
+        # OTPService.verify: latest unused code for an email and purpose.
+        Index("ix_otp_codes_lookup", "email", "purpose", "is_used", "created_at"),
+    )
 
-    email: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     code: Mapped[str] = mapped_column(String(6), nullable=False)
     purpose: Mapped[str] = mapped_column(String(50), nullable=False, default="registration")
     expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
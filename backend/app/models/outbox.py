@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import DateTime, Index, Integer, String, Text
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel, TimestampMixin
+
+
+class OutboundEmailStatus(str, Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class OutboundEmail(TimestampMixin, BaseModel):
+    """A message waiting in the outbox; the background sender delivers it.
+
+    A sender claims a pending row by pushing ``next_attempt_at`` into the future, so
+    a row whose sender died is picked up again once that lease runs out.
+    """
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # deliver_pending: due pending rows, oldest first.
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
+
+    recipient: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[OutboundEmailStatus] = mapped_column(
+        SqlEnum(OutboundEmailStatus),
+        default=OutboundEmailStatus.PENDING,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+    last_error: Mapped[str | None] = mapped_column(String(500))
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return f"<OutboundEmail id={self.id} to={self.recipient} status={self.status}>"
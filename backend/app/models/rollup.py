@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel, TimestampMixin
+
+
+class DailyMetric(BaseModel):
+    """Pre-aggregated daily counts that back the admin time-series endpoint."""
+
+    __tablename__ = "daily_metrics"
+    __table_args__ = (Index("ix_daily_metrics_metric_day", "metric", "day", "university_id"),)
+
+    metric: Mapped[str] = mapped_column(String(50), nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False)
+    # NULL means the rows counted were not tied to a university. Deliberately not a
+    # foreign key: history survives the university being deleted.
+    university_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return f"<DailyMetric {self.metric} {self.day} {self.university_id} value={self.value}>"
+
+
+class RollupWatermark(TimestampMixin, BaseModel):
+    """Source rows created or updated before ``processed_until`` are rolled up."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), unique=True, nullable=False)
+    processed_until: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel, TimestampMixin
+
+
+class RefreshSession(TimestampMixin, BaseModel):
+    """One row per signed-in session; only its newest refresh token is accepted.
+
+    Refreshing swaps ``current_jti`` for the token it issues. Presenting any older
+    token of the session means it was copied, so the whole session is revoked.
+    """
+
+    __tablename__ = "refresh_sessions"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    current_jti: Mapped[str] = mapped_column(String(36), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging helper
+        return (
+            f"<RefreshSession id={self.id} user_id={self.user_id} "
+            f"revoked={bool(self.revoked_at)}>"
+        )
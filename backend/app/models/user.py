@@ -3,7 +3,7 @@ from __future__ import annotations
 from enum import Enum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Index, String
 from sqlalchemy import Enum as SqlEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,13 @@ class Role(str, Enum):
 
 class User(TimestampMixin, BaseModel):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin user list, optionally filtered by role, newest first.
+        Index("ix_users_role_created_at", "role", "created_at", "id"),
+        Index("ix_users_created_at", "created_at", "id"),
+        # Incremental rollups: rows changed since the watermark.
+        Index("ix_users_updated_at", "updated_at"),
+    )
 
     name: Mapped[str] = mapped_column(String(120), nullable=False)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from .base import AutoSchema, BaseSchema
-from .booking import BookingSchema, BookingStatusSchema, BookingWriteSchema
+from .booking import (
+    BookingBulkStatusSchema,
+    BookingSchema,
+    BookingStatusItemSchema,
+    BookingStatusSchema,
+    BookingWriteSchema,
+)
 from .event import EventSchema, EventStatusSchema, EventWriteSchema
 from .otp import OTPCodeSchema, OTPGenerateSchema, OTPVerifySchema
 from .university import UniversityProfileSchema, UniversityProfileWriteSchema
@@ -28,6 +34,8 @@ __all__ = [
     "EventWriteSchema",
     "BookingSchema",
     "BookingStatusSchema",
+    "BookingStatusItemSchema",
+    "BookingBulkStatusSchema",
     "BookingWriteSchema",
     "OTPCodeSchema",
     "OTPGenerateSchema",
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from marshmallow import EXCLUDE
 
-from ..extensions import db, ma
+from ..extensions import db, instrumentation, ma
 
 
 class BaseSchema(ma.SQLAlchemyAutoSchema):
@@ -14,6 +14,10 @@ class BaseSchema(ma.SQLAlchemyAutoSchema):
         include_relationships = True
         unknown = EXCLUDE
 
+    def dump(self, obj, *, many: bool | None = None):
+        with instrumentation.measure("serialize"):
+            return super().dump(obj, many=many)
+
 
 class AutoSchema(BaseSchema):
     """Backward-compatible alias providing shared config."""
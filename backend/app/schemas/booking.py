@@ -25,3 +25,15 @@ class BookingWriteSchema(Schema):
 
 class BookingStatusSchema(Schema):
     status = fields.Enum(BookingStatus, by_value=True, required=True)
+
+
+class BookingStatusItemSchema(BookingStatusSchema):
+    id = fields.Integer(required=True)
+
+
+class BookingBulkStatusSchema(Schema):
+    items = fields.List(
+        fields.Nested(BookingStatusItemSchema),
+        required=True,
+        validate=validate.Length(min=1, max=500),
+    )
@@ -17,8 +17,9 @@ class EventSchema(AutoSchema):
 
     class Meta(AutoSchema.Meta):
         model = Event
-        dump_only = ("id", "created_at", "updated_at")
+        dump_only = ("id", "created_at", "updated_at", "reserved_seats")
         include_fk = True
+        exclude = ("bookings",)
 
 
 class EventWriteSchema(Schema):
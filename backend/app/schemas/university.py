@@ -17,6 +17,7 @@ class UniversityProfileSchema(AutoSchema):
         model = UniversityProfile
         dump_only = ("id", "created_at", "updated_at")
         include_fk = True
+        exclude = ("events",)
 
 
 class UniversityProfileWriteSchema(Schema):
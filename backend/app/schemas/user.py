@@ -21,11 +21,14 @@ class UserSchema(AutoSchema):
         dump_only = ("id", "created_at", "updated_at", "password_hash")
         load_only = ("password_hash",)
         include_fk = True
+        include_relationships = False
 
 
 class UserDetailSchema(UserSchema):
     class Meta(UserSchema.Meta):
         include_relationships = True
+        # Booking and event collections are unbounded; they have their own endpoints.
+        exclude = ("bookings", "events_created")
 
 
 class UserWriteSchema(Schema):
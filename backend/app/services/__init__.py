@@ -1,3 +1,5 @@
 from __future__ import annotations
 
 # Service layer modules will be organized here as functionality grows.
+# Modules imported here register SQLAlchemy hooks (e.g. search index DDL).
+from . import search_service  # noqa: F401
@@ -1,23 +1,265 @@
 from __future__ import annotations
 
-from sqlalchemy import func
+from dataclasses import dataclass
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.sql import Select
 
 from ..extensions import db
-from ..models import Booking, BookingStatus, Event
+from ..models import Booking, BookingStatus, Event, EventStatus
+from ..utils.db import run_with_retry
+
+ACTIVE_BOOKING_STATUSES = (BookingStatus.PENDING, BookingStatus.APPROVED)
+
+
+@dataclass
+class SeatDrift:
+    event_id: int
+    recorded: int
+    actual: int
 
 
 def seats_reserved(event_id: int, exclude_booking_id: int | None = None) -> int:
+    """Authoritative seat total computed from the bookings table."""
     query = db.session.query(
         func.coalesce(func.sum(Booking.seats), 0),
     ).filter(
         Booking.event_id == event_id,
-        Booking.status.in_([BookingStatus.PENDING, BookingStatus.APPROVED]),
+        Booking.status.in_(ACTIVE_BOOKING_STATUSES),
     )
     if exclude_booking_id is not None:
         query = query.filter(Booking.id != exclude_booking_id)
     return int(query.scalar() or 0)
 
 
+def active_booking_statement(event_id: int, user_id: int) -> Select:
+    """Id of an active booking of ``user_id`` for ``event_id``, if there is one."""
+    return (
+        select(Booking.id)
+        .where(
+            Booking.event_id == event_id,
+            Booking.user_id == user_id,
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        )
+        .limit(1)
+    )
+
+
+def organizer_bookings_filter(organizer_id: int, statuses: list[BookingStatus] | None = None):
+    """Where-clause for the bookings on every event organized by ``organizer_id``."""
+    organizer_events = select(Event.id).where(Event.organizer_id == organizer_id)
+    criteria = [Booking.event_id.in_(organizer_events)]
+    if statuses:
+        criteria.append(Booking.status.in_(statuses))
+    return and_(*criteria)
+
+
+def organizer_status_counts_statement(organizer_id: int) -> Select:
+    """Booking counts per event and status across the events of ``organizer_id``."""
+    return (
+        select(Booking.event_id, Booking.status, func.count(Booking.id))
+        .where(organizer_bookings_filter(organizer_id))
+        .group_by(Booking.event_id, Booking.status)
+    )
+
+
 def seats_available(event: Event, exclude_booking_id: int | None = None) -> int:
-    reserved = seats_reserved(event.id, exclude_booking_id=exclude_booking_id)
+    reserved = event.reserved_seats
+    if exclude_booking_id is not None:
+        booking = db.session.get(Booking, exclude_booking_id)
+        if booking is not None and booking.status in ACTIVE_BOOKING_STATUSES:
+            reserved -= booking.seats
     return max(event.capacity - reserved, 0)
+
+
+def adjust_reserved_seats(event_id: int, delta: int) -> None:
+    """Apply ``delta`` to the event counter inside the caller's transaction."""
+    if not delta:
+        return
+    db.session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(reserved_seats=Event.reserved_seats + delta),
+    )
+
+
+def reserve_seats(event_id: int, seats: int, *, require_published: bool = True) -> bool:
+    """Atomically take ``seats`` from the event if capacity allows.
+
+    The capacity check and the increment are a single conditional UPDATE, so concurrent
+    reservations can never push ``reserved_seats`` past ``capacity``.
+    """
+    statement = update(Event).where(
+        Event.id == event_id,
+        Event.reserved_seats + seats <= Event.capacity,
+    )
+    if require_published:
+        statement = statement.where(Event.status == EventStatus.PUBLISHED)
+    result = db.session.execute(
+        statement.values(reserved_seats=Event.reserved_seats + seats),
+        execution_options={"synchronize_session": "fetch"},
+    )
+    return result.rowcount == 1
+
+
+def book_seats(
+    event_id: int,
+    user_id: int,
+    seats: int,
+    notes: str | None = None,
+) -> Booking | None:
+    """Reserve seats and create a pending booking in one short transaction.
+
+    Returns ``None`` when the event has no room left. Lock contention is retried.
+    """
+
+    def _attempt() -> Booking | None:
+        if not reserve_seats(event_id, seats):
+            db.session.rollback()
+            return None
+        booking = Booking(
+            event_id=event_id,
+            user_id=user_id,
+            seats=seats,
+            status=BookingStatus.PENDING,
+            notes=notes,
+        )
+        db.session.add(booking)
+        db.session.commit()
+        return booking
+
+    return run_with_retry(_attempt)
+
+
+def change_booking_status(booking: Booking, status: BookingStatus) -> bool:
+    """Move ``booking`` to ``status`` and keep the event's seat counter in step.
+
+    Returns ``False`` (leaving the booking untouched) when re-activating it would
+    exceed the event's capacity.
+    """
+    was_active = booking.status in ACTIVE_BOOKING_STATUSES
+    is_active = status in ACTIVE_BOOKING_STATUSES
+    if is_active and not was_active:
+        if not reserve_seats(booking.event_id, booking.seats, require_published=False):
+            return False
+    elif was_active and not is_active:
+        adjust_reserved_seats(booking.event_id, -booking.seats)
+    booking.status = status
+    return True
+
+
+def apply_event_status_changes(
+    event_id: int,
+    changes: list[tuple[Booking, BookingStatus]],
+) -> bool:
+    """Apply several status changes for bookings of one event with one capacity check.
+
+    Seats freed by the batch offset seats it takes, and the net increase is reserved
+    with a single guarded UPDATE. Returns ``False`` (applying nothing) when the whole
+    batch does not fit.
+    """
+    delta = 0
+    for booking, status in changes:
+        was_active = booking.status in ACTIVE_BOOKING_STATUSES
+        is_active = status in ACTIVE_BOOKING_STATUSES
+        if is_active and not was_active:
+            delta += booking.seats
+        elif was_active and not is_active:
+            delta -= booking.seats
+
+    if delta > 0:
+        if not reserve_seats(event_id, delta, require_published=False):
+            return False
+    else:
+        adjust_reserved_seats(event_id, delta)
+
+    for booking, status in changes:
+        booking.status = status
+    return True
+
+
+def set_booking_status(booking_id: int, status: BookingStatus) -> bool:
+    """Change one booking's status and commit, retrying on lock contention.
+
+    Returns ``False`` (committing nothing) when re-activating the booking would exceed
+    the event's capacity.
+    """
+
+    def _attempt() -> bool:
+        booking = db.session.get(Booking, booking_id)
+        if not change_booking_status(booking, status):
+            db.session.rollback()
+            return False
+        db.session.commit()
+        return True
+
+    return run_with_retry(_attempt)
+
+
+def set_event_booking_statuses(changes_by_event: dict[int, dict[int, BookingStatus]]) -> set[int]:
+    """Apply status changes grouped by event in one transaction, retrying on lock contention.
+
+    ``changes_by_event`` maps an event id to ``{booking_id: status}``. Each event's batch
+    is all-or-nothing (see :func:`apply_event_status_changes`). Returns the ids of the
+    events whose batch did not fit.
+    """
+
+    def _attempt() -> set[int]:
+        booking_ids = [
+            booking_id for changes in changes_by_event.values() for booking_id in changes
+        ]
+        bookings = {
+            booking.id: booking
+            for booking in db.session.scalars(select(Booking).where(Booking.id.in_(booking_ids)))
+        }
+        rejected = set()
+        for event_id, changes in changes_by_event.items():
+            batch = [(bookings[booking_id], status) for booking_id, status in changes.items()]
+            if not apply_event_status_changes(event_id, batch):
+                rejected.add(event_id)
+        db.session.commit()
+        return rejected
+
+    return run_with_retry(_attempt)
+
+
+def release_user_bookings(user_id: int) -> None:
+    """Return the seats held by a user's active bookings, e.g. before deleting the user."""
+    held = db.session.execute(
+        select(Booking.event_id, func.sum(Booking.seats))
+        .where(
+            Booking.user_id == user_id,
+            Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+        )
+        .group_by(Booking.event_id),
+    ).all()
+    for event_id, seats in held:
+        adjust_reserved_seats(event_id, -int(seats))
+
+
+def reconcile_reserved_seats(apply: bool = True) -> list[SeatDrift]:
+    """Recompute every event's counter in one grouped pass and report the drift."""
+    actual = (
+        select(
+            Booking.event_id,
+            func.sum(Booking.seats).label("seats"),
+        )
+        .where(Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+        .group_by(Booking.event_id)
+        .subquery()
+    )
+    actual_seats = func.coalesce(actual.c.seats, 0)
+    rows = db.session.execute(
+        select(Event.id, Event.reserved_seats, actual_seats)
+        .outerjoin(actual, actual.c.event_id == Event.id)
+        .where(Event.reserved_seats != actual_seats),
+    ).all()
+
+    drift = [SeatDrift(event_id=row[0], recorded=row[1], actual=int(row[2])) for row in rows]
+    if apply and drift:
+        db.session.execute(
+            update(Event),
+            [{"id": item.event_id, "reserved_seats": item.actual} for item in drift],
+        )
+        db.session.commit()
+    return drift
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+
+from flask import Flask, current_app, g
+from flask_jwt_extended import get_jwt, get_jwt_identity
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from werkzeug.exceptions import Forbidden, NotFound
+
+from ..extensions import db
+from ..models import User
+from ..utils.cache import TTLCache
+
+_cache_lock = threading.Lock()
+
+
+def _identity_cache(app: Flask | None = None) -> TTLCache:
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get("identity_cache")
+    if cache is None:
+        with _cache_lock:
+            cache = app.extensions.setdefault(
+                "identity_cache",
+                TTLCache(
+                    max_entries=app.config.get("IDENTITY_CACHE_MAX_ENTRIES", 4096),
+                    ttl=app.config.get("IDENTITY_CACHE_TTL_SECONDS", 30),
+                    name="identity",
+                ),
+            )
+    return cache
+
+
+def _detached_copy(user: User) -> User:
+    # A detached instance whose state counts as loaded, so merge(load=False) can
+    # attach a copy of it to any session without a SELECT.
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    copy = User(**values)
+    make_transient_to_detached(copy)
+    return copy
+
+
+def load_user(user_id: int, role: str | None = None) -> User | None:
+    """Return user ``user_id`` bound to the current session, using the identity cache.
+
+    ``role`` is the role claim of the caller's token. A cached copy with another role
+    predates a role change, possibly made in another worker, and is reloaded.
+    """
+    enabled = current_app.config.get("IDENTITY_CACHE_ENABLED", True)
+    cached = _identity_cache().get(user_id) if enabled else None
+    if cached is not None and (role is None or cached.role.value == role):
+        return db.session.merge(cached, load=False)
+
+    user = db.session.get(User, user_id)
+    if user is not None and enabled:
+        _identity_cache().set(user_id, _detached_copy(user))
+    return user
+
+
+def get_current_user() -> User:
+    """The authenticated user, loaded at most once per request.
+
+    Raises ``PermissionError`` without an identity, a 404 when the account no longer
+    exists and a 403 when it has been deactivated.
+    """
+    if "current_user" in g:
+        return g.current_user
+
+    identity = get_jwt_identity()
+    if identity is None:
+        raise PermissionError("Authentication required.")
+    user = load_user(int(identity), get_jwt().get("role"))
+    if user is None:
+        raise NotFound("Account not found.")
+    if not user.is_active:
+        raise Forbidden("This account has been deactivated.")
+    g.current_user = user
+    return user
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop ``user_id`` from the identity cache after its account changes.
+
+    Other worker processes keep their copy until it expires, which bounds how long a
+    ban takes to apply everywhere to ``IDENTITY_CACHE_TTL_SECONDS``.
+    """
+    _identity_cache().delete(user_id)
+    if g.get("current_user") is not None and g.current_user.id == user_id:
+        g.pop("current_user")
+
+
+def forget_current_user(_exc: BaseException | None = None) -> None:
+    g.pop("current_user", None)
+
+
+def clear_identity_cache() -> None:
+    _identity_cache().clear()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.sql import Select
+
+from ..extensions import db
+from ..models import Booking, BookingStatus, Event, EventStatus, OTPCode, Role, User
+from .booking_service import (
+    ACTIVE_BOOKING_STATUSES,
+    active_booking_statement,
+    organizer_bookings_filter,
+    organizer_status_counts_statement,
+)
+from .rollup_service import changed_days_statement, metric_sources, recompute_statement
+from .stats_service import admin_stats_statement
+
+SAMPLE_ID = 1
+SAMPLE_EMAIL = "someone@example.com"
+
+
+@dataclass(frozen=True)
+class CheckedQuery:
+    """A statement to EXPLAIN and what its plan is expected to look like.
+
+    ``index`` is the index the plan must use. A scan or a sort that no index can
+    avoid is only accepted when the query states why in ``allow_scan``/``allow_sort``.
+    """
+
+    build: Callable[[], Select]
+    index: str | None = None
+    allow_scan: str | None = None
+    allow_sort: str | None = None
+
+
+@dataclass
+class QueryPlan:
+    name: str
+    sql: str
+    plan: list[str]
+    warnings: list[str] = field(default_factory=list)
+    note: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.warnings
+
+
+def _representative_queries() -> dict[str, CheckedQuery]:
+    """Statements shaped like the ones the endpoints and services issue.
+
+    Where a view or service builds its statement in a helper, the helper is used here;
+    keep the remaining shapes in step with ``app/api`` and ``app/services`` so the
+    advisor checks what production actually runs.
+    """
+    today = date.today()
+    return {
+        "events.list_events (status, date)": CheckedQuery(
+            lambda: select(Event)
+            .where(Event.status == EventStatus.PUBLISHED, Event.date >= today)
+            .order_by(Event.date, Event.id)
+            .limit(10),
+            index="ix_events_status_date",
+        ),
+        "events.list_events (organizer)": CheckedQuery(
+            lambda: select(Event)
+            .where(Event.organizer_id == SAMPLE_ID)
+            .order_by(Event.date, Event.id)
+            .limit(10),
+            index="ix_events_organizer_date",
+        ),
+        "events.list_events (university)": CheckedQuery(
+            lambda: select(Event)
+            .where(Event.university_id == SAMPLE_ID)
+            .order_by(Event.date, Event.id)
+            .limit(10),
+            index="ix_events_university_date",
+        ),
+        "events.list_events (created_at)": CheckedQuery(
+            lambda: select(Event).order_by(desc(Event.created_at), desc(Event.id)).limit(10),
+            index="ix_events_created_at",
+            allow_scan="unfiltered list; reads one page from the index and stops",
+        ),
+        "events.book_event (duplicate check)": CheckedQuery(
+            lambda: active_booking_statement(SAMPLE_ID, SAMPLE_ID),
+            index="ix_bookings_event_user_status",
+        ),
+        "booking_service.seats_reserved": CheckedQuery(
+            lambda: select(func.coalesce(func.sum(Booking.seats), 0)).where(
+                Booking.event_id == SAMPLE_ID,
+                Booking.status.in_(ACTIVE_BOOKING_STATUSES),
+            ),
+            index="ix_bookings_event_status",
+        ),
+        "bookings.my_bookings": CheckedQuery(
+            lambda: select(Booking)
+            .where(Booking.user_id == SAMPLE_ID)
+            .order_by(desc(Booking.created_at), desc(Booking.id))
+            .limit(10),
+            index="ix_bookings_user_created_at",
+        ),
+        "bookings.event_bookings": CheckedQuery(
+            lambda: select(Booking)
+            .where(Booking.event_id == SAMPLE_ID)
+            .order_by(desc(Booking.created_at), desc(Booking.id))
+            .limit(10),
+            index="ix_bookings_event_created_at",
+        ),
+        "bookings.event_bookings (count)": CheckedQuery(
+            lambda: select(func.count(Booking.id)).where(Booking.event_id == SAMPLE_ID),
+        ),
+        "bookings.organizer_bookings": CheckedQuery(
+            lambda: select(Booking)
+            .where(organizer_bookings_filter(SAMPLE_ID, [BookingStatus.PENDING]))
+            .order_by(desc(Booking.created_at), desc(Booking.id))
+            .limit(10),
+            index="ix_bookings_event_status",
+            allow_sort=(
+                "bookings of several events are merged and sorted; the sort only covers "
+                "the organizer's matching bookings"
+            ),
+        ),
+        "bookings.organizer_bookings (counts)": CheckedQuery(
+            lambda: organizer_status_counts_statement(SAMPLE_ID),
+            index="ix_bookings_event_status",
+        ),
+        "admin.list_users (role)": CheckedQuery(
+            lambda: select(User)
+            .where(User.role == Role.USER)
+            .order_by(desc(User.created_at), desc(User.id))
+            .limit(10),
+            index="ix_users_role_created_at",
+        ),
+        "admin.list_users": CheckedQuery(
+            lambda: select(User).order_by(desc(User.created_at), desc(User.id)).limit(10),
+            index="ix_users_created_at",
+            allow_scan="unfiltered list; reads one page from the index and stops",
+        ),
+        "admin.stats": CheckedQuery(
+            admin_stats_statement,
+            allow_scan="counts every row of each table once; served from a short TTL cache",
+        ),
+        **_rollup_queries(),
+        "otp_service.verify": CheckedQuery(
+            lambda: select(OTPCode)
+            .where(
+                OTPCode.email == SAMPLE_EMAIL,
+                OTPCode.purpose == "registration",
+                OTPCode.is_used.is_(False),
+                OTPCode.expires_at >= datetime.utcnow(),
+            )
+            .order_by(desc(OTPCode.created_at))
+            .limit(1),
+            index="ix_otp_codes_lookup",
+        ),
+    }
+
+
+def _rollup_queries() -> dict[str, CheckedQuery]:
+    since = datetime.utcnow() - timedelta(hours=1)
+    days = [date.today() - timedelta(days=1), date.today()]
+    queries = {}
+    for metric, source in metric_sources().items():
+        table = source.created_at.class_.__tablename__
+        queries[f"rollup.changed_days ({metric})"] = CheckedQuery(
+            lambda source=source: changed_days_statement(source, since),
+            index=f"ix_{table}_updated_at",
+        )
+        queries[f"rollup.recompute ({metric})"] = CheckedQuery(
+            lambda source=source: recompute_statement(source, days),
+            index=f"ix_{table}_created_at",
+            allow_sort="groups the recomputed days' rows by day",
+        )
+    return queries
+
+
+def _plan_warnings(dialect: str, plan: list[str], query: CheckedQuery) -> list[str]:
+    warnings = []
+    # Reading back a materialized subquery is not a table scan.
+    materialized = {
+        line.split()[1]
+        for line in plan
+        if line.strip().startswith(("MATERIALIZE ", "CO-ROUTINE "))
+    }
+    for line in plan:
+        detail = line.strip()
+        if dialect == "sqlite":
+            if detail.startswith("SCAN ") and detail.split()[1] in materialized:
+                continue
+            # A SCAN reads the whole table or index, whichever it names.
+            if detail.startswith("SCAN ") and query.allow_scan is None:
+                warnings.append(f"full scan: {detail}")
+            elif "USE TEMP B-TREE" in detail and query.allow_sort is None:
+                warnings.append(f"sort without index: {detail}")
+        elif "Seq Scan" in detail and query.allow_scan is None:
+            warnings.append(f"full table scan: {detail}")
+        elif detail.lstrip("-> ").startswith("Sort  ") and query.allow_sort is None:
+            warnings.append(f"sort without index: {detail}")
+    if query.index is not None and not any(query.index in line for line in plan):
+        warnings.append(f"does not use {query.index}")
+    return warnings
+
+
+def explain_queries() -> list[QueryPlan]:
+    """Run EXPLAIN (QUERY PLAN) for each representative query and check its plan."""
+    engine = db.engine
+    dialect = engine.dialect.name
+    prefix = "EXPLAIN QUERY PLAN" if dialect == "sqlite" else "EXPLAIN"
+
+    results = []
+    with engine.connect() as connection:
+        for name, query in _representative_queries().items():
+            sql = str(
+                query.build().compile(
+                    dialect=engine.dialect,
+                    compile_kwargs={"literal_binds": True},
+                ),
+            )
+            rows = connection.exec_driver_sql(f"{prefix} {sql}").all()
+            plan = [row[-1] for row in rows]
+            results.append(
+                QueryPlan(
+                    name=name,
+                    sql=sql,
+                    plan=plan,
+                    warnings=_plan_warnings(dialect, plan, query),
+                    note=query.allow_scan or query.allow_sort,
+                ),
+            )
+    return results
@@ -1,31 +1,177 @@
 from __future__ import annotations
 
-from datetime import datetime
+import hmac
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 
-from sqlalchemy import and_
+from flask import Flask, current_app
+from sqlalchemy import delete, or_, select, update
 
 from ..extensions import db
 from ..models import OTPCode
 from ..schemas import OTPGenerateSchema, OTPVerifySchema
-from ..utils.security import generate_otp_code, otp_expiry
+from ..utils.cache import TTLCache
+from ..utils.redis_client import get_redis
+from ..utils.security import OTP_TTL_MINUTES, generate_otp_code, otp_expiry
+
+OTP_BACKENDS = ("database", "memory", "redis")
+
+_store_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class IssuedOTP:
+    email: str
+    purpose: str
+    code: str
+    expires_at: datetime
+
+
+class DatabaseOTPStore:
+    """Durable store on the otp_codes table. Issuing a code marks older ones used."""
+
+    def issue(self, otp: IssuedOTP) -> None:
+        db.session.execute(
+            update(OTPCode)
+            .where(
+                OTPCode.email == otp.email,
+                OTPCode.purpose == otp.purpose,
+                OTPCode.is_used.is_(False),
+            )
+            .values(is_used=True),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.add(
+            OTPCode(
+                email=otp.email,
+                purpose=otp.purpose,
+                code=otp.code,
+                expires_at=otp.expires_at,
+            ),
+        )
+        db.session.commit()
+
+    def _latest(self, email: str, purpose: str) -> OTPCode | None:
+        return db.session.scalars(
+            select(OTPCode)
+            .where(
+                OTPCode.email == email,
+                OTPCode.purpose == purpose,
+                OTPCode.is_used.is_(False),
+                OTPCode.expires_at >= datetime.utcnow(),
+            )
+            .order_by(OTPCode.created_at.desc())
+            .limit(1),
+        ).first()
+
+    def consume(self, email: str, purpose: str, code: str) -> bool:
+        otp = self._latest(email, purpose)
+        if otp is None or not hmac.compare_digest(otp.code, code):
+            return False
+        otp.mark_used()
+        db.session.commit()
+        return True
+
+    def peek(self, email: str, purpose: str) -> IssuedOTP | None:
+        otp = self._latest(email, purpose)
+        if otp is None:
+            return None
+        return IssuedOTP(otp.email, otp.purpose, otp.code, otp.expires_at)
+
+
+class MemoryOTPStore:
+    """Per-process TTL store; only suitable for a single worker process."""
+
+    def __init__(self, max_entries: int):
+        self._codes = TTLCache(max_entries=max_entries, ttl=OTP_TTL_MINUTES * 60, name="otp")
+        self._lock = threading.Lock()
+
+    def issue(self, otp: IssuedOTP) -> None:
+        self._codes.set((otp.email, otp.purpose), otp)
+
+    def consume(self, email: str, purpose: str, code: str) -> bool:
+        with self._lock:
+            otp = self.peek(email, purpose)
+            if otp is None or not hmac.compare_digest(otp.code, code):
+                return False
+            self._codes.delete((email, purpose))
+            return True
+
+    def peek(self, email: str, purpose: str) -> IssuedOTP | None:
+        otp = self._codes.get((email, purpose))
+        if otp is None or otp.expires_at < datetime.utcnow():
+            return None
+        return otp
+
+
+class RedisOTPStore:
+    """Shared TTL store for several workers; needs the optional ``redis`` package."""
+
+    # Delete the key only if it still holds the submitted code, so a code is used once.
+    _CONSUME = (
+        "if redis.call('GET', KEYS[1]) == ARGV[1] then "
+        "return redis.call('DEL', KEYS[1]) end return 0"
+    )
+
+    def __init__(self, client):
+        self._client = client
+        self._consume = self._client.register_script(self._CONSUME)
+
+    @staticmethod
+    def _key(email: str, purpose: str) -> str:
+        return f"otp:{purpose}:{email}"
+
+    def issue(self, otp: IssuedOTP) -> None:
+        ttl = max(int((otp.expires_at - datetime.utcnow()).total_seconds()), 1)
+        self._client.set(self._key(otp.email, otp.purpose), otp.code, ex=ttl)
+
+    def consume(self, email: str, purpose: str, code: str) -> bool:
+        return bool(self._consume(keys=[self._key(email, purpose)], args=[code]))
+
+    def peek(self, email: str, purpose: str) -> IssuedOTP | None:
+        key = self._key(email, purpose)
+        code, ttl = self._client.get(key), self._client.ttl(key)
+        if code is None or ttl < 0:
+            return None
+        return IssuedOTP(email, purpose, code, datetime.utcnow() + timedelta(seconds=ttl))
+
+
+def _otp_store(app: Flask | None = None):
+    app = app or current_app._get_current_object()
+    store = app.extensions.get("otp_store")
+    if store is None:
+        backend = app.config.get("OTP_BACKEND", "database")
+        if backend not in OTP_BACKENDS:
+            raise RuntimeError(f"Unknown OTP_BACKEND {backend!r}; use one of {OTP_BACKENDS}.")
+        with _store_lock:
+            store = app.extensions.get("otp_store")
+            if store is None:
+                if backend == "memory":
+                    store = MemoryOTPStore(app.config.get("OTP_MEMORY_MAX_ENTRIES", 10000))
+                elif backend == "redis":
+                    store = RedisOTPStore(get_redis(app))
+                else:
+                    store = DatabaseOTPStore()
+                app.extensions["otp_store"] = store
+    return store
 
 
 class OTPService:
     purpose = "registration"
 
     @classmethod
-    def generate(cls, email: str, purpose: str | None = None) -> OTPCode:
+    def generate(cls, email: str, purpose: str | None = None) -> IssuedOTP:
+        """Issue a new code for ``email``; any earlier code for the same purpose stops working."""
         purpose = purpose or cls.purpose
         data = OTPGenerateSchema().load({"email": email, "purpose": purpose})
-        code = generate_otp_code()
-        otp = OTPCode(
+        otp = IssuedOTP(
             email=data["email"],
             purpose=data["purpose"],
-            code=code,
+            code=generate_otp_code(),
             expires_at=otp_expiry(),
         )
-        db.session.add(otp)
-        db.session.commit()
+        _otp_store().issue(otp)
         return otp
 
     @classmethod
@@ -34,23 +180,27 @@ class OTPService:
         data = OTPVerifySchema().load(
             {"email": email, "code": code, "purpose": purpose},
         )
-        otp = (
-            OTPCode.query.filter(
-                and_(
-                    OTPCode.email == data["email"],
-                    OTPCode.code == data["code"],
-                    OTPCode.purpose == data["purpose"],
-                    OTPCode.is_used.is_(False),  # noqa: E131
-                ),
-            )
-            .order_by(OTPCode.created_at.desc())
-            .first()
-        )
-        if not otp:
-            return False
-        if otp.expires_at < datetime.utcnow():
-            return False
+        return _otp_store().consume(data["email"], data["purpose"], data["code"])
 
-        otp.mark_used()
+    @classmethod
+    def peek(cls, email: str, purpose: str | None = None) -> IssuedOTP | None:
+        """The code currently valid for ``email``, without consuming it."""
+        return _otp_store().peek(email, purpose or cls.purpose)
+
+
+def purge_otp_codes(batch_size: int = 1000) -> int:
+    """Delete used and expired rows from otp_codes, ``batch_size`` rows per transaction."""
+    removed = 0
+    while True:
+        ids = db.session.scalars(
+            select(OTPCode.id)
+            .where(or_(OTPCode.is_used.is_(True), OTPCode.expires_at < datetime.utcnow()))
+            .limit(batch_size),
+        ).all()
+        if not ids:
+            return removed
+        db.session.execute(delete(OTPCode).where(OTPCode.id.in_(ids)))
         db.session.commit()
-        return True
+        removed += len(ids)
+        if len(ids) < batch_size:
+            return removed
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import logging
+import os
+import smtplib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from flask import Flask, current_app
+from sqlalchemy import delete, select, update
+
+from ..extensions import db
+from ..models import OutboundEmail, OutboundEmailStatus
+from ..utils.metrics import EMAIL_SEND_LATENCY
+
+logger = logging.getLogger(__name__)
+
+# Errors after which the connection cannot be trusted for the rest of the batch.
+CONNECTION_ERRORS = (
+    smtplib.SMTPAuthenticationError,
+    smtplib.SMTPConnectError,
+    smtplib.SMTPServerDisconnected,
+)
+
+
+@dataclass
+class DeliveryReport:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def claimed(self) -> int:
+        return self.sent + self.retried + self.failed
+
+
+class SMTPTransport:
+    """An authenticated SMTP connection that is kept open across messages and batches.
+
+    Without credentials nothing is sent: the message is printed instead, which is how
+    verification codes reach developers running the app locally.
+    """
+
+    def __init__(self, config):
+        self.host = config.get("MAIL_SERVER", "smtp.gmail.com")
+        self.port = int(config.get("MAIL_PORT", 587))
+        self.use_tls = config.get("MAIL_USE_TLS", True)
+        self.username = config.get("MAIL_USERNAME")
+        self.password = config.get("MAIL_PASSWORD")
+        self.sender = config.get("MAIL_DEFAULT_SENDER") or self.username
+        self.timeout = float(config.get("MAIL_TIMEOUT", 10))
+        self.max_idle = float(config.get("MAIL_CONNECTION_IDLE_SECONDS", 60))
+        self._smtp: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.username and self.password)
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            smtp.login(self.username, self.password)
+        except BaseException:
+            smtp.close()
+            raise
+        logger.info("SMTP connection to %s:%s established", self.host, self.port)
+        return smtp
+
+    def check(self) -> None:
+        """Drop the connection if the server has closed it or it sat idle too long."""
+        if self._smtp is None:
+            return
+        if time.monotonic() - self._last_used > self.max_idle:
+            self.close()
+            return
+        try:
+            alive = self._smtp.noop()[0] == 250
+        except OSError:
+            alive = False
+        if not alive:
+            self._smtp.close()
+            self._smtp = None
+
+    def send(self, recipient: str, subject: str, body: str) -> None:
+        if not self.configured:
+            print(
+                f"\n{'=' * 60}\nDEVELOPMENT MODE - Email would be sent:\n"
+                f"To: {recipient}\nSubject: {subject}\nBody:\n{body}\n{'=' * 60}\n",
+                flush=True,
+            )
+            return
+
+        message = EmailMessage()
+        message["Subject"] = subject
+        message["From"] = self.sender
+        message["To"] = recipient
+        message.set_content(body)
+        if self._smtp is None:
+            self._smtp = self._connect()
+        self._smtp.send_message(message)
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except OSError:
+            self._smtp.close()
+        self._smtp = None
+
+
+def enqueue_email(subject: str, recipient: str, body: str) -> OutboundEmail:
+    """Store a message in the outbox and nudge the background sender."""
+    email = OutboundEmail(
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.session.add(email)
+    db.session.commit()
+    outbox_worker.wake(current_app._get_current_object())
+    return email
+
+
+def _claim_due(now: datetime, limit: int) -> list[int]:
+    due = db.session.execute(
+        select(OutboundEmail.id, OutboundEmail.attempts)
+        .where(
+            OutboundEmail.status == OutboundEmailStatus.PENDING,
+            OutboundEmail.next_attempt_at <= now,
+        )
+        .order_by(OutboundEmail.next_attempt_at, OutboundEmail.id)
+        .limit(limit),
+    ).all()
+    lease_until = now + timedelta(seconds=current_app.config.get("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+    claimed = []
+    for email_id, attempts in due:
+        # Conditional on the attempt count we read, so two senders never share a row.
+        result = db.session.execute(
+            update(OutboundEmail)
+            .where(OutboundEmail.id == email_id, OutboundEmail.attempts == attempts)
+            .values(attempts=attempts + 1, next_attempt_at=lease_until),
+            execution_options={"synchronize_session": False},
+        )
+        if result.rowcount == 1:
+            claimed.append(email_id)
+    db.session.commit()
+    return claimed
+
+
+def _schedule_retry(email: OutboundEmail, error: Exception, report: DeliveryReport) -> None:
+    config = current_app.config
+    email.last_error = str(error)[:500]
+    if email.attempts >= config.get("EMAIL_OUTBOX_MAX_ATTEMPTS", 6):
+        email.status = OutboundEmailStatus.FAILED
+        report.failed += 1
+        logger.error("Giving up on email %s to %s: %s", email.id, email.recipient, error)
+        return
+    delay = min(
+        config.get("EMAIL_OUTBOX_RETRY_BASE_SECONDS", 30) * 2 ** (email.attempts - 1),
+        config.get("EMAIL_OUTBOX_RETRY_MAX_SECONDS", 3600),
+    )
+    email.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+    report.retried += 1
+    logger.warning(
+        "Email %s to %s failed, retrying in %ss: %s",
+        email.id,
+        email.recipient,
+        delay,
+        error,
+    )
+
+
+def _classify(error: OSError) -> str:
+    # smtplib errors are OSErrors too, so the most specific checks come first.
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return "reject"
+    if isinstance(error, CONNECTION_ERRORS):
+        return "reconnect"
+    if isinstance(error, smtplib.SMTPResponseException):
+        return "reject" if error.smtp_code >= 500 else "retry"
+    if isinstance(error, smtplib.SMTPException):
+        return "retry"
+    return "reconnect"
+
+
+def deliver_pending(transport: SMTPTransport, batch_size: int | None = None) -> DeliveryReport:
+    """Send one batch of due outbox messages over ``transport``.
+
+    Permanent rejections (5xx) fail the message at once; anything else is retried with
+    exponential backoff until ``EMAIL_OUTBOX_MAX_ATTEMPTS``. When the connection itself
+    breaks, the rest of the batch is rescheduled rather than tried against it.
+    """
+    report = DeliveryReport()
+    batch_size = batch_size or current_app.config.get("EMAIL_OUTBOX_BATCH_SIZE", 50)
+    claimed = _claim_due(datetime.utcnow(), batch_size)
+    if not claimed:
+        return report
+
+    emails = db.session.scalars(
+        select(OutboundEmail).where(OutboundEmail.id.in_(claimed)).order_by(OutboundEmail.id),
+    ).all()
+    transport.check()
+    for index, email in enumerate(emails):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            transport.send(email.recipient, email.subject, email.body)
+            outcome = "sent"
+        except OSError as exc:
+            action = _classify(exc)
+            if action == "reconnect":
+                transport.close()
+                for pending in emails[index:]:
+                    _schedule_retry(pending, exc, report)
+                break
+            if action == "reject":
+                email.status = OutboundEmailStatus.FAILED
+                email.last_error = str(exc)[:500]
+                report.failed += 1
+                logger.error("Email %s to %s was rejected: %s", email.id, email.recipient, exc)
+            else:
+                _schedule_retry(email, exc, report)
+        else:
+            email.status = OutboundEmailStatus.SENT
+            email.sent_at = datetime.utcnow()
+            email.last_error = None
+            report.sent += 1
+        finally:
+            EMAIL_SEND_LATENCY.labels(outcome).observe(time.perf_counter() - started)
+    db.session.commit()
+    return report
+
+
+def purge_outbox(older_than: timedelta | None = None, batch_size: int = 1000) -> int:
+    """Delete sent and failed messages last attempted more than ``older_than`` ago.
+
+    Bodies hold verification codes in plain text, so they are not kept for longer
+    than ``EMAIL_OUTBOX_RETENTION_DAYS``. Deletes ``batch_size`` rows per transaction.
+    """
+    if older_than is None:
+        older_than = timedelta(days=current_app.config.get("EMAIL_OUTBOX_RETENTION_DAYS", 7))
+    # next_attempt_at holds the lease of the last attempt, so ix_email_outbox_due
+    # serves this lookup.
+    cutoff = datetime.utcnow() - older_than
+    removed = 0
+    while True:
+        ids = db.session.scalars(
+            select(OutboundEmail.id)
+            .where(
+                OutboundEmail.status.in_([OutboundEmailStatus.SENT, OutboundEmailStatus.FAILED]),
+                OutboundEmail.next_attempt_at < cutoff,
+            )
+            .limit(batch_size),
+        ).all()
+        if not ids:
+            return removed
+        db.session.execute(delete(OutboundEmail).where(OutboundEmail.id.in_(ids)))
+        db.session.commit()
+        removed += len(ids)
+        if len(ids) < batch_size:
+            return removed
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox through one reused SMTP connection.
+
+    ``init_app`` starts it with the first request of each process, so rows waiting for
+    a retry or an expired lease are delivered without new mail being queued. It polls
+    every ``EMAIL_OUTBOX_POLL_SECONDS`` for those and for rows queued by other
+    processes; an enqueue in this process wakes it at once.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def init_app(self, app: Flask) -> None:
+        if app.config.get("EMAIL_OUTBOX_WORKER_ENABLED", True):
+            app.before_request(lambda: self.start(app))
+
+    def _running(self) -> bool:
+        # A thread recorded before fork() does not exist in this process.
+        thread = self._thread
+        return thread is not None and self._pid == os.getpid() and thread.is_alive()
+
+    def start(self, app: Flask) -> None:
+        """Start the sender thread in this process unless it is already running."""
+        if not app.config.get("EMAIL_OUTBOX_WORKER_ENABLED", True) or self._running():
+            return
+        with self._lock:
+            if self._running():
+                return
+            self._stopping.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self.run,
+                args=(app,),
+                name="email-outbox",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def wake(self, app: Flask) -> None:
+        if not app.config.get("EMAIL_OUTBOX_WORKER_ENABLED", True):
+            return
+        self.start(app)
+        self._wakeup.set()
+
+    def run(self, app: Flask) -> None:
+        transport = SMTPTransport(app.config)
+        poll_seconds = app.config.get("EMAIL_OUTBOX_POLL_SECONDS", 5)
+        batch_size = app.config.get("EMAIL_OUTBOX_BATCH_SIZE", 50)
+        try:
+            while not self._stopping.is_set():
+                self._wakeup.clear()
+                try:
+                    with app.app_context():
+                        report = deliver_pending(transport, batch_size)
+                except Exception:
+                    logger.exception("Email outbox delivery failed")
+                    report = DeliveryReport()
+                if report.claimed < batch_size:
+                    self._wakeup.wait(poll_seconds)
+        finally:
+            transport.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout)
+        self._thread = None
+
+
+outbox_worker = OutboxWorker()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import Date, delete, func, insert, null, select, union
+from sqlalchemy.sql import CompoundSelect, Select
+
+from ..extensions import db
+from ..models import Booking, BookingStatus, DailyMetric, Event, RollupWatermark, User
+
+WATERMARK_NAME = "daily_metrics"
+# Rows written while the previous run was reading are picked up by re-scanning a
+# short overlap; recomputing a day is idempotent, so the overlap is harmless.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+DAY_BATCH_SIZE = 500
+GRANULARITIES = ("day", "week", "month")
+METRICS = ("users", "events", "bookings", "approved_bookings")
+
+
+@dataclass(frozen=True)
+class MetricSource:
+    created_at: object
+    updated_at: object
+    # None for metrics without a university dimension.
+    university_id: object
+    from_clause: object
+    condition: object = None
+
+
+def metric_sources() -> dict[str, MetricSource]:
+    bookings_with_event = Booking.__table__.join(Event.__table__, Event.id == Booking.event_id)
+    return {
+        "users": MetricSource(
+            created_at=User.created_at,
+            updated_at=User.updated_at,
+            university_id=None,
+            from_clause=User.__table__,
+        ),
+        "events": MetricSource(
+            created_at=Event.created_at,
+            updated_at=Event.updated_at,
+            university_id=Event.university_id,
+            from_clause=Event.__table__,
+        ),
+        "bookings": MetricSource(
+            created_at=Booking.created_at,
+            updated_at=Booking.updated_at,
+            university_id=Event.university_id,
+            from_clause=bookings_with_event,
+        ),
+        "approved_bookings": MetricSource(
+            created_at=Booking.created_at,
+            updated_at=Booking.updated_at,
+            university_id=Event.university_id,
+            from_clause=bookings_with_event,
+            condition=Booking.status == BookingStatus.APPROVED,
+        ),
+    }
+
+
+def _day(column):
+    return func.date(column, type_=Date)
+
+
+def _where(statement, source: MetricSource):
+    if source.condition is not None:
+        statement = statement.where(source.condition)
+    return statement
+
+
+def changed_days_statement(source: MetricSource, since: datetime) -> CompoundSelect:
+    """Days of the rows created or updated since ``since``.
+
+    Two range queries instead of one OR, so each can use its own timestamp index.
+    """
+    day = _day(source.created_at)
+    return union(
+        select(day).where(source.created_at >= since),
+        select(day).where(source.updated_at >= since),
+    )
+
+
+def _changed_days(source: MetricSource, since: datetime) -> list[date]:
+    statement = changed_days_statement(source, since)
+    return [day for (day,) in db.session.execute(statement) if day is not None]
+
+
+def recompute_statement(source: MetricSource, days: list[date] | None) -> Select:
+    """Per-day (and per-university) counts of ``source`` for ``days`` (all when ``None``)."""
+    day = _day(source.created_at)
+    if source.university_id is None:
+        statement = select(day, null(), func.count()).group_by(day)
+    else:
+        statement = select(day, source.university_id, func.count()).group_by(
+            day,
+            source.university_id,
+        )
+    statement = _where(statement.select_from(source.from_clause), source)
+    if days is not None:
+        # A range on the raw timestamp lets the created_at index find the rows; one
+        # day of slack on each side absorbs how timestamps compare as stored text in
+        # SQLite.
+        lower = datetime.combine(min(days) - timedelta(days=1), time())
+        upper = datetime.combine(max(days) + timedelta(days=2), time())
+        statement = statement.where(
+            source.created_at >= lower,
+            source.created_at < upper,
+            day.in_(days),
+        )
+    return statement
+
+
+def _recompute(metric: str, source: MetricSource, days: list[date] | None) -> int:
+    """Replace the rollup rows of ``metric`` for ``days`` (all days when ``None``)."""
+    statement = recompute_statement(source, days)
+    clear = delete(DailyMetric).where(DailyMetric.metric == metric)
+    if days is not None:
+        clear = clear.where(DailyMetric.day.in_(days))
+
+    rows = [
+        {"metric": metric, "day": bucket, "university_id": university_id, "value": value}
+        for bucket, university_id, value in db.session.execute(statement)
+    ]
+    db.session.execute(clear)
+    if rows:
+        db.session.execute(insert(DailyMetric), rows)
+    return len(rows)
+
+
+def _batches(days: list[date]) -> Iterable[list[date]]:
+    for start in range(0, len(days), DAY_BATCH_SIZE):
+        yield days[start : start + DAY_BATCH_SIZE]
+
+
+def run_rollups(full: bool = False) -> dict[str, int]:
+    """Bring ``daily_metrics`` up to date and advance the watermark.
+
+    Incremental runs only revisit days that have rows created or updated since the
+    last watermark. Deleted rows leave no trace, so a periodic ``full`` rebuild keeps
+    the rollups exact.
+    """
+    started = datetime.utcnow()
+    watermark = RollupWatermark.query.filter_by(name=WATERMARK_NAME).first()
+    since = None if full or watermark is None else watermark.processed_until - WATERMARK_OVERLAP
+
+    written: dict[str, int] = {}
+    for metric, source in metric_sources().items():
+        if since is None:
+            written[metric] = _recompute(metric, source, None)
+            continue
+        days = sorted(_changed_days(source, since))
+        written[metric] = sum(_recompute(metric, source, batch) for batch in _batches(days))
+
+    if watermark is None:
+        watermark = RollupWatermark(name=WATERMARK_NAME, processed_until=started)
+        db.session.add(watermark)
+    else:
+        watermark.processed_until = started
+    db.session.commit()
+    return written
+
+
+def last_rollup_at() -> datetime | None:
+    watermark = RollupWatermark.query.filter_by(name=WATERMARK_NAME).first()
+    return watermark.processed_until if watermark else None
+
+
+def _bucket(day: date, granularity: str) -> date:
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def timeseries(
+    metric: str,
+    granularity: str,
+    start: date,
+    end: date,
+    university_id: int | None = None,
+) -> list[dict]:
+    """Sum rollup rows into day/week/month buckets, zero-filling empty periods."""
+    statement = (
+        select(DailyMetric.day, func.sum(DailyMetric.value))
+        .where(
+            DailyMetric.metric == metric,
+            DailyMetric.day >= start,
+            DailyMetric.day <= end,
+        )
+        .group_by(DailyMetric.day)
+    )
+    if university_id is not None:
+        statement = statement.where(DailyMetric.university_id == university_id)
+
+    buckets: dict[date, int] = {}
+    current = start
+    while current <= end:
+        buckets.setdefault(_bucket(current, granularity), 0)
+        current += timedelta(days=1)
+    for day, value in db.session.execute(statement):
+        buckets[_bucket(day, granularity)] += int(value)
+
+    return [{"period": period.isoformat(), "value": value} for period, value in buckets.items()]
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import column, event, func, literal_column, or_, table
+from sqlalchemy.engine import Connection
+
+from ..extensions import db
+from ..models import Event, UniversityProfile
+
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# SQLite: a standalone FTS5 table keyed by event id (rowid), kept in sync by triggers so
+# ORM writes, bulk Core inserts and cascades all update it.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        title, description, location, university_name,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts (rowid, title, description, location, university_name)
+        VALUES (
+            new.id, new.title, new.description, new.location,
+            (SELECT name FROM university_profiles WHERE id = new.university_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_update
+    AFTER UPDATE OF title, description, location, university_id ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+        INSERT INTO events_fts (rowid, title, description, location, university_name)
+        VALUES (
+            new.id, new.title, new.description, new.location,
+            (SELECT name FROM university_profiles WHERE id = new.university_id)
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS university_profiles_fts_rename
+    AFTER UPDATE OF name ON university_profiles BEGIN
+        UPDATE events_fts SET university_name = new.name
+        WHERE rowid IN (SELECT id FROM events WHERE university_id = new.id);
+    END
+    """,
+]
+
+SQLITE_REBUILD = [
+    "DELETE FROM events_fts",
+    """
+    INSERT INTO events_fts (rowid, title, description, location, university_name)
+    SELECT e.id, e.title, e.description, e.location, u.name
+    FROM events e LEFT JOIN university_profiles u ON u.id = e.university_id
+    """,
+]
+
+SQLITE_UNINSTALL = ["DROP TABLE IF EXISTS events_fts"]
+
+# PostgreSQL: a side table of weighted tsvectors with a GIN index, maintained by triggers.
+POSTGRES_INSTALL = [
+    """
+    CREATE OR REPLACE FUNCTION event_search_vector(
+        title text, description text, location text, university text
+    ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+        SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(location, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(university, '')), 'B')
+            || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+    $$
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS event_search (
+        event_id INTEGER PRIMARY KEY REFERENCES events (id) ON DELETE CASCADE,
+        document tsvector NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_event_search_document ON event_search USING GIN (document)",
+    """
+    CREATE OR REPLACE FUNCTION event_search_refresh() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO event_search (event_id, document)
+        VALUES (
+            NEW.id,
+            event_search_vector(
+                NEW.title, NEW.description, NEW.location,
+                (SELECT name FROM university_profiles WHERE id = NEW.university_id)
+            )
+        )
+        ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document;
+        RETURN NEW;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS events_search_refresh ON events",
+    """
+    CREATE TRIGGER events_search_refresh
+    AFTER INSERT OR UPDATE OF title, description, location, university_id ON events
+    FOR EACH ROW EXECUTE FUNCTION event_search_refresh()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION event_search_university_renamed() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE event_search s
+        SET document = event_search_vector(e.title, e.description, e.location, NEW.name)
+        FROM events e
+        WHERE e.id = s.event_id AND e.university_id = NEW.id;
+        RETURN NEW;
+    END
+    $$
+    """,
+    "DROP TRIGGER IF EXISTS university_profiles_search_rename ON university_profiles",
+    """
+    CREATE TRIGGER university_profiles_search_rename
+    AFTER UPDATE OF name ON university_profiles
+    FOR EACH ROW EXECUTE FUNCTION event_search_university_renamed()
+    """,
+]
+
+POSTGRES_REBUILD = [
+    """
+    INSERT INTO event_search (event_id, document)
+    SELECT e.id, event_search_vector(e.title, e.description, e.location, u.name)
+    FROM events e LEFT JOIN university_profiles u ON u.id = e.university_id
+    ON CONFLICT (event_id) DO UPDATE SET document = EXCLUDED.document
+    """,
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS university_profiles_search_rename ON university_profiles",
+    "DROP TABLE IF EXISTS event_search",
+]
+
+DDL = {
+    "sqlite": (SQLITE_INSTALL, SQLITE_REBUILD, SQLITE_UNINSTALL),
+    "postgresql": (POSTGRES_INSTALL, POSTGRES_REBUILD, POSTGRES_UNINSTALL),
+}
+
+events_fts = table("events_fts", column("rowid"))
+event_search = table("event_search", column("event_id"), column("document"))
+
+
+def _execute_all(connection: Connection, statements: list[str]) -> None:
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Event.__table__, "after_create")
+def install_search_index(target, connection: Connection, **_: object) -> None:
+    statements = DDL.get(connection.dialect.name)
+    if statements:
+        _execute_all(connection, statements[0])
+
+
+@event.listens_for(Event.__table__, "before_drop")
+def uninstall_search_index(target, connection: Connection, **_: object) -> None:
+    statements = DDL.get(connection.dialect.name)
+    if statements:
+        _execute_all(connection, statements[2])
+
+
+def rebuild_search_index() -> int:
+    """(Re)create the search objects and repopulate them from the events table."""
+    with db.engine.begin() as connection:
+        statements = DDL.get(connection.dialect.name)
+        if not statements:
+            return 0
+        _execute_all(connection, statements[0])
+        _execute_all(connection, statements[1])
+        return connection.exec_driver_sql("SELECT COUNT(*) FROM events").scalar() or 0
+
+
+def _fts5_match_expression(terms: list[str]) -> str:
+    # Quote every token so user input can never be parsed as FTS5 query syntax,
+    # and prefix-match the last one to support search-as-you-type.
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_events(query, text: str):
+    """Filter ``query`` to events matching ``text`` and order it by relevance."""
+    terms = SEARCH_TOKEN_PATTERN.findall(text)
+    if not terms:
+        return query
+
+    dialect = db.engine.dialect.name
+    if dialect == "sqlite":
+        match = literal_column("events_fts").op("MATCH")(_fts5_match_expression(terms))
+        # bm25 column weights: title, description, location, university name.
+        rank = func.bm25(literal_column("events_fts"), 10.0, 1.0, 4.0, 4.0)
+        return (
+            query.join(events_fts, events_fts.c.rowid == Event.id)
+            .filter(match)
+            .order_by(None)
+            .order_by(rank, Event.id)
+        )
+
+    if dialect == "postgresql":
+        ts_query = func.websearch_to_tsquery("english", text)
+        return (
+            query.join(event_search, event_search.c.event_id == Event.id)
+            .filter(event_search.c.document.op("@@")(ts_query))
+            .order_by(None)
+            .order_by(func.ts_rank(event_search.c.document, ts_query).desc(), Event.id)
+        )
+
+    # Other databases: unranked substring match across the same fields.
+    query = query.outerjoin(UniversityProfile, UniversityProfile.id == Event.university_id)
+    for term in terms:
+        pattern = f"%{term}%"
+        query = query.filter(
+            or_(
+                Event.title.ilike(pattern),
+                Event.description.ilike(pattern),
+                Event.location.ilike(pattern),
+                UniversityProfile.name.ilike(pattern),
+            ),
+        )
+    return query.order_by(None).order_by(Event.date, Event.id)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from decimal import Decimal
+
+from sqlalchemy import func, insert, select, update
+
+from ..extensions import db
+from ..models import Booking, BookingStatus, Event, EventStatus, Role, UniversityProfile, User
+from ..utils.security import hash_password
+from .booking_service import ACTIVE_BOOKING_STATUSES
+
+SEED_PASSWORD = "Password123!"
+DEFAULT_BATCH_SIZE = 5000
+# Share of bookings that go to a small set of popular events, so some events have
+# long booking lists like real flash sales.
+POPULAR_EVENT_SHARE = 0.01
+POPULAR_BOOKING_SHARE = 0.2
+
+FIRST_NAMES = [
+    "Amina",
+    "Hassan",
+    "Fatuma",
+    "Abdi",
+    "Halima",
+    "Yusuf",
+    "Wanjiru",
+    "Otieno",
+    "Achieng",
+    "Kamau",
+    "Nasra",
+    "Ibrahim",
+    "Zainab",
+    "Mwangi",
+    "Khadija",
+    "Omar",
+]
+LAST_NAMES = [
+    "Mohamed",
+    "Ali",
+    "Abdullahi",
+    "Hussein",
+    "Ochieng",
+    "Njoroge",
+    "Mutua",
+    "Farah",
+    "Kiptoo",
+    "Wambui",
+    "Said",
+    "Noor",
+    "Odhiambo",
+    "Gitau",
+    "Aden",
+    "Kariuki",
+]
+CITIES = ["Garissa", "Nairobi", "Mombasa", "Kisumu", "Nakuru", "Eldoret", "Thika", "Malindi"]
+TOPICS = [
+    "Career Fair",
+    "Hackathon",
+    "Research Symposium",
+    "Alumni Meetup",
+    "Sports Day",
+    "Cultural Night",
+    "Entrepreneurship Summit",
+    "Health Awareness Walk",
+    "Coding Bootcamp",
+    "Graduation Gala",
+]
+EVENT_STATUS_WEIGHTS = {
+    EventStatus.PUBLISHED: 80,
+    EventStatus.DRAFT: 15,
+    EventStatus.CANCELLED: 5,
+}
+BOOKING_STATUS_WEIGHTS = {
+    BookingStatus.APPROVED: 55,
+    BookingStatus.PENDING: 30,
+    BookingStatus.REJECTED: 5,
+    BookingStatus.CANCELLED: 10,
+}
+
+
+@dataclass
+class SeedResult:
+    admin_id: int
+    user_ids: range
+    university_user_ids: range
+    university_ids: range
+    event_ids: range
+    bookings: int
+    elapsed_seconds: float
+
+
+def _next_id(model) -> int:
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _batched(rows: Iterator[dict], size: int) -> Iterator[list[dict]]:
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(model, rows: Iterator[dict], batch_size: int) -> int:
+    written = 0
+    for batch in _batched(rows, batch_size):
+        db.session.execute(insert(model), batch)
+        db.session.commit()
+        written += len(batch)
+    return written
+
+
+def _timestamp(rng: random.Random, now: datetime, days: int = 365) -> datetime:
+    return now - timedelta(seconds=rng.randrange(days * 86400))
+
+
+def seed(
+    *,
+    events: int,
+    bookings: int | None = None,
+    users: int | None = None,
+    universities: int | None = None,
+    seed_value: int = 42,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    password: str = SEED_PASSWORD,
+) -> SeedResult:
+    """Bulk-insert a synthetic dataset on top of whatever the database already holds.
+
+    Rows come from an RNG seeded with ``seed_value`` and are written with Core
+    ``executemany`` inserts of ``batch_size`` rows, with explicit primary keys so no
+    row needs a round trip. Every account shares one password hash. Defaults scale
+    from ``events``: as many bookings as events, one user per ten events and one
+    university per thousand (at least five).
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed_value)
+    bookings = events if bookings is None else bookings
+    users = max(events // 10, 10) if users is None else users
+    universities = max(events // 1000, 5) if universities is None else universities
+    password_hash = hash_password(password)
+    now = datetime.utcnow().replace(microsecond=0)
+    today = date.today()
+
+    first_user_id = _next_id(User)
+    admin_id = first_user_id
+    university_user_ids = range(admin_id + 1, admin_id + 1 + universities)
+    user_ids = range(university_user_ids.stop, university_user_ids.stop + users)
+    first_profile_id = _next_id(UniversityProfile)
+    first_event_id = _next_id(Event)
+    event_ids = range(first_event_id, first_event_id + events)
+
+    def user_rows() -> Iterator[dict]:
+        accounts = [(admin_id, Role.ADMIN)]
+        accounts += [(user_id, Role.UNIVERSITY) for user_id in university_user_ids]
+        accounts += [(user_id, Role.USER) for user_id in user_ids]
+        for user_id, role in accounts:
+            created_at = _timestamp(rng, now)
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            yield {
+                "id": user_id,
+                "name": name,
+                "email": f"seed-{role.value}-{user_id}@example.com",
+                "password_hash": password_hash,
+                "role": role,
+                "phone": f"+2547{rng.randrange(10**8):08d}",
+                "is_active": True,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    def profile_rows() -> Iterator[dict]:
+        for offset, user_id in enumerate(university_user_ids):
+            yield {
+                "id": first_profile_id + offset,
+                "user_id": user_id,
+                "name": f"{rng.choice(CITIES)} University {user_id}",
+                "address": f"{rng.randrange(1, 999)} University Way, {rng.choice(CITIES)}",
+                "contact": f"info-{user_id}@example.com",
+                "description": "Synthetic university profile for load testing.",
+            }
+
+    popular_count = max(int(events * POPULAR_EVENT_SHARE), 1)
+    statuses = list(EVENT_STATUS_WEIGHTS)
+    status_weights = list(EVENT_STATUS_WEIGHTS.values())
+
+    def event_rows() -> Iterator[dict]:
+        for offset, event_id in enumerate(event_ids):
+            university_index = rng.randrange(universities)
+            topic = rng.choice(TOPICS)
+            city = rng.choice(CITIES)
+            created_at = _timestamp(rng, now)
+            yield {
+                "id": event_id,
+                "title": f"{topic} {event_id}",
+                "description": f"{topic} hosted in {city}. Synthetic event for load testing.",
+                "location": city,
+                "date": today + timedelta(days=rng.randrange(-180, 365)),
+                "time": time_of_day(hour=rng.randrange(8, 20), minute=rng.choice([0, 30])),
+                "capacity": 1000 if offset < popular_count else rng.randrange(50, 500),
+                "reserved_seats": 0,
+                "price": Decimal(rng.choice([0, 0, 0, 100, 250, 500])).quantize(Decimal("0.01")),
+                "status": rng.choices(statuses, status_weights)[0],
+                "organizer_id": university_user_ids[university_index],
+                "university_id": first_profile_id + university_index,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    booking_statuses = list(BOOKING_STATUS_WEIGHTS)
+    booking_weights = list(BOOKING_STATUS_WEIGHTS.values())
+
+    def booking_rows() -> Iterator[dict]:
+        for _ in range(bookings):
+            if rng.random() < POPULAR_BOOKING_SHARE:
+                event_id = first_event_id + rng.randrange(popular_count)
+            else:
+                event_id = rng.choice(event_ids)
+            created_at = _timestamp(rng, now)
+            yield {
+                "event_id": event_id,
+                "user_id": rng.choice(user_ids),
+                "seats": rng.choices([1, 2, 3, 4], [70, 20, 7, 3])[0],
+                "status": rng.choices(booking_statuses, booking_weights)[0],
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+
+    _insert(User, user_rows(), batch_size)
+    _insert(UniversityProfile, profile_rows(), batch_size)
+    _insert(Event, event_rows(), batch_size)
+    written = _insert(Booking, booking_rows(), batch_size)
+
+    # One set-based update instead of tracking seat totals while generating.
+    reserved = (
+        select(func.coalesce(func.sum(Booking.seats), 0))
+        .where(Booking.event_id == Event.id, Booking.status.in_(ACTIVE_BOOKING_STATUSES))
+        .scalar_subquery()
+    )
+    db.session.execute(
+        update(Event)
+        .where(Event.id >= event_ids.start, Event.id < event_ids.stop)
+        .values(reserved_seats=reserved),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.commit()
+
+    return SeedResult(
+        admin_id=admin_id,
+        user_ids=user_ids,
+        university_user_ids=university_user_ids,
+        university_ids=range(first_profile_id, first_profile_id + universities),
+        event_ids=event_ids,
+        bookings=written,
+        elapsed_seconds=round(time.perf_counter() - started, 2),
+    )
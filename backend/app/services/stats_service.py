@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+
+from flask import Flask, current_app
+from sqlalchemy import case, func, select, true
+from sqlalchemy.sql import Select
+
+from ..extensions import db
+from ..models import Booking, BookingStatus, Event, EventStatus, UniversityProfile, User
+from ..utils.cache import TTLCache
+from ..utils.replica import served_from_replica
+
+ADMIN_STATS_CACHE_KEY = ("admin_stats",)
+
+_cache_lock = threading.Lock()
+
+
+def _admin_stats_cache(app: Flask | None = None) -> TTLCache:
+    # Kept apart from the response cache so the totals neither count towards its
+    # hit rate nor compete with cached pages for LRU slots.
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get("admin_stats_cache")
+    if cache is None:
+        with _cache_lock:
+            cache = app.extensions.setdefault(
+                "admin_stats_cache",
+                TTLCache(
+                    max_entries=1,
+                    ttl=app.config.get("ADMIN_STATS_CACHE_TTL_SECONDS", 15),
+                    name="admin_stats",
+                ),
+            )
+    return cache
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def admin_stats_statement() -> Select:
+    """The dashboard totals in one statement, scanning each table once."""
+    users = select(func.count(User.id).label("users")).subquery()
+    universities = select(func.count(UniversityProfile.id).label("universities")).subquery()
+    events = select(
+        func.count(Event.id).label("events"),
+        _count_if(Event.status == EventStatus.PUBLISHED).label("published_events"),
+    ).subquery()
+    bookings = select(
+        func.count(Booking.id).label("bookings"),
+        _count_if(Booking.status == BookingStatus.APPROVED).label("approved_bookings"),
+    ).subquery()
+    return select(
+        users.c.users,
+        universities.c.universities,
+        events.c.events,
+        events.c.published_events,
+        bookings.c.bookings,
+        bookings.c.approved_bookings,
+    ).select_from(
+        users.join(universities, true()).join(events, true()).join(bookings, true()),
+    )
+
+
+def compute_admin_stats() -> dict:
+    row = db.session.execute(admin_stats_statement()).one()
+    return {
+        "users": row.users,
+        "universities": row.universities,
+        "events": row.events,
+        "publishedEvents": int(row.published_events),
+        "bookings": row.bookings,
+        "approvedBookings": int(row.approved_bookings),
+        "generatedAt": datetime.utcnow().isoformat(),
+    }
+
+
+def get_admin_stats() -> dict:
+    """Serve the totals from a short-TTL cache; ``generatedAt`` shows their age."""
+    stats = _admin_stats_cache().get(ADMIN_STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_admin_stats()
+        # Replica totals may lag behind, and generatedAt would hide that for the TTL.
+        if not served_from_replica():
+            _admin_stats_cache().set(ADMIN_STATS_CACHE_KEY, stats)
+    return stats
+
+
+def clear_admin_stats_cache() -> None:
+    _admin_stats_cache().clear()
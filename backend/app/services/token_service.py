@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from flask import current_app
+from flask_jwt_extended import create_access_token, create_refresh_token, get_jti
+from sqlalchemy import delete, or_, update
+
+from ..extensions import db
+from ..models import RefreshSession, User
+from .identity_service import load_user
+
+SESSION_CLAIM = "sid"
+
+
+def create_user_access_token(user: User) -> str:
+    return create_access_token(identity=str(user.id), additional_claims={"role": user.role.value})
+
+
+def _session_expiry(now: datetime) -> datetime:
+    return now + current_app.config["JWT_REFRESH_TOKEN_EXPIRES"]
+
+
+def _new_refresh_token(user_id: int, session_id: int) -> tuple[str, str]:
+    token = create_refresh_token(
+        identity=str(user_id),
+        additional_claims={SESSION_CLAIM: session_id},
+    )
+    return token, get_jti(token)
+
+
+def start_session(user: User) -> dict[str, str]:
+    """Open a refresh session for ``user`` and return its first token pair."""
+    now = datetime.utcnow()
+    session = RefreshSession(user_id=user.id, current_jti="", expires_at=_session_expiry(now))
+    db.session.add(session)
+    db.session.flush()
+    refresh_token, session.current_jti = _new_refresh_token(user.id, session.id)
+    db.session.commit()
+    return {"accessToken": create_user_access_token(user), "refreshToken": refresh_token}
+
+
+def rotate_session(claims: dict) -> tuple[User, dict[str, str]] | None:
+    """Exchange a valid refresh token for a new pair, or return ``None``.
+
+    The swap is one conditional UPDATE, so of two concurrent requests with the same
+    token only one wins. A token that is not the session's newest one has been
+    replayed: the session is revoked and every token it issued stops working.
+    """
+    session_id = claims.get(SESSION_CLAIM)
+    if session_id is None:
+        return None
+    now = datetime.utcnow()
+    user = load_user(int(claims["sub"]))
+    if user is None or not user.is_active:
+        revoke_session(session_id)
+        return None
+
+    refresh_token, new_jti = _new_refresh_token(user.id, session_id)
+    rotated = db.session.execute(
+        update(RefreshSession)
+        .where(
+            RefreshSession.id == session_id,
+            RefreshSession.current_jti == claims["jti"],
+            RefreshSession.revoked_at.is_(None),
+            RefreshSession.expires_at > now,
+        )
+        .values(current_jti=new_jti, expires_at=_session_expiry(now)),
+        execution_options={"synchronize_session": False},
+    )
+    if rotated.rowcount != 1:
+        reused = db.session.execute(
+            update(RefreshSession)
+            .where(
+                RefreshSession.id == session_id,
+                RefreshSession.current_jti != claims["jti"],
+                RefreshSession.revoked_at.is_(None),
+            )
+            .values(revoked_at=now),
+            execution_options={"synchronize_session": False},
+        )
+        db.session.commit()
+        if reused.rowcount:
+            current_app.logger.warning(
+                "Refresh token reuse detected for user %s; session %s revoked.",
+                user.id,
+                session_id,
+            )
+        return None
+
+    db.session.commit()
+    return user, {"accessToken": create_user_access_token(user), "refreshToken": refresh_token}
+
+
+def revoke_session(session_id: int) -> None:
+    db.session.execute(
+        update(RefreshSession)
+        .where(RefreshSession.id == session_id, RefreshSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    )
+    db.session.commit()
+
+
+def revoke_user_sessions(user_id: int) -> None:
+    """Revoke every session of ``user_id``; the caller commits."""
+    db.session.execute(
+        update(RefreshSession)
+        .where(RefreshSession.user_id == user_id, RefreshSession.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow()),
+        execution_options={"synchronize_session": False},
+    )
+
+
+def purge_refresh_sessions() -> int:
+    """Delete expired and revoked sessions; they can no longer refresh anything."""
+    result = db.session.execute(
+        delete(RefreshSession).where(
+            or_(
+                RefreshSession.expires_at <= datetime.utcnow(),
+                RefreshSession.revoked_at.is_not(None),
+            ),
+        ),
+    )
+    db.session.commit()
+    return result.rowcount
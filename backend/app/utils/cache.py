@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from functools import wraps
+
+from flask import Flask, Response, current_app, request
+from flask_jwt_extended import get_jwt
+
+from .metrics import record_cache_lookup
+from .replica import served_from_replica
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire ``ttl`` seconds after being set.
+
+    Named caches report their hits and misses to the ``cache_requests_total`` metric.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0, name: str | None = None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        with self._lock:
+            item = self._entries.get(key, _MISSING)
+            if item is not _MISSING:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    self._record(hit=True)
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            self._record(hit=False)
+            return default
+
+    def _record(self, hit: bool) -> None:
+        if self.name is not None:
+            record_cache_lookup(self.name, hit)
+
+    def set(self, key: Hashable, value: object, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    status: int
+    mimetype: str
+    etag: str
+
+
+class ResponseCache:
+    """Per-process cache of serialized GET responses, invalidated by namespace.
+
+    Each namespace has a generation number that is part of every key; bumping it on
+    writes makes all older entries unreachable, and the LRU bound evicts them.
+    Entries also expire after ``RESPONSE_CACHE_TTL_SECONDS``, which bounds staleness
+    across worker processes that did not see the invalidation.
+    """
+
+    def __init__(self, app: Flask | None = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        app.extensions["response_cache"] = {
+            "store": TTLCache(
+                max_entries=app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024),
+                ttl=app.config.get("RESPONSE_CACHE_TTL_SECONDS", 30),
+                name="response",
+            ),
+            "generations": {},
+            "lock": threading.Lock(),
+        }
+
+    @staticmethod
+    def _state() -> dict:
+        return current_app.extensions["response_cache"]
+
+    @property
+    def store(self) -> TTLCache:
+        return self._state()["store"]
+
+    def invalidate(self, *namespaces: str) -> None:
+        state = self._state()
+        with state["lock"]:
+            for namespace in namespaces:
+                state["generations"][namespace] = state["generations"].get(namespace, 0) + 1
+
+    def clear(self) -> None:
+        state = self._state()
+        state["store"].clear()
+        with state["lock"]:
+            state["generations"].clear()
+
+    def _key(self, namespace: str, vary_on_role: bool) -> tuple:
+        generation = self._state()["generations"].get(namespace, 0)
+        role = (get_jwt() or {}).get("role") if vary_on_role else None
+        args = tuple(sorted(request.args.items(multi=True)))
+        return (namespace, generation, request.path, args, role)
+
+    def cached(self, namespace: str, vary_on_role: bool = False) -> Callable:
+        """Cache successful responses of a GET view and answer conditional requests.
+
+        Apply below ``jwt_required`` so the caller's role is known when it is part of
+        the key. Responses carry a strong ETag whether or not caching is enabled.
+        Responses read from the replica are not stored.
+        """
+
+        def decorator(view: Callable) -> Callable:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                enabled = current_app.config.get("RESPONSE_CACHE_ENABLED", True)
+                key = self._key(namespace, vary_on_role) if enabled else None
+                entry = self.store.get(key) if enabled else None
+
+                if entry is None:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response.add_etag()
+                    entry = CachedResponse(
+                        body=response.get_data(),
+                        status=response.status_code,
+                        mimetype=response.mimetype,
+                        etag=response.get_etag()[0],
+                    )
+                    # A lagging replica can return rows from before the write that
+                    # bumped the generation; caching them would pin that for the TTL.
+                    if enabled and not served_from_replica():
+                        self.store.set(key, entry)
+
+                response = Response(entry.body, status=entry.status, mimetype=entry.mimetype)
+                response.set_etag(entry.etag)
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from typing import TypeVar
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from werkzeug.exceptions import ServiceUnavailable
+
+from ..extensions import db
+
+T = TypeVar("T")
+
+DEFAULT_LOCK_RETRY_ATTEMPTS = 5
+DEFAULT_LOCK_RETRY_BASE_DELAY = 0.02
+
+LOCK_ERROR_MARKERS = (
+    "database is locked",
+    "database table is locked",
+    "could not serialize access",
+    "deadlock detected",
+    "lock timeout",
+)
+
+
+def configure_sqlite(engine: Engine, pragmas: dict[str, object]) -> None:
+    """Run ``PRAGMA name=value`` for each of ``pragmas`` on every new SQLite connection."""
+    if engine.dialect.name != "sqlite" or not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def is_lock_error(exc: OperationalError) -> bool:
+    message = str(exc.orig if exc.orig is not None else exc).lower()
+    return any(marker in message for marker in LOCK_ERROR_MARKERS)
+
+
+def run_with_retry(operation: Callable[[], T]) -> T:
+    """Run a write transaction, retrying with exponential backoff on lock contention.
+
+    ``operation`` must be safe to re-run from scratch: the session is rolled back
+    before every retry. Delays are drawn at random up to the backoff ("full jitter"),
+    so writers that collided do not all retry at the same moment. Once the attempts
+    are exhausted a 503 is raised.
+    """
+    attempts = current_app.config.get("DB_LOCK_RETRY_ATTEMPTS", DEFAULT_LOCK_RETRY_ATTEMPTS)
+    base_delay = current_app.config.get("DB_LOCK_RETRY_BASE_DELAY", DEFAULT_LOCK_RETRY_BASE_DELAY)
+
+    attempt = 1
+    while True:
+        try:
+            return operation()
+        except OperationalError as exc:
+            db.session.rollback()
+            if not is_lock_error(exc):
+                raise
+            if attempt == attempts:
+                current_app.logger.warning("Giving up after %s lock retries: %s", attempts, exc)
+                raise ServiceUnavailable("The server is busy. Please try again.") from exc
+            time.sleep(random.uniform(0, base_delay * 2 ** (attempt - 1)))
+            attempt += 1
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from flask import Flask, Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Statements kept per request for budget warnings; enough to spot an N+1 pattern.
+MAX_RECORDED_STATEMENTS = 50
+
+
+@dataclass
+class RequestTimings:
+    started: float = field(default_factory=time.perf_counter)
+    query_count: int = 0
+    db_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+    statements: list[str] = field(default_factory=list)
+    # Re-entrant timers (nested schema dumps) only count the outermost call.
+    depth: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self, total_seconds: float) -> dict[str, float | int]:
+        handler_seconds = max(total_seconds - self.db_seconds - self.serialize_seconds, 0.0)
+        return {
+            "queries": self.query_count,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "serialize_ms": round(self.serialize_seconds * 1000, 2),
+            "handler_ms": round(handler_seconds * 1000, 2),
+            "total_ms": round(total_seconds * 1000, 2),
+        }
+
+
+def _current_timings() -> RequestTimings | None:
+    if not has_request_context():
+        return None
+    return g.get("_request_timings")
+
+
+class RequestInstrumentation:
+    """Per-request query count, DB, serialization and handler timings.
+
+    Timings are attached to ``g`` for the life of a request, reported in a
+    ``Server-Timing`` header and one structured log line, and checked against the
+    query budget of the endpoint.
+    """
+
+    def __init__(self, app: Flask | None = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get("REQUEST_INSTRUMENTATION_ENABLED", True):
+            return
+        from ..extensions import db
+
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument_engine(engine)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        if event.contains(engine, "before_cursor_execute", self._before_cursor_execute):
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to ``<name>_seconds`` of the current request."""
+        timings = _current_timings()
+        if timings is None:
+            yield
+            return
+        timings.depth[name] = timings.depth.get(name, 0) + 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings.depth[name] -= 1
+            if timings.depth[name] == 0:
+                attribute = f"{name}_seconds"
+                elapsed = time.perf_counter() - started
+                setattr(timings, attribute, getattr(timings, attribute) + elapsed)
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is discarded with a failed statement.
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @staticmethod
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        elapsed = time.perf_counter() - started if started is not None else 0.0
+        timings = _current_timings()
+        if timings is None:
+            return
+        timings.query_count += 1
+        timings.db_seconds += elapsed
+        if len(timings.statements) < MAX_RECORDED_STATEMENTS:
+            timings.statements.append(statement)
+
+        slow_ms = current_app.config.get("SLOW_QUERY_MS", 200)
+        if elapsed * 1000 >= slow_ms:
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                elapsed * 1000,
+                request.endpoint,
+                statement,
+            )
+
+    @staticmethod
+    def _start_request() -> None:
+        g._request_timings = RequestTimings()
+
+    @staticmethod
+    def _finish_request(response: Response) -> Response:
+        timings = _current_timings()
+        if timings is None:
+            return response
+
+        metrics = timings.as_dict(time.perf_counter() - timings.started)
+        if current_app.config.get("SERVER_TIMING_ENABLED", True):
+            response.headers["Server-Timing"] = ", ".join(
+                [
+                    f'db;dur={metrics["db_ms"]};desc="{metrics["queries"]} queries"',
+                    f"serialize;dur={metrics['serialize_ms']}",
+                    f"handler;dur={metrics['handler_ms']}",
+                    f"total;dur={metrics['total_ms']}",
+                ],
+            )
+
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request",
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": request.endpoint,
+                    "status": response.status_code,
+                    **metrics,
+                },
+            ),
+        )
+
+        budgets = current_app.config.get("QUERY_BUDGETS", {})
+        budget = budgets.get(request.endpoint, current_app.config.get("QUERY_BUDGET_DEFAULT"))
+        if budget is not None and timings.query_count > budget:
+            logger.warning(
+                "Query budget exceeded in %s: %d queries (budget %d)\n%s",
+                request.endpoint,
+                timings.query_count,
+                budget,
+                "\n".join(timings.statements),
+            )
+        return response
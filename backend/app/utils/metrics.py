@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import time
+
+from flask import Flask, Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
+
+# Metrics live at module level, as prometheus_client expects. When
+# PROMETHEUS_MULTIPROC_DIR is set before the app is imported, every worker writes its
+# samples to files in that directory and the endpoint aggregates them.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_COUNT = Counter(
+    "http_requests_total",
+    "HTTP requests by blueprint, endpoint, method and status code.",
+    ["blueprint", "endpoint", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by blueprint and endpoint.",
+    ["blueprint", "endpoint", "method"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the SQLAlchemy pool.",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection.",
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool.",
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "In-process cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+RATE_LIMITED = Counter(
+    "rate_limited_requests_total",
+    "Requests rejected with 429 by rate-limit rule and key.",
+    ["rule", "key"],
+)
+EMAIL_SEND_LATENCY = Histogram(
+    "email_send_duration_seconds",
+    "SMTP delivery latency by outcome.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Serialize the metrics of this process, or of all workers in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def _time_pool_connect(pool: Pool) -> None:
+    # The pool has no event for the start of a checkout, so time connect() itself.
+    pool_connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return pool_connect()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+class MetricsExporter:
+    """Records request, pool and cache metrics for the ``/api/metrics`` endpoint."""
+
+    def __init__(self, app: Flask | None = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get("METRICS_ENABLED", True):
+            return
+        from ..extensions import db
+
+        with app.app_context():
+            for engine in db.engines.values():
+                self.instrument_engine(engine)
+        app.before_request(self._start_request)
+        app.after_request(self._finish_request)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        if event.contains(engine, "engine_disposed", self._on_engine_disposed):
+            return
+        # Pool listeners are carried over when dispose() recreates the pool.
+        event.listen(engine.pool, "checkout", self._on_checkout)
+        event.listen(engine.pool, "checkin", self._on_checkin)
+        event.listen(engine, "engine_disposed", self._on_engine_disposed)
+        _time_pool_connect(engine.pool)
+
+    @staticmethod
+    def _on_engine_disposed(engine: Engine) -> None:
+        # dispose() replaces the pool, and with it the timed connect() (gunicorn's
+        # post_fork disposes every engine in each worker).
+        _time_pool_connect(engine.pool)
+
+    @staticmethod
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        DB_POOL_CHECKOUTS.inc()
+        DB_POOL_IN_USE.inc()
+
+    @staticmethod
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        DB_POOL_IN_USE.dec()
+
+    @staticmethod
+    def _start_request() -> None:
+        g._metrics_started = time.perf_counter()
+
+    @staticmethod
+    def _finish_request(response: Response) -> Response:
+        started = g.pop("_metrics_started", None)
+        if started is None:
+            return response
+        endpoint = request.endpoint or "unmatched"
+        blueprint = request.blueprint or ""
+        REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(
+            time.perf_counter() - started,
+        )
+        REQUEST_COUNT.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+        return response
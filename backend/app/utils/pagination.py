@@ -1,14 +1,21 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
+import base64
+import json
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
 from math import ceil
 
 from flask import request
+from sqlalchemy import and_, asc, desc, literal, or_
+from werkzeug.exceptions import BadRequest
 
 DEFAULT_PAGE = 1
 DEFAULT_PAGE_SIZE = 10
 MAX_PAGE_SIZE = 100
 
+TRUTHY_VALUES = {"1", "true", "yes", "on"}
+
 
 def resolve_pagination_params() -> tuple[int, int]:
     try:
@@ -50,3 +57,119 @@ def build_paginated_response(
             "hasPrevPage": page > 1 and pages > 0,
         },
     }
+
+
+def use_cursor_pagination() -> bool:
+    """Cursor mode is opted into by sending a ``cursor`` argument (empty for the first page)."""
+    return "cursor" in request.args
+
+
+def include_total_requested() -> bool:
+    return request.args.get("include_total", "").lower() in TRUTHY_VALUES
+
+
+def encode_cursor(value, row_id: int) -> str:
+    if isinstance(value, date | datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, order_column) -> tuple[object, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        python_type = order_column.type.python_type
+        if python_type is datetime:
+            value = datetime.fromisoformat(value)
+        elif python_type is date:
+            value = date.fromisoformat(value)
+        elif not isinstance(value, python_type):
+            value = python_type(value)
+        return value, int(row_id)
+    except (ValueError, TypeError, json.JSONDecodeError) as exc:
+        raise BadRequest("Invalid pagination cursor.") from exc
+
+
+def paginate_keyset(
+    query,
+    order_column,
+    id_column,
+    cursor: str | None,
+    page_size: int,
+    *,
+    descending: bool = False,
+):
+    """Fetch one page ordered by ``(order_column, id_column)`` starting after ``cursor``.
+
+    The page starts after the values encoded in the cursor, not the cursor row's
+    current ones, so editing or deleting that row does not skip or repeat rows.
+    """
+    direction = desc if descending else asc
+    query = query.order_by(None).order_by(direction(order_column), direction(id_column))
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, order_column)
+        anchor = literal(value, type_=order_column.type)
+        if descending:
+            after = or_(order_column < anchor, and_(order_column == anchor, id_column < last_id))
+        else:
+            after = or_(order_column > anchor, and_(order_column == anchor, id_column > last_id))
+        query = query.filter(after)
+
+    rows = query.limit(page_size + 1).all()
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        last = items[-1]
+        next_cursor = encode_cursor(getattr(last, order_column.key), getattr(last, id_column.key))
+    return items, next_cursor
+
+
+def build_cursor_response(
+    items: Sequence,
+    next_cursor: str | None,
+    page_size: int,
+    total: int | None = None,
+):
+    meta = {
+        "pageSize": page_size,
+        "nextCursor": next_cursor,
+        "hasNextPage": next_cursor is not None,
+    }
+    if total is not None:
+        meta["total"] = total
+    return {"data": items, "meta": meta}
+
+
+def paginate_request(
+    query,
+    dump: Callable[[Sequence], list],
+    *,
+    order_column,
+    id_column,
+    descending: bool = False,
+):
+    """Paginate ``query`` in cursor or page mode depending on the request arguments.
+
+    Page mode keeps the original ``page``/``page_size`` contract including ``total``.
+    Cursor mode only counts rows when ``include_total`` is passed.
+    """
+    page, page_size = resolve_pagination_params()
+
+    if use_cursor_pagination():
+        items, next_cursor = paginate_keyset(
+            query,
+            order_column,
+            id_column,
+            request.args.get("cursor") or None,
+            page_size,
+            descending=descending,
+        )
+        total = query.order_by(None).count() if include_total_requested() else None
+        return build_cursor_response(dump(items), next_cursor, page_size, total)
+
+    direction = desc if descending else asc
+    query = query.order_by(None).order_by(direction(order_column), direction(id_column))
+    items, total = paginate_query(query, page, page_size)
+    return build_paginated_response(dump(items), total, page, page_size)
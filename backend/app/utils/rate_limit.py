@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import wraps
+
+from flask import Flask, current_app, request
+from flask_jwt_extended import get_jwt_identity
+from werkzeug.exceptions import TooManyRequests
+
+from .metrics import RATE_LIMITED
+from .redis_client import get_redis
+
+
+class MemoryBucketStore:
+    """Token buckets in an LRU dict; one lookup and update per check.
+
+    Buckets are per process, so with N workers a client can get up to N times the
+    configured rate. Use the redis backend where that matters.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take a token; return 0 on success, else the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_entries:
+                # The least recently used bucket is the one most likely to be full again.
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class RedisBucketStore:
+    """Token buckets shared by every worker; each check is one script call."""
+
+    _TAKE = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - updated, 0) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+    def __init__(self, client):
+        self._take = client.register_script(self._TAKE)
+
+    def take(self, key: str, capacity: int, rate: float) -> float:
+        return float(self._take(keys=[f"ratelimit:{key}"], args=[capacity, rate, time.time()]))
+
+
+def _client_ip() -> str:
+    return request.remote_addr or "unknown"
+
+
+def _request_email() -> str | None:
+    email = (request.get_json(silent=True) or {}).get("email")
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+# How each kind of key is read from the request; None skips that bucket.
+KEY_FUNCTIONS: dict[str, Callable[[], str | None]] = {
+    "ip": _client_ip,
+    "email": _request_email,
+    "user": get_jwt_identity,
+}
+
+
+class RateLimiter:
+    """Token-bucket rate limits per rule, applied before a view does any work.
+
+    ``RATE_LIMITS`` maps a rule name to ``{key: (capacity, period_seconds)}``: each
+    client key gets a bucket of ``capacity`` requests that refills completely over
+    ``period_seconds``. A request must get a token from every bucket of its rule;
+    otherwise it is answered with 429 and a ``Retry-After`` header.
+    """
+
+    def __init__(self, app: Flask | None = None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        store = None
+        if app.config.get("RATE_LIMITING_ENABLED", True):
+            if app.config.get("RATE_LIMIT_BACKEND", "memory") == "redis":
+                store = RedisBucketStore(get_redis(app))
+            else:
+                store = MemoryBucketStore(app.config.get("RATE_LIMIT_MAX_BUCKETS", 100_000))
+        app.extensions["rate_limiter"] = store
+
+    def check(self, rule: str, keys: tuple[str, ...]) -> None:
+        store = current_app.extensions.get("rate_limiter")
+        if store is None:
+            return
+        limits = current_app.config.get("RATE_LIMITS", {}).get(rule, {})
+        for key in keys:
+            if key not in limits:
+                continue
+            value = KEY_FUNCTIONS[key]()
+            if value is None:
+                continue
+            capacity, period = limits[key]
+            wait = store.take(f"{rule}:{key}:{value}", capacity, capacity / period)
+            if wait > 0:
+                RATE_LIMITED.labels(rule=rule, key=key).inc()
+                raise TooManyRequests(
+                    "Too many requests. Please wait a moment and try again.",
+                    retry_after=math.ceil(wait),
+                )
+
+    def limit(self, rule: str, *keys: str) -> Callable:
+        """Rate-limit a view by ``keys`` (``ip``, ``email``, ``user``).
+
+        Apply below ``jwt_required`` when limiting by ``user``.
+        """
+        unknown = set(keys) - set(KEY_FUNCTIONS)
+        if unknown:
+            raise ValueError(f"Unknown rate limit keys: {sorted(unknown)}")
+
+        def decorator(view: Callable) -> Callable:
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                self.check(rule, keys)
+                return view(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
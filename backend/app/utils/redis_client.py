@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import threading
+
+from flask import Flask, current_app
+
+_client_lock = threading.Lock()
+
+
+def get_redis(app: Flask | None = None):
+    """The app's client for ``REDIS_URL``; redis is only needed by the shared backends."""
+    app = app or current_app._get_current_object()
+    client = app.extensions.get("redis")
+    if client is None:
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - optional dependency
+            raise RuntimeError("The redis backends need the 'redis' package installed.") from exc
+        with _client_lock:
+            client = app.extensions.setdefault(
+                "redis",
+                redis.Redis.from_url(app.config["REDIS_URL"], decode_responses=True),
+            )
+    return client
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import wraps
+
+from flask import g, has_app_context, request
+from flask_sqlalchemy.session import Session
+
+REPLICA_BIND = "replica"
+
+
+class RoutingSession(Session):
+    """Sends the SELECTs of ``@read_replica`` views to the ``replica`` bind.
+
+    Anything else in such a request (a flush, an UPDATE, a raw connection) pins the
+    rest of the request to the primary, so it reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get("_replica_reads"):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                if not self._flushing and getattr(clause, "is_select", False):
+                    g._replica_used = True
+                    return engine
+                g._replica_reads = False
+        return super().get_bind(mapper, clause=clause, bind=bind, **kwargs)
+
+
+def pin_to_primary() -> None:
+    """Serve the rest of this request's reads from the primary."""
+    g._replica_reads = False
+
+
+def served_from_replica() -> bool:
+    """Whether the current request has read anything from the replica.
+
+    Such results may predate the latest writes, so they must not be cached.
+    """
+    return has_app_context() and bool(g.get("_replica_used"))
+
+
+def read_replica(view: Callable) -> Callable:
+    """Let a GET view read from the replica bind when one is configured.
+
+    Replicas lag behind the primary, so only use this for views that can show data a
+    few seconds old.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g._replica_reads = request.method in ("GET", "HEAD")
+        g._replica_used = False
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g._replica_reads = False
+
+    return wrapper
@@ -1,22 +1,160 @@
 from __future__ import annotations
 
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from secrets import choice
 from string import digits
 
-from passlib.hash import pbkdf2_sha256
+from flask import current_app, has_app_context
+from passlib.context import CryptContext
+from werkzeug.exceptions import ServiceUnavailable
 
 OTP_LENGTH = 6
 OTP_TTL_MINUTES = 10
 OTP_CHAR_SET = digits
 
+DEFAULT_PASSWORD_SCHEME = "pbkdf2_sha256"
+# Cost parameter per scheme: PBKDF2 iterations, bcrypt log2 rounds, argon2 time cost.
+DEFAULT_PASSWORD_ROUNDS = {"pbkdf2_sha256": 200000, "bcrypt": 12, "argon2": 3}
+ROUNDS_SETTING = {"pbkdf2_sha256": "rounds", "bcrypt": "rounds", "argon2": "time_cost"}
+
+DEFAULT_HASH_MAX_PENDING = 16
+DEFAULT_HASH_QUEUE_TIMEOUT = 2.0
+
+
+@lru_cache(maxsize=8)
+def _crypt_context(scheme: str, rounds: int) -> CryptContext:
+    # Existing hashes in any other scheme, or with a lower cost, still verify and are
+    # flagged for an upgrade on the next successful login.
+    schemes = [scheme] + [name for name in DEFAULT_PASSWORD_ROUNDS if name != scheme]
+    settings = {f"{scheme}__{ROUNDS_SETTING[scheme]}": rounds}
+    if scheme != "argon2":
+        # argon2 hashes are re-checked against their parameters by passlib itself.
+        settings[f"{scheme}__min_rounds"] = rounds
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated=[name for name in schemes if name != scheme],
+        **settings,
+    )
+
+
+def _hash_settings() -> tuple[str, int]:
+    config = current_app.config if has_app_context() else {}
+    scheme = config.get("PASSWORD_HASH_SCHEME") or DEFAULT_PASSWORD_SCHEME
+    rounds = config.get("PASSWORD_HASH_ROUNDS") or DEFAULT_PASSWORD_ROUNDS[scheme]
+    return scheme, int(rounds)
+
+
+def _hash(settings: tuple[str, int], password: str) -> str:
+    return _crypt_context(*settings).hash(password)
+
+
+def _verify_and_update(
+    settings: tuple[str, int],
+    password: str,
+    hashed: str,
+) -> tuple[bool, str | None]:
+    return _crypt_context(*settings).verify_and_update(password, hashed)
+
+
+class _HashPool:
+    """Process pool for password hashing with a bound on outstanding jobs.
+
+    Hashing is CPU-bound, so running it in request threads starves every other
+    request in the worker. Jobs beyond ``max_pending`` wait up to ``queue_timeout``
+    seconds for a slot and are then rejected with a 503 instead of queueing forever.
+
+    Hashing processes are started from a fork server (or spawned where that is not
+    available), never forked from the threaded worker: a fork copies locks held by
+    other threads at that moment and can deadlock the child.
+    """
+
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float):
+        self.key = (os.getpid(), workers, max_pending, queue_timeout)
+        self.queue_timeout = queue_timeout
+        self.slots = threading.BoundedSemaphore(max_pending)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=_start_context())
+
+    def run(self, function, *args):
+        if not self.slots.acquire(timeout=self.queue_timeout):
+            raise ServiceUnavailable(
+                "Too many sign-in requests at the moment. Please try again.",
+                retry_after=1,
+            )
+        try:
+            return self.executor.submit(function, *args).result()
+        finally:
+            self.slots.release()
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _start_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+_pool: _HashPool | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> _HashPool | None:
+    global _pool
+    config = current_app.config if has_app_context() else {}
+    workers = int(config.get("PASSWORD_HASH_WORKERS", 0))
+    if workers <= 0:
+        return None
+    key = (
+        os.getpid(),
+        workers,
+        int(config.get("PASSWORD_HASH_MAX_PENDING", DEFAULT_HASH_MAX_PENDING)),
+        float(config.get("PASSWORD_HASH_QUEUE_TIMEOUT", DEFAULT_HASH_QUEUE_TIMEOUT)),
+    )
+    with _pool_lock:
+        # A pool inherited through fork() belongs to the parent; build a new one.
+        if _pool is None or _pool.key != key:
+            if _pool is not None and _pool.key[0] == key[0]:
+                _pool.shutdown()
+            _pool = _HashPool(*key[1:])
+        return _pool
+
+
+def shutdown_hash_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool.key[0] == os.getpid():
+            _pool.shutdown()
+        _pool = None
+
+
+atexit.register(shutdown_hash_pool)
+
+
+def _dispatch(function, *args):
+    pool = _get_pool()
+    if pool is None:
+        return function(*args)
+    return pool.run(function, *args)
+
 
 def hash_password(password: str) -> str:
-    return pbkdf2_sha256.using(rounds=200000).hash(password)
+    return _dispatch(_hash, _hash_settings(), password)
 
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pbkdf2_sha256.verify(password, hashed)
+    return verify_and_update_password(password, hashed)[0]
+
+
+def verify_and_update_password(password: str, hashed: str) -> tuple[bool, str | None]:
+    """Verify ``password``; also return a new hash when ``hashed`` uses outdated settings."""
+    return _dispatch(_verify_and_update, _hash_settings(), password, hashed)
 
 
 def generate_otp_code(length: int = OTP_LENGTH) -> str:
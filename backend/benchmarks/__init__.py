@@ -0,0 +1,4 @@
+"""Performance benchmarks for the Garissa Event Planner backend.
+
+Run from the backend directory, e.g. ``python -m benchmarks.booking_contention``.
+"""
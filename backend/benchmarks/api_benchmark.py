@@ -0,0 +1,350 @@
+"""Drive the hot API endpoints against a seeded dataset and report latency percentiles.
+
+Each scale gets a fresh database filled by the bulk seeder (``flask seed``). Every scenario is run
+through the Flask test client (no network) and through a real threaded WSGI server,
+and the results are written as JSON. Passing ``--baseline`` compares p95 latency and
+throughput against an earlier result file and exits non-zero on regressions.
+
+Usage::
+
+    python -m benchmarks.api_benchmark --scale 10k --requests 300 --output results.json
+    python -m benchmarks.api_benchmark --scale 10k --baseline results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import sqlalchemy
+from flask import Flask
+from flask_jwt_extended import create_access_token
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from app import create_app
+from app.extensions import db
+from app.models import Role
+from app.services.seed_service import SeedResult, seed
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+MODES = ("client", "server")
+TOKEN_POOL_SIZE = 200
+
+
+@dataclass(frozen=True)
+class Call:
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: dict | None = None
+
+
+Scenario = Callable[[random.Random], Call]
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs) -> None:
+        pass
+
+
+def _bearer(identity: int, role: Role) -> dict[str, str]:
+    token = create_access_token(identity=str(identity), additional_claims={"role": role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def build_scenarios(app: Flask, data: SeedResult) -> dict[str, Scenario]:
+    """Request generators for the hot endpoints, drawing ids from the seeded ranges."""
+    with app.app_context():
+        admin = _bearer(data.admin_id, Role.ADMIN)
+        users = [
+            (user_id, _bearer(user_id, Role.USER)) for user_id in data.user_ids[:TOKEN_POOL_SIZE]
+        ]
+
+    def list_events(rng: random.Random) -> Call:
+        filters = rng.choice(
+            [
+                "status=published",
+                f"status=published&start_date={datetime.utcnow().date().isoformat()}",
+                f"university_id={rng.choice(data.university_ids)}",
+                "order_by=created_at&direction=desc",
+            ],
+        )
+        return Call("GET", f"/api/events/?{filters}&page={rng.randrange(1, 20)}", {})
+
+    def get_event(rng: random.Random) -> Call:
+        return Call("GET", f"/api/events/{rng.choice(data.event_ids)}", {})
+
+    def book_event(rng: random.Random) -> Call:
+        _, headers = rng.choice(users)
+        return Call(
+            "POST",
+            f"/api/events/{rng.choice(data.event_ids)}/book",
+            headers,
+            {"seats": 1},
+        )
+
+    def my_bookings(rng: random.Random) -> Call:
+        _, headers = rng.choice(users)
+        return Call("GET", "/api/bookings/me?page_size=20", headers)
+
+    def event_bookings(rng: random.Random) -> Call:
+        event_id = rng.choice(data.event_ids[: max(len(data.event_ids) // 100, 1)])
+        return Call("GET", f"/api/bookings/event/{event_id}?page_size=20", admin)
+
+    def admin_stats(rng: random.Random) -> Call:
+        return Call("GET", "/api/admin/stats", admin)
+
+    return {
+        "list_events": list_events,
+        "get_event": get_event,
+        "book_event": book_event,
+        "my_bookings": my_bookings,
+        "event_bookings": event_bookings,
+        "admin_stats": admin_stats,
+    }
+
+
+def _client_sender(app: Flask) -> Callable[[Call], int]:
+    local = threading.local()
+
+    def send(call: Call) -> int:
+        if not hasattr(local, "client"):
+            local.client = app.test_client()
+        response = local.client.open(
+            call.path,
+            method=call.method,
+            headers=call.headers,
+            json=call.body,
+        )
+        response.close()
+        return response.status_code
+
+    return send
+
+
+def _server_sender(port: int) -> Callable[[Call], int]:
+    def send(call: Call) -> int:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        try:
+            headers = dict(call.headers)
+            body = None
+            if call.body is not None:
+                body = json.dumps(call.body)
+                headers["Content-Type"] = "application/json"
+            connection.request(call.method, call.path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            return response.status
+        finally:
+            connection.close()
+
+    return send
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def run_scenario(
+    send: Callable[[Call], int],
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    seed_value: str,
+) -> dict:
+    rng = random.Random(seed_value)
+    calls = [scenario(rng) for _ in range(requests)]
+
+    def timed(call: Call) -> tuple[float, int]:
+        started = time.perf_counter()
+        status = send(call)
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(timed, calls))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    statuses = Counter(str(status) for _, status in samples)
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "statuses": dict(statuses),
+        "server_errors": sum(1 for _, status in samples if status >= 500),
+    }
+
+
+def run_scale(
+    scale: str,
+    *,
+    requests: int,
+    concurrency: int,
+    modes: list[str],
+    seed_value: int,
+    database_uri: str,
+) -> dict:
+    app = create_app(
+        "production",
+        {"SQLALCHEMY_DATABASE_URI": database_uri, "REQUEST_INSTRUMENTATION_ENABLED": False},
+    )
+    with app.app_context():
+        db.create_all()
+        data = seed(events=SCALES[scale], seed_value=seed_value)
+    scenarios = build_scenarios(app, data)
+
+    results: dict[str, dict] = {"seed_seconds": data.elapsed_seconds}
+    for mode in modes:
+        server = None
+        if mode == "server":
+            server = make_server(
+                "127.0.0.1",
+                0,
+                app,
+                threaded=True,
+                request_handler=QuietRequestHandler,
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            send = _server_sender(server.server_port)
+        else:
+            send = _client_sender(app)
+        try:
+            results[mode] = {
+                # Each mode gets its own call sequence, so writes such as book_event
+                # are not simply replays of the previous mode.
+                name: run_scenario(
+                    send,
+                    scenario,
+                    requests,
+                    concurrency,
+                    f"{seed_value}-{mode}-{name}",
+                )
+                for name, scenario in scenarios.items()
+            }
+        finally:
+            if server is not None:
+                server.shutdown()
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describe every scenario whose p95 or throughput is worse than ``tolerance``."""
+    regressions = []
+    for scale, modes in current["scales"].items():
+        for mode, scenarios in modes.items():
+            if not isinstance(scenarios, dict):
+                continue
+            for name, result in scenarios.items():
+                previous = baseline.get("scales", {}).get(scale, {}).get(mode, {}).get(name)
+                if not previous:
+                    continue
+                label = f"{scale}/{mode}/{name}"
+                if result["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                    regressions.append(
+                        f"{label}: p95 {previous['p95_ms']} ms -> {result['p95_ms']} ms",
+                    )
+                if result["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+                    regressions.append(
+                        f"{label}: throughput {previous['throughput_rps']} -> "
+                        f"{result['throughput_rps']} req/s",
+                    )
+    return regressions
+
+
+def _print_table(results: dict) -> None:
+    for scale, modes in results["scales"].items():
+        print(f"\n== {scale} (seeded in {modes['seed_seconds']}s)")
+        for mode in MODES:
+            if mode not in modes:
+                continue
+            print(f"-- {mode}")
+            print(f"{'endpoint':<16}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}  statuses")
+            for name, result in modes[mode].items():
+                print(
+                    f"{name:<16}{result['throughput_rps']:>10}{result['p50_ms']:>10}"
+                    f"{result['p95_ms']:>10}{result['p99_ms']:>10}  {result['statuses']}",
+                )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="Repeatable.")
+    parser.add_argument("--mode", action="append", choices=MODES, help="Default: both.")
+    parser.add_argument("--requests", type=int, default=300, help="Requests per endpoint.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database", help="SQLAlchemy URI (defaults to a temporary SQLite file)")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON.")
+    parser.add_argument("--baseline", type=Path, help="Result file to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown before a result counts as a regression.",
+    )
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "started_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    for scale in args.scale or ["10k"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            database_uri = args.database or f"sqlite:///{Path(tmp) / f'bench-{scale}.db'}"
+            results["scales"][scale] = run_scale(
+                scale,
+                requests=args.requests,
+                concurrency=args.concurrency,
+                modes=args.mode or list(MODES),
+                seed_value=args.seed,
+                database_uri=database_uri,
+            )
+
+    _print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Fire concurrent bookings at a single event and verify capacity is never exceeded.
+
+Once the bookings are in, the organizer approves every pending booking concurrently, so
+status changes compete for the same event row too.
+Reader threads can browse the event while the bookings run, and ``--compare`` runs
+everything twice on SQLite: once with plain connections and once with the
+``SQLITE_PRAGMAS`` tuning (WAL, busy timeout, ...), to show what the tuning buys.
+
+Usage::
+
+    python -m benchmarks.booking_contention --requests 200 --capacity 50 --threads 16
+    python -m benchmarks.booking_contention --readers 4 --compare
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from datetime import time as time_of_day
+from pathlib import Path
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func, select
+
+from app import create_app
+from app.extensions import db
+from app.models import Booking, BookingStatus, Event, EventStatus, Role, User
+from app.utils.security import hash_password
+
+
+def _auth_headers(user: User) -> dict[str, str]:
+    token = create_access_token(identity=str(user.id), additional_claims={"role": user.role.value})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(
+    app,
+    requests: int,
+    capacity: int,
+) -> tuple[int, dict[str, str], list[dict[str, str]]]:
+    with app.app_context():
+        db.create_all()
+        password_hash = hash_password("Password123")
+        organizer = User(
+            name="Contention University",
+            email="contention-uni@example.com",
+            password_hash=password_hash,
+            role=Role.UNIVERSITY,
+        )
+        db.session.add(organizer)
+        db.session.flush()
+        event = Event(
+            title="Flash Sale Event",
+            description="Benchmark event with a limited number of seats.",
+            location="Garissa",
+            date=date.today(),
+            time=time_of_day(hour=10),
+            capacity=capacity,
+            status=EventStatus.PUBLISHED,
+            organizer_id=organizer.id,
+        )
+        db.session.add(event)
+        attendees = [
+            User(
+                name=f"Attendee {index}",
+                email=f"attendee-{index}@example.com",
+                password_hash=password_hash,
+                role=Role.USER,
+            )
+            for index in range(requests)
+        ]
+        db.session.add_all(attendees)
+        db.session.commit()
+
+        return (
+            event.id,
+            _auth_headers(organizer),
+            [_auth_headers(attendee) for attendee in attendees],
+        )
+
+
+def _read_until(app, event_id: int, done: threading.Event, latencies: list, statuses: Counter):
+    client = app.test_client()
+    paths = (f"/api/events/{event_id}", "/api/events/?status=published")
+    index = 0
+    while not done.is_set():
+        started = time.perf_counter()
+        response = client.get(paths[index % len(paths)])
+        latencies.append((time.perf_counter() - started) * 1000)
+        statuses[response.status_code] += 1
+        index += 1
+
+
+def run(
+    requests: int,
+    capacity: int,
+    threads: int,
+    database_uri: str,
+    readers: int = 0,
+    tuned: bool = True,
+) -> dict:
+    overrides = {
+        "SQLALCHEMY_DATABASE_URI": database_uri,
+        "RESPONSE_CACHE_ENABLED": False,
+        "REQUEST_INSTRUMENTATION_ENABLED": False,
+    }
+    if not tuned:
+        overrides["SQLITE_PRAGMAS"] = {}
+    app = create_app("testing", overrides)
+    event_id, organizer_headers, headers = _seed(app, requests, capacity)
+
+    def _book(auth_headers: dict[str, str]) -> int:
+        response = app.test_client().post(
+            f"/api/events/{event_id}/book",
+            json={"seats": 1},
+            headers=auth_headers,
+        )
+        return response.status_code
+
+    def _approve(booking_id: int) -> int:
+        response = app.test_client().put(
+            f"/api/bookings/{booking_id}",
+            json={"status": BookingStatus.APPROVED.value},
+            headers=organizer_headers,
+        )
+        return response.status_code
+
+    done = threading.Event()
+    read_latencies: list[float] = []
+    read_statuses: Counter = Counter()
+    reader_threads = [
+        threading.Thread(
+            target=_read_until,
+            args=(app, event_id, done, read_latencies, read_statuses),
+        )
+        for _ in range(readers)
+    ]
+    for reader in reader_threads:
+        reader.start()
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            statuses = Counter(pool.map(_book, headers))
+            elapsed = time.perf_counter() - started
+            with app.app_context():
+                pending = db.session.scalars(
+                    select(Booking.id).where(
+                        Booking.event_id == event_id,
+                        Booking.status == BookingStatus.PENDING,
+                    ),
+                ).all()
+            approval_started = time.perf_counter()
+            approval_statuses = Counter(pool.map(_approve, pending))
+            approval_elapsed = time.perf_counter() - approval_started
+    finally:
+        done.set()
+        for reader in reader_threads:
+            reader.join()
+
+    with app.app_context():
+        event = db.session.get(Event, event_id)
+        approved = (
+            db.session.query(func.count(Booking.id))
+            .filter(Booking.event_id == event_id, Booking.status == BookingStatus.APPROVED)
+            .scalar()
+        )
+        booked = (
+            db.session.query(func.coalesce(func.sum(Booking.seats), 0))
+            .filter(
+                Booking.event_id == event_id,
+                Booking.status.in_([BookingStatus.PENDING, BookingStatus.APPROVED]),
+            )
+            .scalar()
+        )
+        reserved = event.reserved_seats
+
+    read_latencies.sort()
+    return {
+        "sqlite_tuning": tuned,
+        "requests": requests,
+        "capacity": capacity,
+        "threads": threads,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "statuses": dict(statuses),
+        "approvals": len(pending),
+        "approve_seconds": round(approval_elapsed, 3),
+        "approve_statuses": dict(approval_statuses),
+        "approved": approved,
+        "booked_seats": int(booked),
+        "reserved_seats": reserved,
+        "reads": len(read_latencies),
+        "read_statuses": dict(read_statuses),
+        "read_p50_ms": round(statistics.median(read_latencies), 2) if read_latencies else None,
+        "read_p95_ms": (
+            round(read_latencies[int(len(read_latencies) * 0.95)], 2) if read_latencies else None
+        ),
+        "oversold": booked > capacity or reserved != booked or approved != len(pending),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--capacity", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=0, help="Threads browsing meanwhile.")
+    parser.add_argument("--database", help="SQLAlchemy URI (defaults to a temporary SQLite file)")
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Run without and then with the SQLite pragmas, each on a fresh database.",
+    )
+    args = parser.parse_args(argv)
+
+    results = []
+    for tuned in (False, True) if args.compare else (True,):
+        with tempfile.TemporaryDirectory() as tmp:
+            database_uri = args.database or f"sqlite:///{Path(tmp) / 'contention.db'}"
+            results.append(
+                run(
+                    args.requests,
+                    args.capacity,
+                    args.threads,
+                    database_uri,
+                    readers=args.readers,
+                    tuned=tuned,
+                ),
+            )
+
+    for key in results[0]:
+        print(f"{key:>16}: " + "  |  ".join(str(result[key]) for result in results))
+    if any(result["oversold"] for result in results):
+        print("FAIL: capacity exceeded or seat counter out of sync.")
+        return 1
+    print("OK: capacity respected.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""Gunicorn settings for the production server; the SERVER_* values are described in
+app/config.py.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (``preload_app``) and the workers are forked
+from it, so they share its memory pages until they write to them. ``kill -HUP`` on the
+master replaces the workers gracefully and ``kill -TERM`` shuts down once in-flight
+requests finish. Because the code is loaded in the master, deploying new code needs a
+full restart (or ``kill -USR2`` for a new master) rather than a HUP.
+"""
+
+from __future__ import annotations
+
+import gc
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+    # prometheus_client writes there as soon as the app's metrics are defined.
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+from app.config import get_config  # noqa: E402
+
+_config = get_config(os.environ.get("FLASK_ENV", "production"))
+
+wsgi_app = "wsgi:app"
+preload_app = True
+bind = _config.SERVER_BIND
+workers = _config.SERVER_WORKERS
+worker_class = "gthread"
+threads = _config.SERVER_THREADS
+max_requests = _config.SERVER_MAX_REQUESTS
+max_requests_jitter = _config.SERVER_MAX_REQUESTS_JITTER
+timeout = _config.SERVER_TIMEOUT
+graceful_timeout = _config.SERVER_GRACEFUL_TIMEOUT
+keepalive = _config.SERVER_KEEPALIVE
+
+
+def on_starting(server):
+    # Per-process metric files left by a previous run would be summed into this one.
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        for path in Path(os.environ["PROMETHEUS_MULTIPROC_DIR"]).glob("*.db"):
+            path.unlink(missing_ok=True)
+
+
+def when_ready(server):
+    # Move everything allocated while preloading out of the collector's reach, so
+    # garbage collection in the workers does not touch (and copy) those pages.
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from app.extensions import db
+    from app.services.outbox_service import outbox_worker
+
+    app = server.app.wsgi()
+    # Connections opened by the master must not be shared with the workers.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    # Every worker, including one that replaces a recycled worker, drains the outbox
+    # even before it serves a request (unless EMAIL_OUTBOX_WORKER_ENABLED is off).
+    outbox_worker.start(app)
+
+
+def worker_exit(server, worker):
+    from app.services.outbox_service import outbox_worker
+    from app.utils.security import shutdown_hash_pool
+
+    outbox_worker.stop()
+    shutdown_hash_pool()
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
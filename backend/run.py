@@ -1,3 +1,5 @@
+"""Flask development server. In production run ``gunicorn -c gunicorn.conf.py``."""
+
 from __future__ import annotations
 
 from app import create_app
@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
+
 import pytest
 from flask import Flask
 from flask.testing import FlaskClient
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
 from app import create_app
 from app.extensions import db as database
+from app.extensions import response_cache
 from app.models import Role, User
+from app.services.identity_service import clear_identity_cache
+from app.services.stats_service import clear_admin_stats_cache
 from flask_jwt_extended import create_access_token
+from tests.smtp_server import LocalSMTPServer
 
 
 @pytest.fixture(scope="session")
@@ -33,6 +40,9 @@ def db_session(app: Flask):
         for table in reversed(database.metadata.sorted_tables):
             database.session.execute(table.delete())
         database.session.commit()
+        response_cache.clear()
+        clear_identity_cache()
+        clear_admin_stats_cache()
 
 
 @pytest.fixture
@@ -47,3 +57,43 @@ def token_factory(app: Flask):
 
     return _make_token
 
+
+
+@pytest.fixture
+def assert_max_queries(app: Flask):
+    """Fail the test if the wrapped block issues more than ``limit`` SQL statements."""
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = database.engine
+        event.listen(engine, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, "before_cursor_execute", _record)
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n" + "\n".join(statements)
+        )
+
+    return _assert_max_queries
+
+
+@pytest.fixture
+def smtp_server(app: Flask, monkeypatch):
+    """A local SMTP server that the app's mail settings point at for the test."""
+    server = LocalSMTPServer()
+    for key, value in {
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": server.port,
+        "MAIL_USE_TLS": False,
+        "MAIL_USERNAME": "outbox@example.com",
+        "MAIL_PASSWORD": "secret",
+    }.items():
+        monkeypatch.setitem(app.config, key, value)
+    yield server
+    server.stop()
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import date, time
 
 from app.models import Booking, BookingStatus, Event, EventStatus, Role, User
+from app.services.booking_service import ACTIVE_BOOKING_STATUSES, adjust_reserved_seats
 from app.utils.security import hash_password
 from app.extensions import db
 
@@ -70,6 +71,8 @@ def create_booking(
         status=status,
     )
     db.session.add(booking)
+    if status in ACTIVE_BOOKING_STATUSES:
+        adjust_reserved_seats(event.id, seats)
     db.session.commit()
     return booking
 
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import socketserver
+import threading
+from dataclasses import dataclass, field
+from email import message_from_bytes
+from email.message import Message
+
+
+@dataclass
+class SMTPLog:
+    connections: int = 0
+    logins: int = 0
+    messages: list[Message] = field(default_factory=list)
+    rejected_recipients: set[str] = field(default_factory=set)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough of SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, NOOP, QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        log: SMTPLog = self.server.log
+        log.connections += 1
+        self.reply("220 localhost test SMTP")
+        while line := self.rfile.readline():
+            command, _, argument = line.decode().strip().partition(" ")
+            command = command.upper()
+            if command in ("EHLO", "HELO"):
+                self.reply("250-localhost")
+                self.reply("250 AUTH PLAIN")
+            elif command == "AUTH":
+                log.logins += 1
+                self.reply("235 Authentication successful")
+            elif command in ("MAIL", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif command == "RCPT":
+                address = argument.partition(":")[2].strip("<> ")
+                if address in log.rejected_recipients:
+                    self.reply("550 No such user")
+                else:
+                    self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b""
+                while (chunk := self.rfile.readline()) != b".\r\n":
+                    data += chunk
+                log.messages.append(message_from_bytes(data))
+                self.reply("250 OK")
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """Plain-text SMTP server on a free local port that records what it receives."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SMTPHandler)
+        self.log = SMTPLog()
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+
+from app.extensions import db, response_cache
 from app.models import BookingStatus, EventStatus, Role
+from app.services.rollup_service import run_rollups
 from tests.factories import create_booking, create_event, create_user
 
 
@@ -24,8 +28,11 @@ def test_admin_stats_and_users_list(client, token_factory):
         "publishedEvents",
         "bookings",
         "approvedBookings",
+        "generatedAt",
     ]:
         assert key in stats
+    assert stats["publishedEvents"] == 1
+    assert stats["approvedBookings"] == 1
 
     users_response = client.get("/api/admin/users", headers=headers)
     assert users_response.status_code == 200
@@ -33,3 +40,65 @@ def test_admin_stats_and_users_list(client, token_factory):
     assert "data" in users_payload and "meta" in users_payload
     assert users_payload["meta"]["total"] >= 3
 
+
+
+def test_admin_stats_single_query_and_cached(client, token_factory, assert_max_queries):
+    admin = create_user(email="admin-cache@example.com", role=Role.ADMIN)
+    headers = token_factory(admin)
+    lookups = response_cache.store.hits + response_cache.store.misses
+
+    with assert_max_queries(1):
+        first = client.get("/api/admin/stats", headers=headers).get_json()
+    with assert_max_queries(0):
+        second = client.get("/api/admin/stats", headers=headers).get_json()
+
+    assert first["users"] == 1
+    assert second["generatedAt"] == first["generatedAt"]
+    # The totals have their own cache and leave the response cache's hit rate alone.
+    assert response_cache.store.hits + response_cache.store.misses == lookups
+
+
+def test_admin_timeseries_reads_incremental_rollups(client, token_factory):
+    admin = create_user(email="admin-series@example.com", role=Role.ADMIN)
+    university = create_user(email="series-uni@example.com", role=Role.UNIVERSITY)
+    user = create_user(email="series-user@example.com", role=Role.USER)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED)
+
+    today = datetime.utcnow().replace(microsecond=0)
+    earlier = create_booking(event=event, user=user, status=BookingStatus.APPROVED)
+    earlier.created_at = today - timedelta(days=2)
+    db.session.commit()
+    create_booking(event=event, user=admin, status=BookingStatus.PENDING)
+
+    run_rollups()
+    headers = token_factory(admin)
+    params = {
+        "metric": "bookings",
+        "start": (today - timedelta(days=3)).date().isoformat(),
+        "end": today.date().isoformat(),
+    }
+
+    payload = client.get("/api/admin/stats/timeseries", headers=headers, query_string=params)
+    assert payload.status_code == 200
+    data = payload.get_json()
+    assert [point["value"] for point in data["points"]] == [0, 1, 0, 1]
+    assert data["lastRollupAt"] is not None
+
+    # Rows created after the watermark only show up once the next run picks them up.
+    third = create_user(email="series-late@example.com", role=Role.USER)
+    create_booking(event=event, user=third, status=BookingStatus.APPROVED)
+    run_rollups()
+
+    data = client.get(
+        "/api/admin/stats/timeseries",
+        headers=headers,
+        query_string={**params, "granularity": "month"},
+    ).get_json()
+    assert sum(point["value"] for point in data["points"]) == 3
+
+    bad = client.get(
+        "/api/admin/stats/timeseries",
+        headers=headers,
+        query_string={"metric": "bookings", "start": "2024-02-01", "end": "2024-01-01"},
+    )
+    assert bad.status_code == 400
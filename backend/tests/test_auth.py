@@ -1,6 +1,17 @@
 from __future__ import annotations
 
-from app.models import Role
+from datetime import datetime, timedelta
+
+import pytest
+from passlib.hash import pbkdf2_sha256
+from werkzeug.exceptions import ServiceUnavailable
+
+from app import create_app
+from app.extensions import db
+from app.models import OTPCode, Role
+from app.services.otp_service import MemoryOTPStore, OTPService, purge_otp_codes
+from app.utils.rate_limit import MemoryBucketStore
+from app.utils.security import _get_pool, hash_password, shutdown_hash_pool, verify_password
 from tests.factories import create_user
 
 
@@ -37,3 +48,209 @@ def test_login_requires_verification(client):
     payload = response.get_json()
     assert payload["message"] == "Account not verified. Please verify your email."
 
+
+def test_login_rehashes_outdated_password_hash(client):
+    user = create_user(email="legacy@example.com", password="Password123")
+    user.password_hash = pbkdf2_sha256.using(rounds=500).hash("Password123")
+    db.session.commit()
+
+    response = client.post(
+        "/api/auth/login",
+        json={"email": "legacy@example.com", "password": "Password123"},
+    )
+
+    assert response.status_code == 200
+    db.session.refresh(user)
+    assert user.password_hash.startswith("$pbkdf2-sha256$1000$")
+    assert verify_password("Password123", user.password_hash)
+
+
+def test_password_hashing_runs_in_bounded_process_pool(app, monkeypatch):
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setitem(app.config, "PASSWORD_HASH_QUEUE_TIMEOUT", 0)
+    try:
+        hashed = hash_password("Password123")
+        assert verify_password("Password123", hashed)
+        # Pool processes must not be forked from the threaded worker.
+        assert _get_pool().executor._mp_context.get_start_method() != "fork"
+
+        monkeypatch.setitem(app.config, "PASSWORD_HASH_MAX_PENDING", 0)
+        with pytest.raises(ServiceUnavailable) as excinfo:
+            hash_password("Password123")
+        assert excinfo.value.retry_after == 1
+    finally:
+        shutdown_hash_pool()
+
+
+def _login(client, email: str) -> dict:
+    response = client.post("/api/auth/login", json={"email": email, "password": "Password123"})
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_refresh_rotates_tokens_and_detects_reuse(client):
+    create_user(email="refresh@example.com")
+    first = _login(client, "refresh@example.com")
+    assert first["refreshToken"]
+
+    rotated = client.post(
+        "/api/auth/refresh",
+        headers={"Authorization": f"Bearer {first['refreshToken']}"},
+    )
+    assert rotated.status_code == 200
+    second = rotated.get_json()
+    assert second["refreshToken"] != first["refreshToken"]
+    profile = client.get(
+        "/api/auth/profile",
+        headers={"Authorization": f"Bearer {second['accessToken']}"},
+    )
+    assert profile.status_code == 200
+
+    # Replaying the old token revokes the session, including the newest token.
+    replayed = client.post(
+        "/api/auth/refresh",
+        headers={"Authorization": f"Bearer {first['refreshToken']}"},
+    )
+    assert replayed.status_code == 401
+    latest = client.post(
+        "/api/auth/refresh",
+        headers={"Authorization": f"Bearer {second['refreshToken']}"},
+    )
+    assert latest.status_code == 401
+
+
+def test_logout_and_ban_end_refresh_sessions(client, token_factory):
+    user = create_user(email="session-end@example.com")
+    admin = create_user(email="session-admin@example.com", role=Role.ADMIN)
+
+    tokens = _login(client, "session-end@example.com")
+    logout = client.post(
+        "/api/auth/logout",
+        headers={"Authorization": f"Bearer {tokens['refreshToken']}"},
+    )
+    assert logout.status_code == 200
+    refreshed = client.post(
+        "/api/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refreshToken']}"},
+    )
+    assert refreshed.status_code == 401
+
+    tokens = _login(client, "session-end@example.com")
+    client.put(f"/api/admin/users/{user.id}/ban", headers=token_factory(admin))
+    refreshed = client.post(
+        "/api/auth/refresh",
+        headers={"Authorization": f"Bearer {tokens['refreshToken']}"},
+    )
+    assert refreshed.status_code == 401
+
+
+def test_identity_is_cached_and_invalidated_on_ban(client, token_factory, assert_max_queries):
+    user = create_user(email="cached-identity@example.com")
+    admin = create_user(email="cached-admin@example.com", role=Role.ADMIN)
+    headers = token_factory(user)
+
+    with assert_max_queries(10) as first:
+        assert client.get("/api/auth/profile", headers=headers).status_code == 200
+    with assert_max_queries(len(first) - 1):
+        assert client.get("/api/auth/profile", headers=headers).status_code == 200
+
+    client.put(f"/api/admin/users/{user.id}/ban", headers=token_factory(admin))
+    response = client.get("/api/auth/profile", headers=headers)
+    assert response.status_code == 403
+    assert client.get("/api/bookings/me", headers=headers).status_code == 403
+
+
+def test_cached_identity_is_reloaded_when_the_token_role_differs(client, token_factory, db_session):
+    user = create_user(email="promoted@example.com")
+    assert client.get("/api/auth/profile", headers=token_factory(user)).status_code == 200
+
+    # Promoted by another worker: this process's identity cache was not invalidated.
+    user.role = Role.UNIVERSITY
+    db_session.commit()
+
+    response = client.get("/api/auth/profile", headers=token_factory(user))
+    assert response.get_json()["role"] == Role.UNIVERSITY.value
+
+
+@pytest.mark.parametrize("backend", ["database", "memory"])
+def test_resent_otp_supersedes_earlier_code(app, client, monkeypatch, backend):
+    if backend == "memory":
+        monkeypatch.setitem(app.extensions, "otp_store", MemoryOTPStore(max_entries=100))
+    create_user(email=f"otp-{backend}@example.com", is_active=False)
+    with app.app_context():
+        first = OTPService.generate(f"otp-{backend}@example.com")
+        second = OTPService.generate(f"otp-{backend}@example.com")
+        if first.code == second.code:  # pragma: no cover - one in a million
+            pytest.skip("identical codes generated")
+
+    def verify(otp):
+        payload = {"email": otp.email, "code": otp.code, "purpose": otp.purpose}
+        return client.post("/api/auth/verify", json=payload).status_code
+
+    assert verify(first) == 400
+    assert verify(second) == 200
+    assert verify(second) == 400
+
+
+def test_purge_removes_used_and_expired_otp_codes(app):
+    with app.app_context():
+        OTPService.generate("purge@example.com")
+        current = OTPService.generate("purge@example.com")
+        db.session.add(
+            OTPCode(
+                email="old@example.com",
+                purpose="registration",
+                code="123456",
+                expires_at=datetime.utcnow() - timedelta(minutes=1),
+            ),
+        )
+        db.session.commit()
+
+        assert purge_otp_codes(batch_size=1) == 2
+        assert db.session.scalars(db.select(OTPCode.code)).all() == [current.code]
+
+
+def test_login_is_rate_limited_per_email_before_password_check(app, client, monkeypatch):
+    create_user(email="limited@example.com")
+    monkeypatch.setitem(app.extensions, "rate_limiter", MemoryBucketStore())
+    monkeypatch.setitem(app.config, "RATE_LIMITS", {"login": {"ip": (10, 60), "email": (2, 60)}})
+    checks = []
+    monkeypatch.setattr(
+        "app.api.auth.verify_and_update_password",
+        lambda password, hashed: checks.append(password) or (False, None),
+    )
+
+    credentials = {"email": "Limited@example.com", "password": "WrongPassword"}
+    assert client.post("/api/auth/login", json=credentials).status_code == 401
+    assert client.post("/api/auth/login", json=credentials).status_code == 401
+    limited = client.post("/api/auth/login", json=credentials)
+    assert limited.status_code == 429
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert len(checks) == 2
+
+    other = {"email": "someone-else@example.com", "password": "WrongPassword"}
+    assert client.post("/api/auth/login", json=other).status_code != 429
+
+
+def test_ip_rate_limit_uses_forwarded_client_address(tmp_path):
+    proxied = create_app(
+        "testing",
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'proxied.db'}",
+            "PROXY_FIX_X_FOR": 1,
+            "RATE_LIMITING_ENABLED": True,
+            "RATE_LIMITS": {"login": {"ip": (1, 60)}},
+        },
+    )
+    with proxied.app_context():
+        db.create_all()
+    client = proxied.test_client()
+    credentials = {"email": "nobody@example.com", "password": "WrongPassword"}
+
+    def login(client_ip: str) -> int:
+        headers = {"X-Forwarded-For": client_ip}
+        return client.post("/api/auth/login", json=credentials, headers=headers).status_code
+
+    assert login("203.0.113.1") == 401
+    assert login("203.0.113.1") == 429
+    assert login("203.0.113.2") == 401
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
+import csv
+import io
+import json
+
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
 from app.models import BookingStatus, EventStatus, Role
+from app.services.booking_service import reconcile_reserved_seats, reserve_seats
 from tests.factories import create_booking, create_event, create_user
 
 
@@ -50,3 +58,212 @@ def test_booking_history_paginated(client, token_factory):
     assert "data" in payload and "meta" in payload
     assert payload["meta"]["total"] == 1
 
+
+
+def test_reserved_seat_counter_tracks_status_changes(client, token_factory, db_session):
+    university = create_user(email="uni-counter@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED, capacity=5)
+    attendee = create_user(email="counter@example.com", role=Role.USER)
+
+    response = client.post(
+        f"/api/events/{event.id}/book",
+        json={"seats": 3},
+        headers=token_factory(attendee),
+    )
+    assert response.status_code == 201
+    booking_id = response.get_json()["id"]
+    db_session.refresh(event)
+    assert event.reserved_seats == 3
+
+    response = client.put(
+        f"/api/bookings/{booking_id}",
+        json={"status": BookingStatus.REJECTED.value},
+        headers=token_factory(university),
+    )
+    assert response.status_code == 200
+    db_session.refresh(event)
+    assert event.reserved_seats == 0
+
+    event.reserved_seats = 4
+    db_session.commit()
+    drift = reconcile_reserved_seats()
+    assert [(item.event_id, item.recorded, item.actual) for item in drift] == [(event.id, 4, 0)]
+    db_session.refresh(event)
+    assert event.reserved_seats == 0
+
+
+def test_reserve_seats_never_exceeds_capacity(db_session):
+    university = create_user(email="uni-flash@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED, capacity=3)
+
+    assert reserve_seats(event.id, 2)
+    assert not reserve_seats(event.id, 2)
+    assert reserve_seats(event.id, 1)
+    db_session.commit()
+
+    db_session.refresh(event)
+    assert event.reserved_seats == 3
+
+
+def test_status_change_is_retried_when_the_database_is_locked(
+    client, token_factory, db_session, monkeypatch,
+):
+    university = create_user(email="uni-locked@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED, capacity=5)
+    attendee = create_user(email="locked@example.com", role=Role.USER)
+    booking_id = client.post(
+        f"/api/events/{event.id}/book",
+        json={"seats": 3},
+        headers=token_factory(attendee),
+    ).get_json()["id"]
+
+    commit = db.session.commit
+    failures = iter([OperationalError("COMMIT", {}, Exception("database is locked"))])
+
+    def _flaky_commit():
+        error = next(failures, None)
+        if error is not None:
+            raise error
+        commit()
+
+    monkeypatch.setattr(db.session, "commit", _flaky_commit)
+    response = client.delete(f"/api/bookings/{booking_id}", headers=token_factory(attendee))
+    monkeypatch.undo()
+
+    assert response.status_code == 200
+    db_session.refresh(event)
+    assert event.reserved_seats == 0
+
+
+def test_organizer_bookings_spans_owned_events(client, token_factory):
+    university = create_user(email="uni-organizer@example.com", role=Role.UNIVERSITY)
+    other_university = create_user(email="uni-other@example.com", role=Role.UNIVERSITY)
+    first = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    second = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    foreign = create_event(organizer=other_university, status=EventStatus.PUBLISHED)
+
+    attendee = create_user(email="organizer-attendee@example.com", role=Role.USER)
+    pending = create_booking(event=first, user=attendee)
+    create_booking(event=second, user=attendee, status=BookingStatus.APPROVED)
+    create_booking(event=foreign, user=attendee)
+
+    response = client.get("/api/bookings/organizer", headers=token_factory(university))
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [booking["id"] for booking in payload["data"]] == [pending.id]
+    assert payload["counts"][str(first.id)]["pending"] == 1
+    assert payload["counts"][str(second.id)]["approved"] == 1
+    assert str(foreign.id) not in payload["counts"]
+
+    response = client.get(
+        "/api/bookings/organizer?status=all&cursor=",
+        headers=token_factory(university),
+    )
+    assert len(response.get_json()["data"]) == 2
+
+
+def test_bulk_moderation_checks_capacity_per_event(client, token_factory):
+    university = create_user(email="uni-bulk@example.com", role=Role.UNIVERSITY)
+    roomy = create_event(organizer=university, status=EventStatus.PUBLISHED, capacity=10)
+    tight = create_event(organizer=university, status=EventStatus.PUBLISHED, capacity=2)
+
+    attendees = [create_user(email=f"bulk-{index}@example.com") for index in range(3)]
+    approve = create_booking(event=roomy, user=attendees[0], seats=2)
+    reject = create_booking(event=roomy, user=attendees[1], seats=2)
+    revive_a = create_booking(event=tight, user=attendees[0], status=BookingStatus.REJECTED)
+    revive_b = create_booking(
+        event=tight,
+        user=attendees[1],
+        seats=2,
+        status=BookingStatus.REJECTED,
+    )
+
+    response = client.put(
+        "/api/bookings/bulk",
+        json={
+            "items": [
+                {"id": approve.id, "status": "approved"},
+                {"id": reject.id, "status": "rejected"},
+                {"id": revive_a.id, "status": "approved"},
+                {"id": revive_b.id, "status": "approved"},
+                {"id": 999999, "status": "approved"},
+            ],
+        },
+        headers=token_factory(university),
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [result["success"] for result in payload["results"]] == [
+        True,
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert payload["updated"] == 2
+    assert client.get(f"/api/events/{roomy.id}").get_json()["reserved_seats"] == 2
+    assert client.get(f"/api/events/{tight.id}").get_json()["reserved_seats"] == 0
+
+
+def test_bulk_moderation_rejects_duplicate_ids(client, token_factory):
+    university = create_user(email="uni-bulk-dupe@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    booking = create_booking(event=event, user=create_user(email="bulk-dupe@example.com"))
+
+    response = client.put(
+        "/api/bookings/bulk",
+        json={
+            "items": [
+                {"id": booking.id, "status": "approved"},
+                {"id": booking.id, "status": "rejected"},
+            ],
+        },
+        headers=token_factory(university),
+    )
+    assert response.status_code == 400
+    assert response.get_json()["duplicateIds"] == [booking.id]
+    assert booking.status == BookingStatus.PENDING
+
+
+def test_attendee_export_streams_csv_and_ndjson(client, token_factory):
+    university = create_user(email="uni-export@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    for index in range(3):
+        attendee = create_user(name=f"Export {index}", email=f"export-{index}@example.com")
+        create_booking(event=event, user=attendee)
+
+    headers = token_factory(university)
+    response = client.get(f"/api/bookings/event/{event.id}/export", headers=headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+    lines = response.get_data(as_text=True).strip().splitlines()
+    assert lines[0].startswith("booking_id,status,seats")
+    assert len(lines) == 4
+
+    response = client.get(f"/api/bookings/event/{event.id}/export?format=ndjson", headers=headers)
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row["email"] for row in rows] == [f"export-{index}@example.com" for index in range(3)]
+
+    outsider = create_user(email="export-outsider@example.com", role=Role.USER)
+    response = client.get(
+        f"/api/bookings/event/{event.id}/export",
+        headers=token_factory(outsider),
+    )
+    assert response.status_code == 403
+
+
+def test_attendee_csv_export_neutralises_formulas(client, token_factory):
+    university = create_user(email="uni-formula@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    attendee = create_user(name="=SUM(A1:A9)", email="@formula@example.com")
+    create_booking(event=event, user=attendee)
+    headers = token_factory(university)
+
+    response = client.get(f"/api/bookings/event/{event.id}/export", headers=headers)
+    row = next(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert row["name"] == "'=SUM(A1:A9)"
+    assert row["email"] == "'@formula@example.com"
+
+    response = client.get(f"/api/bookings/event/{event.id}/export?format=ndjson", headers=headers)
+    assert json.loads(response.get_data(as_text=True))["email"] == "@formula@example.com"
@@ -1,6 +1,19 @@
 from __future__ import annotations
 
-from app.models import EventStatus, Role
+from datetime import date
+
+from flask import g
+from prometheus_client import REGISTRY
+from sqlalchemy import func, select, text, update
+
+from app import create_app
+from app.extensions import db, response_cache
+from app.models import Event, EventStatus, Role
+from app.services.stats_service import (
+    ADMIN_STATS_CACHE_KEY,
+    _admin_stats_cache,
+    get_admin_stats,
+)
 from tests.factories import create_event, create_user
 
 
@@ -67,3 +80,173 @@ def test_event_list_is_paginated(client, token_factory):
     assert "data" in payload and "meta" in payload
     assert payload["meta"]["total"] >= 2
 
+
+
+def test_event_list_cursor_pagination(client):
+    uni = create_user(email="uni-cursor@example.com", role=Role.UNIVERSITY)
+    for index in range(5):
+        create_event(title=f"Cursor Event {index}", organizer=uni, status=EventStatus.PUBLISHED)
+
+    seen = []
+    cursor = ""
+    while True:
+        response = client.get(f"/api/events/?page_size=2&cursor={cursor}")
+        assert response.status_code == 200
+        payload = response.get_json()
+        assert "total" not in payload["meta"]
+        seen.extend(event["id"] for event in payload["data"])
+        cursor = payload["meta"]["nextCursor"]
+        if not payload["meta"]["hasNextPage"]:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    response = client.get("/api/events/?cursor=&include_total=true")
+    assert response.get_json()["meta"]["total"] == 5
+
+    response = client.get("/api/events/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+def test_event_cursor_ignores_later_edits_to_the_cursor_row(client):
+    uni = create_user(email="uni-cursor-edit@example.com", role=Role.UNIVERSITY)
+    events = [
+        create_event(
+            title=f"Cursor Edit {index}",
+            organizer=uni,
+            status=EventStatus.PUBLISHED,
+            event_date=date(2030, 1, index + 1),
+        )
+        for index in range(5)
+    ]
+    event_ids = [event.id for event in events]
+
+    first = client.get("/api/events/?page_size=2&cursor=").get_json()
+    assert [event["id"] for event in first["data"]] == event_ids[:2]
+
+    db.session.execute(update(Event).where(Event.id == event_ids[1]).values(date=date(2031, 1, 1)))
+    db.session.commit()
+
+    cursor = first["meta"]["nextCursor"]
+    second = client.get(f"/api/events/?page_size=2&cursor={cursor}").get_json()
+    assert [event["id"] for event in second["data"]] == event_ids[2:4]
+
+
+def test_event_search_is_ranked_and_kept_in_sync(client, token_factory, db_session):
+    uni = create_user(email="uni-search@example.com", role=Role.UNIVERSITY)
+    in_title = create_event(title="Robotics Workshop", organizer=uni, status=EventStatus.PUBLISHED)
+    in_description = create_event(title="Open Day", organizer=uni, status=EventStatus.PUBLISHED)
+    in_description.description = "Tours of the labs, including the robotics club"
+    create_event(title="Poetry Evening", organizer=uni, status=EventStatus.PUBLISHED)
+    db_session.commit()
+
+    response = client.get("/api/events/?q=robot")
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [event["id"] for event in payload["data"]] == [in_title.id, in_description.id]
+    assert payload["meta"]["total"] == 2
+
+    response = client.put(
+        f"/api/events/{in_title.id}",
+        json={"title": "Drone Workshop"},
+        headers=token_factory(uni),
+    )
+    assert response.status_code == 200
+    payload = client.get("/api/events/?q=robot").get_json()
+    assert [event["id"] for event in payload["data"]] == [in_description.id]
+
+    client.delete(f"/api/events/{in_description.id}", headers=token_factory(uni))
+    assert client.get("/api/events/?q=robot").get_json()["data"] == []
+    assert client.get('/api/events/?q="drone" OR').status_code == 200
+
+
+def test_event_reads_are_cached_with_etags(client, token_factory):
+    uni = create_user(email="uni-etag@example.com", role=Role.UNIVERSITY)
+    event = create_event(title="Cached Event", organizer=uni, status=EventStatus.PUBLISHED)
+
+    first = client.get(f"/api/events/{event.id}")
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    not_modified = client.get(f"/api/events/{event.id}", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+
+    client.put(
+        f"/api/events/{event.id}",
+        json={"title": "Renamed Event"},
+        headers=token_factory(uni),
+    )
+    refreshed = client.get(f"/api/events/{event.id}", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.get_json()["title"] == "Renamed Event"
+    assert refreshed.headers["ETag"] != etag
+
+
+def test_metrics_endpoint_exposes_request_and_cache_metrics(client):
+    client.get("/api/events/")
+    client.get("/api/events/")
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    body = response.get_data(as_text=True)
+    assert 'http_requests_total{blueprint="api.events",endpoint="api.events.list_events"' in body
+    assert "http_request_duration_seconds_bucket" in body
+    assert 'cache_requests_total{cache="response",result="hit"}' in body
+    assert "db_pool_checkouts_total" in body
+
+
+def test_pool_wait_metric_survives_engine_dispose(tmp_path):
+    app = create_app("testing", {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'pool.db'}"})
+    with app.app_context():
+        # What gunicorn's post_fork does in every worker.
+        db.engine.dispose(close=False)
+        before = REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") or 0
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count") == before + 1
+
+
+def test_read_replica_serves_marked_views_until_the_request_writes(tmp_path):
+    app = create_app(
+        "testing",
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'primary.db'}",
+            "SQLALCHEMY_BINDS": {"replica": f"sqlite:///{tmp_path / 'replica.db'}"},
+        },
+    )
+    try:
+        with app.app_context():
+            db.create_all()
+            # A replica that has not caught up yet: same schema, no rows.
+            db.metadata.create_all(db.engines["replica"])
+            organizer = create_user(email="replica-uni@example.com", role=Role.UNIVERSITY)
+            event_id = create_event(organizer=organizer, status=EventStatus.PUBLISHED).id
+
+        client = app.test_client()
+        assert client.get(f"/api/events/{event_id}").status_code == 404
+        assert client.get("/api/events/?status=published").get_json()["data"] == []
+        with app.app_context():
+            # The lagging replica's answers must not outlive it in the cache.
+            assert len(response_cache.store) == 0
+
+        with app.test_request_context("/api/events/"):
+            g._replica_reads = True
+            count = select(func.count(Event.id))
+            assert db.session.scalar(count) == 0
+            db.session.execute(
+                update(Event).where(Event.id == event_id).values(capacity=Event.capacity + 1),
+            )
+            assert db.session.scalar(count) == 1
+            db.session.rollback()
+
+        with app.test_request_context("/api/admin/stats"):
+            g._replica_reads = True
+            assert get_admin_stats()["events"] == 0
+            assert _admin_stats_cache().get(ADMIN_STATS_CACHE_KEY) is None
+    finally:
+        # The bind's metadata is registered on the shared extension; other test apps
+        # have no such bind.
+        db.metadatas.pop("replica", None)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import socket
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.extensions import db
+from app.models import OutboundEmail, OutboundEmailStatus
+from app.services.outbox_service import (
+    SMTPTransport,
+    deliver_pending,
+    outbox_worker,
+    purge_outbox,
+)
+from app.utils.email import EmailService
+
+
+def test_registration_queues_email_for_background_delivery(app, client, smtp_server):
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Queued", "email": "queued@example.com", "password": "Password123"},
+    )
+    assert response.status_code == 201
+    assert smtp_server.log.messages == []
+
+    with app.app_context():
+        EmailService.send_email("Second", "second@example.com", "Hello again")
+        transport = SMTPTransport(app.config)
+        try:
+            report = deliver_pending(transport)
+            assert report.sent == 2
+            EmailService.send_email("Third", "third@example.com", "And again")
+            assert deliver_pending(transport).sent == 1
+        finally:
+            transport.close()
+
+        statuses = db.session.scalars(db.select(OutboundEmail.status)).all()
+        assert statuses == [OutboundEmailStatus.SENT] * 3
+
+    assert [message["To"] for message in smtp_server.log.messages] == [
+        "queued@example.com",
+        "second@example.com",
+        "third@example.com",
+    ]
+    # Both batches went over one authenticated connection.
+    assert smtp_server.log.connections == 1
+    assert smtp_server.log.logins == 1
+
+
+def test_rejected_and_unreachable_deliveries(app, smtp_server):
+    smtp_server.log.rejected_recipients.add("nobody@example.com")
+    with app.app_context():
+        EmailService.send_email("Hi", "nobody@example.com", "Rejected")
+        transport = SMTPTransport(app.config)
+        report = deliver_pending(transport)
+        transport.close()
+        assert (report.sent, report.failed) == (0, 1)
+
+        with socket.socket() as unused:
+            unused.bind(("127.0.0.1", 0))
+            app.config["MAIL_PORT"] = unused.getsockname()[1]
+        EmailService.send_email("Hi", "later@example.com", "Server down")
+        report = deliver_pending(SMTPTransport(app.config))
+        assert report.retried == 1
+
+        email = db.session.scalars(
+            db.select(OutboundEmail).filter_by(recipient="later@example.com"),
+        ).one()
+        assert email.status == OutboundEmailStatus.PENDING
+        assert email.attempts == 1
+        assert email.last_error
+        assert email.next_attempt_at > datetime.utcnow()
+        # Not due yet, so the next pass leaves it alone.
+        assert deliver_pending(SMTPTransport(app.config)).claimed == 0
+
+
+def test_sender_starts_with_the_app_and_delivers_pending_retries(tmp_path, smtp_server):
+    app = create_app(
+        "testing",
+        {
+            "SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'outbox.db'}",
+            "EMAIL_OUTBOX_WORKER_ENABLED": True,
+            "EMAIL_OUTBOX_POLL_SECONDS": 0.05,
+            "MAIL_SERVER": "127.0.0.1",
+            "MAIL_PORT": smtp_server.port,
+            "MAIL_USE_TLS": False,
+            "MAIL_USERNAME": "outbox@example.com",
+            "MAIL_PASSWORD": "secret",
+        },
+    )
+    with app.app_context():
+        db.create_all()
+        # A retry left behind by an earlier process; nothing new is enqueued.
+        db.session.add(
+            OutboundEmail(
+                recipient="retry@example.com",
+                subject="Retry",
+                body="Still waiting",
+                attempts=1,
+                next_attempt_at=datetime.utcnow(),
+            ),
+        )
+        db.session.commit()
+
+    try:
+        app.test_client().get("/api/events/")
+        deadline = time.monotonic() + 5
+        while not smtp_server.log.messages and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        outbox_worker.stop()
+    assert [message["To"] for message in smtp_server.log.messages] == ["retry@example.com"]
+
+
+def test_purge_removes_old_sent_and_failed_messages(app):
+    now = datetime.utcnow()
+    with app.app_context():
+        for recipient, status, last_attempt in (
+            ("old-sent@example.com", OutboundEmailStatus.SENT, now - timedelta(days=10)),
+            ("old-failed@example.com", OutboundEmailStatus.FAILED, now - timedelta(days=10)),
+            ("new-sent@example.com", OutboundEmailStatus.SENT, now - timedelta(hours=1)),
+            ("old-pending@example.com", OutboundEmailStatus.PENDING, now - timedelta(days=10)),
+        ):
+            db.session.add(
+                OutboundEmail(
+                    recipient=recipient,
+                    subject="Code",
+                    body="Your code is 123456",
+                    status=status,
+                    next_attempt_at=last_attempt,
+                ),
+            )
+        db.session.commit()
+
+        assert purge_outbox(timedelta(days=7), batch_size=1) == 2
+        remaining = db.session.scalars(db.select(OutboundEmail.recipient)).all()
+        assert sorted(remaining) == ["new-sent@example.com", "old-pending@example.com"]
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import pytest
+from flask import g
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
+from app.models import EventStatus, Role
+from app.services.index_advisor import CheckedQuery, _plan_warnings, explain_queries
+from tests.factories import create_booking, create_event, create_user
+
+
+def test_event_list_query_count_is_constant(client, assert_max_queries):
+    for index in range(6):
+        organizer = create_user(email=f"uni-n1-{index}@example.com", role=Role.UNIVERSITY)
+        create_event(organizer=organizer, status=EventStatus.PUBLISHED)
+
+    with assert_max_queries(4):
+        response = client.get("/api/events/?page_size=20")
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert len(payload["data"]) == 6
+    assert "bookings" not in payload["data"][0]
+
+
+def test_event_bookings_query_count_is_constant(client, token_factory, assert_max_queries):
+    university = create_user(email="uni-n1-bookings@example.com", role=Role.UNIVERSITY)
+    event = create_event(organizer=university, status=EventStatus.PUBLISHED)
+    for index in range(6):
+        attendee = create_user(email=f"attendee-n1-{index}@example.com")
+        create_booking(event=event, user=attendee)
+
+    headers = token_factory(university)
+    with assert_max_queries(6):
+        response = client.get(f"/api/bookings/event/{event.id}?page_size=20", headers=headers)
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert len(payload["data"]) == 6
+    assert payload["data"][0]["user"]["email"].startswith("attendee-n1-")
+    assert "bookings" not in payload["data"][0]["user"]
+
+
+def test_admin_user_list_query_count_is_constant(client, token_factory, assert_max_queries):
+    admin = create_user(email="admin-n1@example.com", role=Role.ADMIN)
+    for index in range(6):
+        create_user(email=f"user-n1-{index}@example.com")
+
+    headers = token_factory(admin)
+    with assert_max_queries(2):
+        response = client.get("/api/admin/users?page_size=20", headers=headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 7
+
+
+def test_endpoint_queries_avoid_full_table_scans():
+    plans = explain_queries()
+    assert plans
+    assert [plan.name for plan in plans if not plan.ok] == []
+
+
+def test_index_advisor_flags_index_scans_and_unexpected_indexes():
+    query = CheckedQuery(lambda: None, index="ix_bookings_event_user_status")
+    plan = ["SCAN bookings USING COVERING INDEX ix_bookings_event_created_at"]
+    warnings = _plan_warnings("sqlite", plan, query)
+    assert warnings == [
+        "full scan: SCAN bookings USING COVERING INDEX ix_bookings_event_created_at",
+        "does not use ix_bookings_event_user_status",
+    ]
+    search = ["SEARCH bookings USING INDEX ix_bookings_event_created_at (event_id=?)"]
+    assert _plan_warnings("sqlite", search, query) == [
+        "does not use ix_bookings_event_user_status",
+    ]
+
+
+def test_server_timing_header_and_budget_warning(app, client, caplog, monkeypatch):
+    organizer = create_user(email="uni-timing@example.com", role=Role.UNIVERSITY)
+    create_event(organizer=organizer, status=EventStatus.PUBLISHED)
+
+    response = client.get("/api/events/")
+    timing = response.headers["Server-Timing"]
+    for metric in ("db;dur=", "serialize;dur=", "handler;dur=", "total;dur="):
+        assert metric in timing
+    assert 'desc="0 queries"' not in timing
+
+    monkeypatch.setitem(app.config, "QUERY_BUDGETS", {"api.events.list_events": 0})
+    with caplog.at_level("WARNING", logger="app.utils.instrumentation"):
+        client.get("/api/events/?page=2")
+    assert "Query budget exceeded in api.events.list_events" in caplog.text
+    assert "FROM events" in caplog.text
+
+
+def test_failed_statements_do_not_skew_query_timings(app, db_session):
+    with app.test_request_context("/"):
+        app.preprocess_request()
+        with pytest.raises(OperationalError):
+            db.session.execute(text("SELECT * FROM no_such_table"))
+        db.session.rollback()
+        db.session.execute(text("SELECT 1"))
+
+        timings = g._request_timings
+        assert timings.query_count == 1
+        assert timings.db_seconds < 1
+        assert timings.statements == ["SELECT 1"]
+        assert not db.session.connection().info.get("query_started")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from app.extensions import db
+from app.models import Booking, Event, Role, User
+from app.services.booking_service import reconcile_reserved_seats
+from app.services.seed_service import seed
+from tests.factories import create_user
+
+
+def _event_shapes(event_ids: range) -> list[tuple]:
+    rows = db.session.execute(
+        select(Event.location, Event.capacity, Event.status)
+        .where(Event.id.in_(event_ids))
+        .order_by(Event.id),
+    )
+    return [tuple(row) for row in rows]
+
+
+def test_seed_bulk_inserts_consistent_deterministic_data():
+    existing = create_user(email="before-seed@example.com")
+
+    first = seed(events=200, bookings=300, users=40, universities=3, batch_size=64)
+
+    assert first.admin_id > existing.id
+    assert db.session.scalar(select(func.count(Event.id))) == 200
+    assert db.session.scalar(select(func.count(Booking.id))) == 300
+    assert db.session.scalar(select(func.count(User.id)).where(User.role == Role.UNIVERSITY)) == 3
+    # Seat counters are filled in from the generated bookings.
+    assert reconcile_reserved_seats(apply=False) == []
+
+    # A second run continues after the existing ids and replays the same data.
+    second = seed(events=200, bookings=300, users=40, universities=3, batch_size=64)
+    assert second.event_ids.start == first.event_ids.stop
+    assert _event_shapes(second.event_ids) == _event_shapes(first.event_ids)
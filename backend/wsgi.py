@@ -0,0 +1,9 @@
+"""WSGI entry point for production servers: ``gunicorn -c gunicorn.conf.py``."""
+
+from __future__ import annotations
+
+import os
+
+from app import create_app
+
+app = create_app(os.environ.get("FLASK_ENV", "production"))
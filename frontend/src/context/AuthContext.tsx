@@ -9,7 +9,14 @@ import {
 } from 'react'
 import { useNavigate } from 'react-router-dom'
 
-import { fetchProfile, login as loginRequest, type AuthResponse, type AuthUser } from '../services/authService'
+import { REFRESH_TOKEN_KEY, TOKEN_KEY, USER_KEY } from '../lib/api'
+import {
+  fetchProfile,
+  login as loginRequest,
+  logoutSession,
+  type AuthResponse,
+  type AuthUser,
+} from '../services/authService'
 
 type AuthState = {
   user: AuthUser | null
@@ -23,9 +30,6 @@ type AuthState = {
 
 const AuthContext = createContext<AuthState | undefined>(undefined)
 
-const TOKEN_KEY = 'gep_token'
-const USER_KEY = 'gep_user'
-
 export const AuthProvider = ({ children }: PropsWithChildren) => {
   const navigate = useNavigate()
   const [user, setUser] = useState<AuthUser | null>(null)
@@ -37,6 +41,7 @@ export const AuthProvider = ({ children }: PropsWithChildren) => {
     setToken(auth.accessToken)
     setUser(auth.user)
     window.localStorage.setItem(TOKEN_KEY, auth.accessToken)
+    window.localStorage.setItem(REFRESH_TOKEN_KEY, auth.refreshToken)
     window.localStorage.setItem(USER_KEY, JSON.stringify(auth.user))
   }, [])
 
@@ -44,6 +49,7 @@ export const AuthProvider = ({ children }: PropsWithChildren) => {
     setToken(null)
     setUser(null)
     window.localStorage.removeItem(TOKEN_KEY)
+    window.localStorage.removeItem(REFRESH_TOKEN_KEY)
     window.localStorage.removeItem(USER_KEY)
   }, [])
 
@@ -105,6 +111,10 @@ export const AuthProvider = ({ children }: PropsWithChildren) => {
   }, [clearSession])
 
   const logout = useCallback(() => {
+    const refreshToken = window.localStorage.getItem(REFRESH_TOKEN_KEY)
+    if (refreshToken) {
+      logoutSession(refreshToken).catch(() => undefined)
+    }
     clearSession()
     navigate('/login')
   }, [clearSession, navigate])
@@ -1,4 +1,4 @@
-import axios from 'axios'
+import axios, { type InternalAxiosRequestConfig } from 'axios'
 
 const baseURL =
   import.meta.env.VITE_API_BASE_URL?.replace(/\/$/, '') ?? 'http://localhost:5000'
@@ -8,17 +8,67 @@ export const api = axios.create({
   withCredentials: false,
 })
 
+export const TOKEN_KEY = 'gep_token'
+export const REFRESH_TOKEN_KEY = 'gep_refresh_token'
+export const USER_KEY = 'gep_user'
+
 api.interceptors.request.use((config) => {
-  const token = window.localStorage.getItem('gep_token')
-  if (token) {
+  const token = window.localStorage.getItem(TOKEN_KEY)
+  if (token && !config.headers.Authorization) {
     config.headers.Authorization = `Bearer ${token}`
   }
   return config
 })
 
+// Refresh tokens rotate and reuse is treated as theft, so concurrent 401s must share
+// a single refresh request instead of each sending the same token.
+let refreshInFlight: Promise<string | null> | null = null
+const NO_REFRESH_URLS = ['/auth/login', '/auth/refresh', '/auth/logout', '/auth/verify']
+
+const refreshAccessToken = (): Promise<string | null> => {
+  const refreshToken = window.localStorage.getItem(REFRESH_TOKEN_KEY)
+  if (!refreshToken) {
+    return Promise.resolve(null)
+  }
+  refreshInFlight ??= axios
+    .post(`${baseURL}/api/auth/refresh`, null, {
+      headers: { Authorization: `Bearer ${refreshToken}` },
+    })
+    .then(({ data }) => {
+      window.localStorage.setItem(TOKEN_KEY, data.accessToken)
+      window.localStorage.setItem(REFRESH_TOKEN_KEY, data.refreshToken)
+      window.localStorage.setItem(USER_KEY, JSON.stringify(data.user))
+      return data.accessToken as string
+    })
+    .catch(() => {
+      window.localStorage.removeItem(TOKEN_KEY)
+      window.localStorage.removeItem(REFRESH_TOKEN_KEY)
+      return null
+    })
+    .finally(() => {
+      refreshInFlight = null
+    })
+  return refreshInFlight
+}
+
 api.interceptors.response.use(
   (response) => response,
-  (error) => {
+  async (error) => {
+    const original = error.config as (InternalAxiosRequestConfig & { _retried?: boolean }) | undefined
+    if (
+      error.response?.status === 401 &&
+      original &&
+      !original._retried &&
+      !NO_REFRESH_URLS.includes(original.url ?? '')
+    ) {
+      original._retried = true
+      const accessToken = await refreshAccessToken()
+      if (accessToken) {
+        original.headers.Authorization = `Bearer ${accessToken}`
+        return api(original)
+      }
+    }
+
     if (error.response) {
       // Server responded with error status
       console.error('API Error:', {
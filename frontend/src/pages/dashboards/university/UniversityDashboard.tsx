@@ -6,7 +6,7 @@ import { Link } from 'react-router-dom'
 import { DashboardHeader } from '../../../components/dashboard/DashboardHeader'
 import { useAuth } from '../../../context/AuthContext'
 import { getEvents, type Event } from '../../../services/eventService'
-import { getEventBookings, type Booking } from '../../../services/bookingService'
+import { getOrganizerBookings, type Booking } from '../../../services/bookingService'
 
 export const UniversityDashboard = () => {
   const { user } = useAuth()
@@ -27,18 +27,9 @@ export const UniversityDashboard = () => {
         })
         setMyEvents(eventsData.data || [])
 
-        // Get pending bookings for all events
-        const allPendingBookings: Booking[] = []
-        for (const event of eventsData.data || []) {
-          try {
-            const bookingsData = await getEventBookings(event.id, 1, 10)
-            const pending = (bookingsData.data || []).filter((b) => b.status === 'pending')
-            allPendingBookings.push(...pending)
-          } catch (error) {
-            console.error(`Failed to load bookings for event ${event.id}:`, error)
-          }
-        }
-        setPendingBookings(allPendingBookings.slice(0, 5))
+        // Get pending bookings across all of this university's events in one request
+        const bookingsData = await getOrganizerBookings('pending', 1, 5)
+        setPendingBookings(bookingsData.data || [])
       } catch (error) {
         console.error('Failed to load dashboard data:', error)
       } finally {
@@ -11,6 +11,7 @@ export type AuthUser = {
 
 export type AuthResponse = {
   accessToken: string
+  refreshToken: string
   user: AuthUser
 }
 
@@ -39,6 +40,12 @@ export const resendOtp = async (payload: { email: string; purpose?: string }) =>
   return data
 }
 
+export const logoutSession = async (refreshToken: string) => {
+  await api.post('/auth/logout', null, {
+    headers: { Authorization: `Bearer ${refreshToken}` },
+  })
+}
+
 export const fetchProfile = async () => {
   const { data } = await api.get<AuthUser>('/auth/profile')
   return data
@@ -58,6 +58,26 @@ export const getEventBookings = async (eventId: number, page?: number, page_size
   return data
 }
 
+export type BookingStatusCounts = Record<BookingStatus, number>
+
+export type OrganizerBookingsResponse = PaginatedResponse<Booking> & {
+  counts: Record<string, BookingStatusCounts>
+}
+
+export const getOrganizerBookings = async (
+  status: BookingStatus | 'all' = 'pending',
+  page?: number,
+  page_size?: number,
+) => {
+  const params = new URLSearchParams({ status })
+  if (page) params.append('page', String(page))
+  if (page_size) params.append('page_size', String(page_size))
+  const { data } = await api.get<OrganizerBookingsResponse>(
+    `/bookings/organizer?${params.toString()}`,
+  )
+  return data
+}
+
 export const createBooking = async (eventId: number, payload: {
   seats: number
   notes?: string
@@ -71,6 +91,24 @@ export const updateBookingStatus = async (id: number, status: BookingStatus) =>
   return data
 }
 
+export type BulkBookingStatusResult = {
+  id: number
+  success: boolean
+  status?: BookingStatus
+  message?: string
+}
+
+export const bulkUpdateBookingStatus = async (
+  items: { id: number; status: BookingStatus }[],
+) => {
+  const { data } = await api.put<{
+    results: BulkBookingStatusResult[]
+    updated: number
+    failed: number
+  }>('/bookings/bulk', { items })
+  return data
+}
+
 export const deleteBooking = async (id: number) => {
   const { data } = await api.delete<{ message: string }>(`/bookings/${id}`)
   return data
@@ -29,6 +29,7 @@ export type Event = {
 }
 
 export type EventFilters = {
+  q?: string
   status?: EventStatus
   organizer_id?: number
   university_id?: number